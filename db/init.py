@@ -1,39 +1,70 @@
+import argparse
+import json
+import os
 import sqlite3
+import sys
+import time
 
-# Connect to (or create) the database file
-conn = sqlite3.connect("auth.db")
-cursor = conn.cursor()
-
-# Create the users table (with isadmin column included)
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS users (
-    username TEXT PRIMARY KEY,
-    password TEXT NOT NULL,
-    name TEXT NOT NULL,
-    isadmin INTEGER NOT NULL DEFAULT 0
-)
-""")
-
-# Insert or update test users
-users = [
-    ("EMP-20001", "password", "Samantha Lee", 0),
-    ("EMP-20002", "password", "Nur Aisyah Binte Rahman", 0),
-    ("EMP-20003", "password", "Rohan Mehta", 0),
-    ("EMP-20004", "password", "Grace Lee", 1),  # Admin
-    ("EMP-20005", "password", "Felicia Goh", 0)
-]
-
-for user in users:
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "server"))
+
+from employee_store import EMPLOYEES_DB, connect, ingest  # noqa: E402
+from employee_repo import EMPLOYEES_JSON                  # noqa: E402
+
+parser = argparse.ArgumentParser(description="Create auth.db test users and load employees into employees.db")
+parser.add_argument("--employees", default=EMPLOYEES_JSON, help="employees.json to ingest")
+parser.add_argument("--db", default=os.getenv("EMPLOYEE_DB_PATH", EMPLOYEES_DB), help="employee database path")
+parser.add_argument("--merge", action="store_true", help="upsert only; keep employees missing from the file")
+parser.add_argument("--skip-users", action="store_true", help="leave auth.db untouched")
+parser.add_argument("--skip-employees", action="store_true", help="only (re)create auth.db users")
+args = parser.parse_args()
+
+if not args.skip_users:
+    # Connect to (or create) the database file
+    conn = sqlite3.connect(os.path.join(HERE, "auth.db"))
+    cursor = conn.cursor()
+
+    # Create the users table (with isadmin column included)
     cursor.execute("""
-    INSERT INTO users (username, password, name, isadmin)
-    VALUES (?, ?, ?, ?)
-    ON CONFLICT(username) DO UPDATE SET
-        password=excluded.password,
-        name=excluded.name,
-        isadmin=excluded.isadmin
-    """, user)
-
-conn.commit()
-conn.close()
-
-print("✅ Database auth.db created with 'isadmin' column and users added.")
\ No newline at end of file
+    CREATE TABLE IF NOT EXISTS users (
+        username TEXT PRIMARY KEY,
+        password TEXT NOT NULL,
+        name TEXT NOT NULL,
+        isadmin INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+
+    # Insert or update test users
+    users = [
+        ("EMP-20001", "password", "Samantha Lee", 0),
+        ("EMP-20002", "password", "Nur Aisyah Binte Rahman", 0),
+        ("EMP-20003", "password", "Rohan Mehta", 0),
+        ("EMP-20004", "password", "Grace Lee", 1),  # Admin
+        ("EMP-20005", "password", "Felicia Goh", 0)
+    ]
+
+    for user in users:
+        cursor.execute("""
+        INSERT INTO users (username, password, name, isadmin)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(username) DO UPDATE SET
+            password=excluded.password,
+            name=excluded.name,
+            isadmin=excluded.isadmin
+        """, user)
+
+    conn.commit()
+    conn.close()
+
+    print("✅ Database auth.db created with 'isadmin' column and users added.")
+
+if not args.skip_employees:
+    started = time.perf_counter()
+    with open(args.employees, "r", encoding="utf-8") as f:
+        employees = json.load(f)
+    conn = connect(args.db)
+    counts = ingest(conn, employees, replace=not args.merge)
+    conn.execute("PRAGMA optimize")
+    conn.close()
+    print(f"✅ Loaded {counts['employees']} employees into {args.db} "
+          f"in {time.perf_counter() - started:.1f}s ({counts})")
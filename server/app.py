@@ -1,24 +1,49 @@
-import os, sqlite3
+import base64, os, sqlite3, time
 from datetime import datetime
 from dotenv import load_dotenv, find_dotenv
 from flask import Flask, jsonify, request, session
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
 import requests, json
-import pandas as pd
 
 
 
+def _async_mode():
+    """gevent when started through serve.py (sockets monkey-patched), else threads."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return "threading"
+    return "gevent" if monkey.is_module_patched("socket") else "threading"
+
+
 app = Flask(__name__)
 CORS(
     app,
     resources={r"/api/*": {"origins": "http://localhost:3000"}},
     supports_credentials=True
 )
-socketio = SocketIO(app, cors_allowed_origins="*")  # Enable CORS for WebSocket
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=_async_mode())  # Enable CORS for WebSocket
 app.url_map.strict_slashes = False
-from leadership import leadership_bp, set_azure_chat
+from leadership import leadership_bp, set_azure_chat, set_summary_cache
 app.register_blueprint(leadership_bp)
+from leadership_jobs import jobs_bp, set_job_runner, JobRunner
+app.register_blueprint(jobs_bp)
+from employee_repo import get_repository, EMPLOYEES_JSON
+from employee_store import get_store, is_ingested, EMPLOYEES_DB, LEVEL_RANK
+from skills_catalog import get_catalog, SKILLS_XLSX
+from session_store import create_store, new_session_id
+from upstream import UpstreamClient
+from ratelimit import lane_for
+from singleflight import SingleFlight, flight_key
+from summary_cache import SummaryCache
+from keywords import KeywordMatcher
+from peer_index import get_peer_index
+from norms import get_norms
+from skill_gap import get_skill_gap_index
+from score_store import ScoreStore
+import metrics
+from usage import tracker as usage_tracker, check_budget, TokenBudgetExceeded, MENTOR_CHAT, SUPPORT_CHAT
 
 # ---------------- Config (env) ----------------
 # Load environment variables from .env file
@@ -30,6 +55,27 @@ AZURE_API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION", "2025-01-01-preview")
 AZURE_OPENAI_DEPLOYMENT_NAME = os.getenv("AZURE_OPENAI_CHAT_MODEL", "gpt-5-mini")  # replace with your deployment name
 DEFAULT_VECTOR_STORE_ID = os.getenv("VECTOR_STORE_ID")  # optional
 
+
+def employee_source(json_path=None):
+    """
+    Employee data access. EMPLOYEE_BACKEND=sqlite serves db/employees.db
+    (EMPLOYEE_DB_PATH; load it with db/init.py), otherwise the cached
+    employees.json repository. Both expose the same get/all/by_department API.
+    A database that was never ingested falls back to employees.json with a
+    warning rather than serving zero employees.
+    """
+    if os.getenv("EMPLOYEE_BACKEND", "json").lower() == "sqlite":
+        db_path = os.getenv("EMPLOYEE_DB_PATH", EMPLOYEES_DB)
+        if is_ingested(db_path):
+            return get_store(db_path)
+        if db_path not in _empty_stores_warned:
+            _empty_stores_warned.add(db_path)
+            print(f"[WARN] EMPLOYEE_BACKEND=sqlite but {db_path} has no ingested employees "
+                  f"(run python db/init.py); serving employees.json instead")
+    return get_repository(json_path or EMPLOYEES_JSON)
+
+_empty_stores_warned = set()
+
 # ---------------- Prompts ----------------
 MENTOR_SYSTEM = (
     """
@@ -62,6 +108,7 @@ SUPPORT_SYSTEM = (
 )
 
 CRISIS_KEYWORDS = {"suicide", "kill myself", "end my life", "self harm", "hurt myself"}
+CRISIS_MATCHER = KeywordMatcher({"crisis": CRISIS_KEYWORDS})
 CRISIS_RESPONSE = (
     "I'm really glad you reached out. Your safety matters.\n\n"
     "I’m not a medical professional, but you’re not alone. If you’re in immediate danger, "
@@ -76,7 +123,7 @@ CRISIS_RESPONSE = (
 def build_messages(mode: str, user_message: str, history=None, employee_id=None):
 
         # Check for crisis keywords
-    if any(keyword in user_message.lower() for keyword in CRISIS_KEYWORDS):
+    if CRISIS_MATCHER.matches_any(user_message):
         if mode == "mentor":
             # Return restricted message for mentor mode
             return [{"role": "assistant", "content": "Sorry, that query is not allowed"}]
@@ -89,29 +136,30 @@ def build_messages(mode: str, user_message: str, history=None, employee_id=None)
 
     # Load structured HR context only on first message (when employee_id provided)
     if mode == "mentor" and employee_id:
-        current, all_emps = read_employee_data(
-            os.path.join(os.path.dirname(__file__), "../public/Data/employees.json"),
+        current, _ = read_employee_data(
+            EMPLOYEES_JSON,
             employee_id
         )
-        skill_context = read_skills_excel(
-            os.path.join(os.path.dirname(__file__), "../public/Data/Functions_Skills.xlsx")
-        )
+        skill_context = skill_context_message(read_skills_excel(SKILLS_XLSX))
 
 
-        # Developer role — structured HR grounding
+        # Developer role — structured HR grounding (same text as json.dumps of the whole dict)
+        gaps = select_skill_gaps(current, user_message)
         msgs.append({
             "role": "developer",
-            "content": json.dumps({
-                "employee_profile": current,
-                "all_employees": all_emps  
-            })
+            "content": (
+                f'{{"employee_profile": {json.dumps(current)}, '
+                f'"peers": {json.dumps(select_peers(current, user_message))}, '
+                f'"norms": {memo_json(select_norms(current))}, '
+                f'"skill_gaps": [{", ".join(memo_json(g) for g in gaps)}]}}'
+            )
         })
         
 
         # Assistant role — skills context
         msgs.append({
             "role": "assistant",
-            "content": json.dumps({"skill_unit_context": skill_context})
+            "content": skill_context
         })
 
     # Include short history (if any)
@@ -126,35 +174,143 @@ def build_messages(mode: str, user_message: str, history=None, employee_id=None)
 
     return msgs
 
-def azure_chat(messages, vector_store_id=None, temperature=1):
+# Shared keep-alive client; reaches leadership.py through set_azure_chat(azure_chat)
+upstream = UpstreamClient.from_env(headers={"api-key": AZURE_API_KEY} if AZURE_API_KEY else None)
+# Request coalescing for azure_chat (set UPSTREAM_SINGLEFLIGHT=0 to disable)
+flights = SingleFlight() if os.getenv("UPSTREAM_SINGLEFLIGHT", "1") != "0" else None
+
+def _encode_chat_payload(payload):
+    """Serialize once, enforce AZURE_MAX_PROMPT_TOKENS (0 = off) before anything is sent."""
+    body = json.dumps(payload).encode("utf-8")
+    check_budget(len(body), int(os.getenv("AZURE_MAX_PROMPT_TOKENS", "0")))
+    return body
+
+def _observe_upstream(started, timings):
+    """Record the "upstream" phase without the limiter wait (upstream.post records that as "rate_limit")."""
+    metrics.PHASE_LATENCY.observe(time.perf_counter() - started - timings.get("limiter_wait", 0.0), phase="upstream")
+
+def azure_chat(messages, vector_store_id=None, temperature=1, call_site=None, session_id=None, timeout=None):
+    """Chat completion; timeout (seconds) bounds the whole call, rate-limit wait and retries included."""
     url = f"{AZURE_BASE_URL}/deployments/{AZURE_OPENAI_DEPLOYMENT_NAME}/chat/completions?api-version={AZURE_API_VERSION}"
-    headers = {
-        "Content-Type": "application/json",
-        "api-key": AZURE_API_KEY,  # Include the subscription key
+    payload = {
+        "messages": messages,
+        "temperature": temperature,
     }
+    if vector_store_id:
+        payload["vector_store_id"] = vector_store_id
+
+    site = call_site or "other"
+    try:
+        body = _encode_chat_payload(payload)
+    except TokenBudgetExceeded:
+        usage_tracker.record(site, 0, len(messages), session_id=session_id, rejected=True)
+        raise
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    def call():
+        tokens = upstream.estimate(len(body))
+        timings, started = {}, time.perf_counter()
+        try:
+            try:
+                r = upstream.post(url, body, lane=lane_for(site), tokens=tokens, deadline=deadline, timings=timings)
+                out = r.json()
+            finally:
+                _observe_upstream(started, timings)
+            print("Azure API Response:", out)  # Log the response
+            reply = out["choices"][0]["message"]["content"]
+            upstream.settle(tokens, out.get("usage"))
+            usage_tracker.record(site, len(body), len(messages), out.get("usage"), session_id)
+            return reply
+        except requests.HTTPError as e:
+            usage_tracker.record(site, len(body), len(messages), session_id=session_id, error=True)
+            status = getattr(e.response, "status_code", 502)
+            text = getattr(e.response, "text", "")
+            print("HTTPError:", text)  # Log the HTTP error response
+            raise Exception(f"HTTPError: {status}, {text}")
+        except Exception as e:
+            usage_tracker.record(site, len(body), len(messages), session_id=session_id, error=True)
+            print("Exception:", str(e))  # Log any other exceptions
+            raise Exception(f"Error: {str(e)}")
+
+    if flights is None:
+        return call()
+    # Identical prompts already in flight (double submits, admins opening the dashboard together) share one call;
+    # a caller that joins one waits only until its own deadline and is accounted as a coalesced turn
+    def joined(error):
+        usage_tracker.record(site, 0, len(messages), session_id=session_id, error=error is not None, coalesced=True)
+    try:
+        return flights.do(flight_key(url, payload), call, call_site=site, deadline=deadline, joined=joined)
+    except TimeoutError as e:
+        raise Exception(f"Error: {e}") from e
+
+def azure_chat_stream(messages, vector_store_id=None, temperature=1, call_site=None, session_id=None):
+    """Same request as azure_chat with stream=true; yields content deltas as they arrive (SSE)."""
+    url = f"{AZURE_BASE_URL}/deployments/{AZURE_OPENAI_DEPLOYMENT_NAME}/chat/completions?api-version={AZURE_API_VERSION}"
     payload = {
         "messages": messages,
         "temperature": temperature,
+        "stream": True,
+        "stream_options": {"include_usage": True},  # final chunk carries the usage block
     }
     if vector_store_id:
         payload["vector_store_id"] = vector_store_id
 
+    site = call_site or "other"
+    try:
+        body = _encode_chat_payload(payload)
+    except TokenBudgetExceeded:
+        usage_tracker.record(site, 0, len(messages), session_id=session_id, rejected=True)
+        raise
+
+    tokens = upstream.estimate(len(body))
+    timings, started = {}, time.perf_counter()
     try:
-        r = requests.post(url, json=payload, headers=headers, timeout=60)
-        r.raise_for_status()
-        out = r.json()
-        print("Azure API Response:", out)  # Log the response
-        return out["choices"][0]["message"]["content"]
+        r = upstream.post(url, body, stream=True, lane=lane_for(site), tokens=tokens, timings=timings)
     except requests.HTTPError as e:
+        _observe_upstream(started, timings)
+        usage_tracker.record(site, len(body), len(messages), session_id=session_id, error=True)
         status = getattr(e.response, "status_code", 502)
-        body = getattr(e.response, "text", "")
-        print("HTTPError:", body)  # Log the HTTP error response
-        raise Exception(f"HTTPError: {status}, {body}")
-    except Exception as e:
-        print("Exception:", str(e))  # Log any other exceptions
-        raise Exception(f"Error: {str(e)}")
+        text = getattr(e.response, "text", "")
+        print("HTTPError:", text)  # Log the HTTP error response
+        raise Exception(f"HTTPError: {status}, {text}")
+    except Exception:
+        _observe_upstream(started, timings)
+        usage_tracker.record(site, len(body), len(messages), session_id=session_id, error=True)
+        raise
+
+    usage, ok = None, False
+    try:
+        with r:
+            for line in r.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue  # keep-alives, comments, event: lines
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                usage = chunk.get("usage") or usage
+                for choice in chunk.get("choices") or []:  # filter-only chunks have no choices
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+        ok = True
+    finally:
+        _observe_upstream(started, timings)
+        if ok:
+            upstream.settle(tokens, usage)
+        usage_tracker.record(site, len(body), len(messages), usage, session_id, error=not ok)
 
 set_azure_chat(azure_chat)
+if os.getenv("SUMMARY_CACHE", "1") != "0":
+    set_summary_cache(SummaryCache.from_env(model=AZURE_OPENAI_DEPLOYMENT_NAME))
+# Background leadership scoring jobs (set LEADERSHIP_JOBS=0 to disable). Every worker process resumes;
+# JobStore.claim() lets exactly one of them run each unfinished job
+job_runner = None
+if os.getenv("LEADERSHIP_JOBS", "1") != "0":
+    job_runner = JobRunner.from_env(employee_source())
+    set_job_runner(job_runner)
+    job_runner.resume()
 # ---------------- Routes ----------------
 @app.get("/api/health")
 def health():
@@ -175,32 +331,162 @@ DB_PATH = os.path.join(os.path.dirname(__file__), "../db/auth.db")
 
 # ---- Data Loaders ----
 def read_employee_data(json_path, employee_id):
-    """Load employee dataset and extract current employee."""
+    """Load employee dataset and extract current employee (cached, indexed by id)."""
     try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            employees = json.load(f)
-        current = next(emp for emp in employees if emp["employee_id"] == employee_id)
-        return current, employees
+        with metrics.phase("data_load"):
+            repo = employee_source(json_path)
+            current = repo.get(employee_id)
+            all_emps = repo.all()
+        if current is None:
+            raise KeyError(employee_id)
+        return current, all_emps
     except Exception as e:
         print(f"[WARN] Failed to load employee data: {e}")
         return {}, []
 
 def read_skills_excel(xlsx_path):
-    """Read skill and function data for grounding."""
+    """Read skill and function data for grounding (compiled once, cached on disk)."""
     try:
-        df = pd.read_excel(xlsx_path)
-        skills = []
-        for _, row in df.iterrows():
-            skills.append({
-                "function_unit_skill": str(row.get("Function / Unit / Skill", "")),
-                "specialisation_unit": str(row.get("Specialisation / Unit", ""))
-            })
-        return skills
+        with metrics.phase("skills_load"):
+            return get_catalog(xlsx_path).skills()
     except Exception as e:
         print(f"[WARN] Failed to load skills data: {e}")
         return []
     
 
+_skill_context = (None, None)
+
+def skill_context_message(skills):
+    """The skill_unit_context message, serialized once per catalog load (same list object until it reloads)."""
+    global _skill_context
+    rows, content = _skill_context
+    if rows is not skills:
+        content = json.dumps({"skill_unit_context": skills})
+        _skill_context = (skills, content)
+    return content
+
+
+# Norms and skill-gap reports are memoized per employee by their indexes and
+# never mutated, so each object is serialized once. Values keep the object
+# alive, which keeps its id() from being reused while it is cached.
+MAX_MEMO_JSON = 100_000
+_memo_json = {}
+
+def memo_json(obj) -> str:
+    hit = _memo_json.get(id(obj))
+    if hit is not None and hit[0] is obj:
+        return hit[1]
+    text = json.dumps(obj)
+    if len(_memo_json) >= MAX_MEMO_JSON:
+        _memo_json.clear()
+    _memo_json[id(obj)] = (obj, text)
+    return text
+
+
+def select_peers(current, question):
+    """Top-k anonymized peers most relevant to this user and question (PEER_TOP_K, default 8)."""
+    try:
+        k = int(os.getenv("PEER_TOP_K", "8"))
+        return get_peer_index(employee_source()).peer_context(current, question, k)
+    except Exception as e:
+        print(f"[WARN] Peer retrieval failed: {e}")
+        return []
+
+
+def select_norms(current):
+    """Department and job-title norms (skills, competency levels, tenure, LPI percentiles) for this user."""
+    if not current or os.getenv("MENTOR_NORMS", "1") == "0":
+        return {}
+    try:
+        return get_norms(employee_source()).for_employee(current)
+    except Exception as e:
+        print(f"[WARN] Norms lookup failed: {e}")
+        return {}
+
+
+def select_skill_gaps(current, question):
+    """Skill gaps vs the user's department, job title and any job title named in the question."""
+    if not current:
+        return []
+    try:
+        k = int(os.getenv("SKILL_GAP_TOP_K", "5"))
+        return get_skill_gap_index(employee_source(), SKILLS_XLSX).gaps_for(current, question, k)
+    except Exception as e:
+        print(f"[WARN] Skill gap lookup failed: {e}")
+        return []
+
+
+# ---- Chat conversations (server-side; the cookie only carries an opaque id) ----
+MAX_HISTORY = 10
+conversation_store = create_store()
+
+def load_conversation(username):
+    """Return (sid, data) for this browser session, starting a fresh one if needed."""
+    session.pop("chat_session_data", None)  # drop legacy cookie-stored payloads
+    sid = session.get("chat_sid")
+    data = conversation_store.get(sid) if sid else None
+    if sid and data is None:
+        data = {"username": username, "messages": []}  # id issued at login, first turn
+    if not data or data.get("username") != username:
+        sid = new_session_id()
+        session["chat_sid"] = sid
+        data = {"username": username, "messages": []}
+    return sid, data
+
+
+def gate_chat_message(mode, message, content_filter_result):
+    """Crisis and content-filter checks shared by /api/chat and the /ws stream.
+    Returns the canned reply payload, or None if the message may go upstream."""
+    # ---------------- Crisis check for support mode ----------------
+    if mode == "support" or mode == "mentor":
+        if CRISIS_MATCHER.matches_any(message):
+            return {"reply": CRISIS_RESPONSE, "mode": mode, "crisis": True}
+
+    # Check for content filtering results
+    for category, result in content_filter_result.items():
+        if result.get("filtered", False):
+            # Return a response if any category is filtered
+            return {
+                "reply": f"Sorry, your query was flagged for {category} content and cannot be processed.",
+                "mode": mode,
+                "filtered_category": category,
+                "severity": result.get("severity", "unknown")
+            }
+    return None
+
+def start_chat_turn(username, mode, message):
+    """Record the user message and build the upstream payload -> (sid, chat_data, messages)."""
+    sid, chat_data = load_conversation(username)
+
+    current, _ = read_employee_data(
+        EMPLOYEES_JSON, username
+    )
+    skills = read_skills_excel(
+        SKILLS_XLSX
+    )
+
+    # Append user message and keep chat history trimmed
+    chat_data["messages"] = (chat_data["messages"] + [{"role": "user", "content": message}])[-MAX_HISTORY:]
+    conversation_store.put(sid, chat_data)
+
+    # Build messages for Azure (grounding is rebuilt from the cached dataset each turn)
+    messages = [
+        {"role": "system", "content": MENTOR_SYSTEM if mode == "mentor" else SUPPORT_SYSTEM},
+        {"role": "assistant", "content": json.dumps({"skill_unit_context": skills})},
+        {"role": "developer", "content": json.dumps({
+            "employee_profile": current,
+            "peers": select_peers(current, message),
+            "norms": select_norms(current),
+            "skill_gaps": select_skill_gaps(current, message)
+        })}
+    ] + chat_data["messages"]
+    return sid, chat_data, messages
+
+def end_chat_turn(sid, chat_data, reply):
+    chat_data["messages"].append({"role": "assistant", "content": reply})
+    conversation_store.put(sid, chat_data)  # Save updated conversation
+
+
 # ---------------- Login Route ----------------
 @app.post("/api/login")
 def login():
@@ -250,6 +536,11 @@ def login():
     if "histories" not in session:
         session["histories"] = {}
 
+    # Allocate the chat id up front so /ws (which only sees the cookie
+    # session as of connect) and /api/chat share one conversation
+    if "chat_sid" not in session:
+        session["chat_sid"] = new_session_id()
+
     return jsonify({
         "ok": True,
         "username": username,
@@ -305,74 +596,32 @@ def chat():
 
 
 
-    # ---------------- Crisis check for support mode ----------------
-    if mode == "support" or mode == "mentor":
-        lowered = message.lower()
-        if any(k in lowered for k in CRISIS_KEYWORDS):
-            return jsonify({"reply": CRISIS_RESPONSE, "mode": mode, "crisis": True})
+    # ---------------- Crisis / content-filter gating ----------------
+    gated = gate_chat_message(mode, message, data.get("content_filter_result", {}))
+    if gated:
+        return jsonify(gated)
 
     vector_store_id = data.get("vector_store_id") or DEFAULT_VECTOR_STORE_ID
 
-    # Check for content filtering results
-    content_filter_result = data.get("content_filter_result", {})
-    for category, result in content_filter_result.items():
-        if result.get("filtered", False):
-            # Return a response if any category is filtered
-            return jsonify({
-                "reply": f"Sorry, your query was flagged for {category} content and cannot be processed.",
-                "mode": mode,
-                "filtered_category": category,
-                "severity": result.get("severity", "unknown")
-            })
-
-
-    # ---------------- Initialize per-user chat session ----------------
-
-    current, all_emps = read_employee_data(
-        os.path.join(os.path.dirname(__file__), "../public/Data/employees.json"), username
-    )
-    skills = read_skills_excel(
-        os.path.join(os.path.dirname(__file__), "../public/Data/Functions_Skills.xlsx")
-    )
-    if "chat_session_data" not in session:
-        session["chat_session_data"] = {
-            "current": current,
-            "all_employees": all_emps,
-            "skills": skills,
-            "messages": []
-        }
-
-    chat_data = session["chat_session_data"]
-
-    # Build messages for Azure
-    messages = [
-        {"role": "system", "content": MENTOR_SYSTEM if mode == "mentor" else SUPPORT_SYSTEM},
-        {"role": "assistant", "content": json.dumps({"skill_unit_context": skills})},
-        {"role": "developer", "content": json.dumps({
-            "employee_profile": current,
-            "all_employees": all_emps
-        })}
-    ] + chat_data.get("messages", [])
-
-    # Append user message
-    messages.append({"role": "user", "content": message})
-
-    # Keep chat history trimmed
-    MAX_HISTORY = 10
-    chat_data["messages"] = messages[:3] + messages[-MAX_HISTORY:]
-
-    # Save back to session
-    session["chat_session_data"] = chat_data
+    # ---------------- Load per-user conversation (server-side) ----------------
+    sid, chat_data, messages = start_chat_turn(username, mode, message)
 
 
     # ---------------- Call Azure Chat API ----------------
     try:
-        reply = azure_chat(chat_data["messages"], vector_store_id=vector_store_id)
-        chat_data["messages"].append({"role": "assistant", "content": reply})
-        session["chat_session_data"] = chat_data  # Save updated session
+        reply = azure_chat(messages, vector_store_id=vector_store_id,
+                           call_site=MENTOR_CHAT if mode == "mentor" else SUPPORT_CHAT, session_id=sid)
+        end_chat_turn(sid, chat_data, reply)
 
         return jsonify({"reply": reply, "mode": mode, "username": username})
 
+    except TokenBudgetExceeded as e:
+        return jsonify({
+            "error": "token_budget_exceeded",
+            "detail": str(e),
+            "estimated_tokens": e.estimated,
+            "budget": e.budget
+        }), 413
     except requests.HTTPError as e:
         status = getattr(e.response, "status_code", 502)
         body = getattr(e.response, "text", "")
@@ -389,17 +638,35 @@ def chat():
 @app.post("/api/vector-stores")
 def create_vector_store():
     url = f"{AZURE_BASE_URL}/vector_stores?api-version={AZURE_API_VERSION}"
-    headers = {"Content-Type": "application/json", "api-key": AZURE_API_KEY}
     body = request.get_json(force=True, silent=True) or {}
     if "name" not in body:
         body["name"] = "psa_employee_knowledge"
-    r = requests.post(url, json=body, headers=headers, timeout=60)
-    r.raise_for_status()
+    r = upstream.post(url, body)
     return jsonify(r.json()), 201
 
 
 
 
+# ---------------- Upstream usage ----------------
+@app.get("/api/usage")
+def usage_all():
+    """Admin: payload/token aggregates per call site and for recent chat sessions."""
+    if not session.get("isadmin"):
+        return jsonify({"error": "forbidden", "detail": "Admin access only"}), 403
+    return jsonify({"sites": usage_tracker.sites(), "sessions": usage_tracker.sessions(),
+                    "rate_limit": upstream.limiter.stats() if upstream.limiter is not None else None})
+
+@app.get("/api/usage/session")
+def usage_session():
+    """Totals for the caller's own chat session."""
+    if not session.get("username"):
+        return jsonify({"error": "not_logged_in", "detail": "Please log in first."}), 401
+    sid = session.get("chat_sid")
+    return jsonify({"session": usage_tracker.session(sid)})
+
+
+
+
 # ----------------Leadership Potential----------------------
 
 from leadership import compute_weighted_LPI, summarize_leadership
@@ -418,18 +685,9 @@ def leadership_me():
         return jsonify({"error": "not_logged_in", "detail": "Please log in first."}), 401
 
 
-    json_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        "..",
-        "public",
-        "Data",
-        "employees.json"
-    )
-
     try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            employees = json.load(f)
-        current = next((e for e in employees if e.get("employee_id") == username), None)
+        with metrics.phase("data_load"):
+            current = employee_source().get(username)
     except Exception as e:
         return jsonify({"error": "data_load_failed", "detail": str(e)}), 500
 
@@ -438,7 +696,8 @@ def leadership_me():
 
     # Compute leadership potential for the logged-in user only
     try:
-        score, subscores = compute_weighted_LPI(current)
+        with metrics.phase("scoring"):
+            score, subscores = compute_weighted_LPI(current)
         try:
             summary = summarize_leadership(current, score, subscores)
         except Exception as e:
@@ -456,9 +715,28 @@ def leadership_me():
         return jsonify({"error": "internal_error", "detail": str(e)}), 500
 
 # -----------------Leadership Potential(Admin)--------
-from leadership import compute_weighted_LPI, summarize_leadership
+from leadership import score_and_summarize, compute_weighted_LPI_batch
+import leadership
 from flask_cors import cross_origin
 
+# Materialized LPI scores; only new/changed profiles are rescored when employees.json changes
+score_store = ScoreStore.from_env()
+
+def stored_scores(employees):
+    """compute_weighted_LPI_batch-style results for employees, served from score_store."""
+    try:
+        score_store.ensure_current(employee_source())
+        table = score_store.scores()
+    except Exception as e:
+        print(f"[WARN] Score store unavailable, scoring inline: {e}")
+        return compute_weighted_LPI_batch(employees)
+    scored = [table.get(emp.get("employee_id")) for emp in employees]
+    missing = [i for i, s in enumerate(scored) if s is None]
+    if missing:
+        for i, s in zip(missing, compute_weighted_LPI_batch([employees[i] for i in missing])):
+            scored[i] = s
+    return scored
+
 @app.route("/api/leadership/all", methods=["OPTIONS", "GET"])
 @cross_origin(
     origins=["http://localhost:3000"],
@@ -474,45 +752,339 @@ def leadership_all():
         return jsonify({"error": "forbidden", "detail": "Admin access only"}), 403
 
 
-    json_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        "..",
-        "public",
-        "Data",
-        "employees.json"
-    )
+    if any(k in request.args for k in PAGE_PARAMS):
+        return leadership_page()
+
+    # A job that scored today's dataset already holds every row and summary
+    job = job_runner.latest() if job_runner is not None else None
+    if job is not None:
+        if leadership.wants_ndjson():
+            return leadership.ndjson_rows_response(job_runner.store.iter_results(job["job_id"]), "leadership_all",
+                                                   headers={"X-Leadership-Job": job["job_id"]})
+        results = job_runner.store.results(job["job_id"])
+        return jsonify({"count": len(results), "results": results, "job_id": job["job_id"],
+                        "scored_at": job["finished_at"]}), 200
 
     try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            employees = json.load(f)
+        with metrics.phase("data_load"):
+            employees = employee_source().all()
     except Exception as e:
         return jsonify({"error": "data_load_failed", "detail": str(e)}), 500
 
-    results = []
-    for emp in employees:
-        try:
-            score, subscores = compute_weighted_LPI(emp)
-            try:
-                summary = summarize_leadership(emp, score, subscores)
-            except Exception as e:
-                summary = f"(AI summary unavailable: {e})"
-            results.append({
-                "employee_id": emp.get("employee_id"),
-                "name": (emp.get("personal_info") or {}).get("name"),
-                "leadership_score": score,
-                "dimension_scores": subscores,
-                "ai_summary": summary,
-            })
-        except Exception as e:
-            results.append({
-                "employee_id": emp.get("employee_id"),
-                "name": (emp.get("personal_info") or {}).get("name"),
-                "error": f"scoring_failed: {e}",
-            })
+    with metrics.phase("scoring"):
+        scored_all = stored_scores(employees)
+
+    if leadership.wants_ndjson():
+        return leadership.ndjson_response(employees, "leadership_all", scored_all)
+
+    results, _ = score_and_summarize(employees, scored_all)
 
     return jsonify({"count": len(results), "results": results}), 200
 
 
+# Any of these switches /api/leadership/all from the full list to one page
+PAGE_PARAMS = ("limit", "cursor", "sort", "order", "department", "unit", "office_location",
+               "min_score", "max_score")
+
+def _encode_cursor(sort, order, after):
+    raw = json.dumps([sort, order, after[0], after[1]], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    sort, order, value, employee_id = json.loads(raw)
+    return sort, order, (value, employee_id)
+
+
+def leadership_page():
+    """
+    One page of /api/leadership/all:
+      ?limit= (1-200, default 50) &cursor= (next_cursor of the previous page)
+      ?sort=score|<dimension> &order=desc|asc
+      ?department= &unit= &office_location= &min_score= &max_score=
+    Rows come from score_store; AI summaries are generated for this page only.
+    """
+    args = request.args
+    sort = args.get("sort", "score")
+    order = args.get("order", "desc").lower()
+    if sort != "score" and sort not in leadership.LPI_WEIGHTS:
+        return jsonify({"error": "bad_request",
+                        "detail": f"sort must be 'score' or one of {', '.join(leadership.LPI_WEIGHTS)}"}), 400
+    if order not in ("asc", "desc"):
+        return jsonify({"error": "bad_request", "detail": "order must be 'asc' or 'desc'"}), 400
+    try:
+        limit = min(200, max(1, int(args.get("limit", 50))))
+        min_score = float(args["min_score"]) if args.get("min_score") else None
+        max_score = float(args["max_score"]) if args.get("max_score") else None
+    except ValueError:
+        return jsonify({"error": "bad_request", "detail": "limit/min_score/max_score must be numbers"}), 400
+
+    after = None
+    if args.get("cursor"):
+        try:
+            cursor_sort, cursor_order, after = _decode_cursor(args["cursor"])
+        except Exception:
+            return jsonify({"error": "bad_request", "detail": "invalid cursor"}), 400
+        if (cursor_sort, cursor_order) != (sort, order):
+            return jsonify({"error": "bad_request", "detail": "cursor was issued for a different sort/order"}), 400
+
+    filters = {
+        "department": args.get("department") or None,
+        "unit": args.get("unit") or None,
+        "office_location": args.get("office_location") or None,
+        "min_score": min_score,
+        "max_score": max_score,
+    }
+    try:
+        repo = employee_source()
+        with metrics.phase("scoring"):
+            score_store.ensure_current(repo)
+            rows, next_after = score_store.page(sort, order == "desc", limit, after, **filters)
+            total = score_store.count(**filters)
+    except Exception as e:
+        return jsonify({"error": "data_load_failed", "detail": str(e)}), 500
+
+    employees, scored = [], []
+    for row in rows:
+        emp = repo.get(row["employee_id"])
+        if emp is not None:
+            employees.append(emp)
+            scored.append((row["leadership_score"], row["dimension_scores"]))
+    results, _ = score_and_summarize(employees, scored)
+
+    return jsonify({
+        "count": len(results),
+        "total": total,
+        "sort": sort,
+        "order": order,
+        "next_cursor": _encode_cursor(sort, order, next_after) if next_after else None,
+        "results": results,
+    }), 200
+
+
+@app.route("/api/leadership/scores", methods=["OPTIONS", "GET"])
+@cross_origin(origins=["http://localhost:3000"], allow_headers=["Content-Type"], supports_credentials=True)
+def leadership_scores():
+    """
+    Indexed score queries (no AI summaries):
+      ?limit=&offset=              top-N across the org
+      ?department=                 ranking within one department (adds "rank")
+      ?min_score=&max_score=       score-range filter
+      ?employee_id=                org/department rank of one employee
+    """
+    if request.method == "OPTIONS":
+        return ("", 204)
+
+    if not session.get("isadmin"):
+        return jsonify({"error": "forbidden", "detail": "Admin access only"}), 403
+
+    try:
+        limit = min(1000, max(1, int(request.args.get("limit", 50))))
+        offset = max(0, int(request.args.get("offset", 0)))
+        min_score = float(request.args["min_score"]) if request.args.get("min_score") else None
+        max_score = float(request.args["max_score"]) if request.args.get("max_score") else None
+    except ValueError:
+        return jsonify({"error": "bad_request", "detail": "limit/offset/min_score/max_score must be numbers"}), 400
+    department = request.args.get("department") or None
+
+    try:
+        with metrics.phase("scoring"):
+            sync = score_store.ensure_current(employee_source())
+    except Exception as e:
+        return jsonify({"error": "data_load_failed", "detail": str(e)}), 500
+
+    employee_id = request.args.get("employee_id")
+    if employee_id:
+        rank = score_store.rank(employee_id)
+        if rank is None:
+            return jsonify({"error": "not_found", "detail": f"No score for '{employee_id}'"}), 404
+        return jsonify({"employee_id": employee_id, **rank}), 200
+
+    if department:
+        results = score_store.department_ranking(department, limit, offset, min_score, max_score)
+    else:
+        results = score_store.top(limit, offset, None, min_score, max_score)
+    return jsonify({
+        "total": score_store.count(department, min_score, max_score),
+        "offset": offset,
+        "results": results,
+        "sync": sync,
+    }), 200
+
+
+@app.get("/api/leadership/scores/departments")
+@cross_origin(origins=["http://localhost:3000"], supports_credentials=True)
+def leadership_score_departments():
+    if not session.get("isadmin"):
+        return jsonify({"error": "forbidden", "detail": "Admin access only"}), 403
+    try:
+        score_store.ensure_current(employee_source())
+    except Exception as e:
+        return jsonify({"error": "data_load_failed", "detail": str(e)}), 500
+    return jsonify({"departments": score_store.departments()}), 200
+
+
+# ---------------- Skill gaps ----------------
+@app.route("/api/skills/gap", methods=["OPTIONS", "GET"])
+@cross_origin(origins=["http://localhost:3000"], allow_headers=["Content-Type"], supports_credentials=True)
+def skills_gap():
+    """
+    Skill gaps computed locally (no AI call):
+      (no params)                  vs own department and own job title
+      ?department= / ?job_title=   vs that group's typical profile (both may be given)
+      ?employee_id=                another employee (admin only)
+      ?limit=                      skills listed per missing/shared/extra (default 10)
+    """
+    if request.method == "OPTIONS":
+        return ("", 204)
+
+    username = session.get("username")
+    if not username:
+        return jsonify({"error": "not_logged_in", "detail": "Please log in first."}), 401
+
+    employee_id = request.args.get("employee_id") or username
+    if employee_id != username and not session.get("isadmin"):
+        return jsonify({"error": "forbidden", "detail": "Admin access only"}), 403
+    try:
+        limit = min(100, max(1, int(request.args.get("limit", 10))))
+    except ValueError:
+        return jsonify({"error": "bad_request", "detail": "limit must be a number"}), 400
+
+    try:
+        with metrics.phase("data_load"):
+            repo = employee_source()
+            current = repo.get(employee_id)
+            index = get_skill_gap_index(repo, SKILLS_XLSX)
+    except Exception as e:
+        return jsonify({"error": "data_load_failed", "detail": str(e)}), 500
+    if not current:
+        return jsonify({"error": "not_found", "detail": f"No employee profile for '{employee_id}'"}), 404
+
+    targets = [(kind, request.args[kind]) for kind in ("department", "job_title") if request.args.get(kind)]
+    with metrics.phase("skill_gap"):
+        if targets:
+            gaps = [index.gap(current, kind, name, limit) for kind, name in targets]
+        else:
+            gaps = index.gaps_for(current, limit=limit)
+    unknown = [name for (kind, name), g in zip(targets, gaps) if g is None]
+    if unknown:
+        return jsonify({"error": "not_found", "detail": f"No employees in {', '.join(unknown)}"}), 404
+
+    return jsonify({
+        "employee_id": employee_id,
+        "skills": len(index.dictionary.keys),
+        "catalog_skills": index.dictionary.catalog_size,
+        "gaps": gaps,
+    }), 200
+
+
+
+# ---------------- Employee search ----------------
+SEARCH_FILTERS = ("department", "unit", "office_location", "job_title", "skill", "function_area",
+                  "competency", "min_level", "language")
+NO_EMPLOYEE_STORE = {"error": "not_supported",
+                     "detail": "Needs EMPLOYEE_BACKEND=sqlite and an ingested db/employees.db (python db/init.py)"}
+
+@app.route("/api/employees/search", methods=["OPTIONS", "GET"])
+@cross_origin(origins=["http://localhost:3000"], allow_headers=["Content-Type"], supports_credentials=True)
+def employees_search():
+    """
+    Indexed employee lookup (admin only, SQLite backend):
+      ?department= &unit= &office_location= &job_title=   exact match
+      ?skill= &function_area= &language=                  any entry in the profile's list
+      ?competency= [&min_level=Beginner|Intermediate|Advanced]
+      ?limit= (1-200, default 50) &offset= &ids_only=1
+    """
+    if request.method == "OPTIONS":
+        return ("", 204)
+    if not session.get("isadmin"):
+        return jsonify({"error": "forbidden", "detail": "Admin access only"}), 403
+
+    args = request.args
+    filters = {name: args.get(name) or None for name in SEARCH_FILTERS}
+    if filters["min_level"] is not None and filters["min_level"] not in LEVEL_RANK:
+        return jsonify({"error": "bad_request", "detail": f"min_level must be one of {', '.join(LEVEL_RANK)}"}), 400
+    try:
+        limit = min(200, max(1, int(args.get("limit", 50))))
+        offset = max(0, int(args.get("offset", 0)))
+    except ValueError:
+        return jsonify({"error": "bad_request", "detail": "limit/offset must be numbers"}), 400
+    ids_only = args.get("ids_only") == "1"
+
+    try:
+        with metrics.phase("data_load"):
+            repo = employee_source()
+            if not hasattr(repo, "query"):
+                return jsonify(NO_EMPLOYEE_STORE), 501
+            results = repo.query(**filters, limit=limit, offset=offset, ids_only=ids_only)
+    except Exception as e:
+        return jsonify({"error": "data_load_failed", "detail": str(e)}), 500
+
+    return jsonify({"count": len(results), "limit": limit, "offset": offset, "results": results}), 200
+
+
+@app.route("/api/skills/counts", methods=["OPTIONS", "GET"])
+@cross_origin(origins=["http://localhost:3000"], allow_headers=["Content-Type"], supports_credentials=True)
+def skills_counts():
+    """Most common skills by number of employees: ?department= &limit= (1-200, default 50). SQLite backend."""
+    if request.method == "OPTIONS":
+        return ("", 204)
+    if not session.get("username"):
+        return jsonify({"error": "not_logged_in", "detail": "Please log in first."}), 401
+
+    department = request.args.get("department") or None
+    try:
+        limit = min(200, max(1, int(request.args.get("limit", 50))))
+    except ValueError:
+        return jsonify({"error": "bad_request", "detail": "limit must be a number"}), 400
+
+    try:
+        with metrics.phase("data_load"):
+            repo = employee_source()
+            if not hasattr(repo, "skill_counts"):
+                return jsonify(NO_EMPLOYEE_STORE), 501
+            counts = repo.skill_counts(department, limit)
+    except Exception as e:
+        return jsonify({"error": "data_load_failed", "detail": str(e)}), 500
+
+    return jsonify({
+        "department": department,
+        "skills": [{"skill_name": name, "employees": n} for name, n in counts],
+    }), 200
+
+
+# ---------------- Metrics ----------------
+metrics.init_app(app)
+
+@metrics.registry.register_collector
+def _cache_and_usage_metrics():
+    hits = metrics.Counter("cache_hits_total", "Cache hits by cache", ("cache",))
+    misses = metrics.Counter("cache_misses_total", "Cache misses by cache", ("cache",))
+    ratio = metrics.Gauge("cache_hit_ratio", "Hits / lookups since start, by cache", ("cache",))
+    caches = {"conversation": (getattr(conversation_store, "hits", 0), getattr(conversation_store, "misses", 0))}
+    if leadership.summary_cache is not None:
+        c = leadership.summary_cache.counters
+        caches["leadership_summary"] = (c["hits"], c["misses"])
+    for name, (h, m) in caches.items():
+        hits.inc(h, cache=name)
+        misses.inc(m, cache=name)
+        ratio.set(round(h / (h + m), 4) if h + m else 0, cache=name)
+
+    tokens = metrics.Counter("upstream_tokens_total", "Tokens reported by the upstream, by call site",
+                             ("site", "kind"))
+    payload = metrics.Counter("upstream_payload_bytes_total", "Request payload bytes sent upstream",
+                              ("site",))
+    for site, b in usage_tracker.sites().items():
+        for kind in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+            tokens.inc(b[kind], site=site, kind=kind.replace("_tokens", ""))
+        payload.inc(b["payload_bytes"], site=site)
+    return [hits, misses, ratio, tokens, payload]
+
+@app.get("/api/metrics")
+def metrics_endpoint():
+    """Prometheus text exposition of all app metrics."""
+    return app.response_class(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
 
 # ---------------- WebSocket Routes ----------------
 @socketio.on("connect", namespace="/ws")
@@ -525,6 +1097,59 @@ def handle_message(data):
     print(f"Received message: {data}")
     emit("response", {"message": f"Echo: {data}"})
 
+@socketio.on("chat", namespace="/ws")
+def handle_chat(data):
+    """
+    Streaming variant of /api/chat. Payload as for /api/chat plus an optional
+    client "id" echoed on every event. Emits chat_start, chat_delta {delta}*,
+    then chat_done (full reply, same shape as /api/chat) or chat_error.
+    """
+    data = data if isinstance(data, dict) else {}
+    ref = {"id": data.get("id")}
+
+    username = session.get("username")
+    if not username:
+        emit("chat_error", {**ref, "error": "not_logged_in", "detail": "Please log in first."})
+        return
+
+    mode = (data.get("mode") or "support").lower()
+    if mode not in ("mentor", "support"):
+        emit("chat_error", {**ref, "error": "bad_request", "detail": "mode must be 'mentor' or 'support'"})
+        return
+
+    message = (data.get("message") or "").strip()
+    if not message:
+        emit("chat_error", {**ref, "error": "bad_request", "detail": "message required"})
+        return
+
+    gated = gate_chat_message(mode, message, data.get("content_filter_result", {}))
+    if gated:
+        emit("chat_done", {**ref, **gated})
+        return
+
+    vector_store_id = data.get("vector_store_id") or DEFAULT_VECTOR_STORE_ID
+    sid, chat_data, messages = start_chat_turn(username, mode, message)
+
+    emit("chat_start", {**ref, "mode": mode})
+    parts = []
+    try:
+        for delta in azure_chat_stream(messages, vector_store_id=vector_store_id,
+                                       call_site=MENTOR_CHAT if mode == "mentor" else SUPPORT_CHAT,
+                                       session_id=sid):
+            parts.append(delta)
+            emit("chat_delta", {**ref, "delta": delta})
+            socketio.sleep(0)  # let the transport flush between tokens
+    except TokenBudgetExceeded as e:
+        emit("chat_error", {**ref, "error": "token_budget_exceeded", "detail": str(e)})
+        return
+    except Exception as e:
+        emit("chat_error", {**ref, "error": "upstream_error", "detail": str(e)})
+        return
+
+    reply = "".join(parts)
+    end_chat_turn(sid, chat_data, reply)
+    emit("chat_done", {**ref, "reply": reply, "mode": mode, "username": username})
+
 @socketio.on("disconnect", namespace="/ws")
 def handle_disconnect():
     print("Client disconnected")
@@ -0,0 +1,144 @@
+"""
+Keyword matching microbenchmark.
+
+Compares the original `any(k in text for k in group)` scans with
+keywords.KeywordMatcher and two single-pass alternatives (compiled regex
+alternation, pure-Python Aho-Corasick) on long inputs built from the
+employee dataset.
+
+Run from the server directory:
+    python3 bench/bench_keywords.py [--repeat N]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app import CRISIS_KEYWORDS                                   # noqa: E402
+from employee_repo import EMPLOYEES_JSON                          # noqa: E402
+from keywords import KeywordMatcher                               # noqa: E402
+from leadership import PEOPLE_KEYWORDS, CHANGE_KEYWORDS           # noqa: E402
+
+GROUPS = {
+    "crisis": sorted(CRISIS_KEYWORDS),
+    "people": PEOPLE_KEYWORDS,
+    "innovation": CHANGE_KEYWORDS,
+}
+
+
+# ---------- contenders ----------
+def naive(text):
+    lowered = text.lower()
+    return {name for name, words in GROUPS.items() if any(k in lowered for k in words)}
+
+
+class RegexAlternation:
+    def __init__(self, groups):
+        self.owner = {}
+        for name, words in groups.items():
+            for w in words:
+                self.owner.setdefault(w.lower(), set()).add(name)
+        words = sorted(self.owner, key=len, reverse=True)
+        # Lookahead so overlapping occurrences are all reported
+        self.rx = re.compile("(?=(" + "|".join(map(re.escape, words)) + "))")
+        # A hit on a longer keyword implies any keyword it contains
+        for w in words:
+            for other in words:
+                if other != w and other in w:
+                    self.owner[w] |= self.owner[other]
+
+    def match(self, text):
+        found, want = set(), len({n for s in self.owner.values() for n in s})
+        for m in self.rx.finditer(text.lower()):
+            found |= self.owner[m.group(1)]
+            if len(found) == want:
+                break
+        return found
+
+
+class AhoCorasick:
+    def __init__(self, groups):
+        self.goto, self.fail, self.out = [{}], [0], [set()]
+        for name, words in groups.items():
+            for w in words:
+                node = 0
+                for ch in w.lower():
+                    nxt = self.goto[node].get(ch)
+                    if nxt is None:
+                        nxt = len(self.goto)
+                        self.goto[node][ch] = nxt
+                        self.goto.append({})
+                        self.fail.append(0)
+                        self.out.append(set())
+                    node = nxt
+                self.out[node].add(name)
+        queue = list(self.goto[0].values())
+        while queue:
+            node = queue.pop(0)
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0) if self.goto[f].get(ch, 0) != nxt else 0
+                self.out[nxt] |= self.out[self.fail[nxt]]
+
+    def match(self, text):
+        goto, fail, out = self.goto, self.fail, self.out
+        found, node = set(), 0
+        for ch in text.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+
+# ---------- inputs ----------
+def build_inputs():
+    with open(EMPLOYEES_JSON, "r", encoding="utf-8") as f:
+        corpus = json.dumps(json.load(f))
+    filler = re.sub("|".join(w for ws in GROUPS.values() for w in ws), "xxxx", corpus.lower())
+    inputs = {}
+    for size in (10_000, 100_000, 1_000_000):
+        base = (filler * (size // len(filler) + 1))[:size]
+        inputs[f"{size // 1000}k no-hit"] = base
+        inputs[f"{size // 1000}k late-hit"] = base + " I want to END MY LIFE; mentor; cloud"
+        inputs[f"{size // 1000}k early-hit"] = "mentor cloud suicide " + base
+    return inputs
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    matcher = KeywordMatcher(GROUPS)
+    contenders = {
+        "any(k in text)": naive,
+        "KeywordMatcher": matcher.match,
+        "regex alternation": RegexAlternation(GROUPS).match,
+        "aho-corasick (py)": AhoCorasick(GROUPS).match,
+    }
+
+    print(f"{'input':<16}" + "".join(f"{name:>20}" for name in contenders))
+    for label, text in build_inputs().items():
+        expected = naive(text)
+        row = f"{label:<16}"
+        for name, fn in contenders.items():
+            assert fn(text) == expected, (name, label)
+            n = max(1, args.repeat // (10 if len(text) >= 1_000_000 else 1))
+            if name == "aho-corasick (py)":
+                n = max(1, n // 10)
+            secs = timeit.timeit(lambda: fn(text), number=n) / n
+            row += f"{secs * 1e6:>18.1f}us"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Resident memory of the employee repository: plain dicts vs compact records.
+
+Loads the same synthetic dataset (bench/gen_employees.py) into an
+EmployeeRepository with compact=False and compact=True and reports, for
+each, the memory still allocated once the snapshot is built (tracemalloc),
+the load peak, load time, and the cost of reading records back (get() and a
+full all() pass, which expand compact records into fresh dicts). The compact
+run also checks that every record round-trips to exactly the loaded JSON.
+
+Run from the server directory:
+    python3 bench/bench_memory.py                  # 100k employees
+    python3 bench/bench_memory.py --size 10k --json
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, HERE)
+
+from bench_suite import dataset                # noqa: E402
+from employee_repo import EmployeeRepository   # noqa: E402
+from gen_employees import parse_size           # noqa: E402
+
+MB = 1024 * 1024
+
+
+def measure(path: str, use_compact: bool, sample_ids) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    repo = EmployeeRepository(path, compact=use_compact)
+    repo.version()
+    load_s = time.perf_counter() - started
+    gc.collect()
+    resident, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for emp_id in sample_ids:
+        repo.get(emp_id)
+    get_us = (time.perf_counter() - started) / len(sample_ids) * 1e6
+
+    started = time.perf_counter()
+    n = sum(1 for _ in repo.all())
+    scan_s = time.perf_counter() - started
+
+    result = {
+        "mode": "compact" if use_compact else "dict",
+        "records": n,
+        "resident_mb": round(resident / MB, 1),
+        "bytes_per_record": round(resident / max(n, 1)),
+        "load_peak_mb": round(peak / MB, 1),
+        "load_s": round(load_s, 2),
+        "get_us": round(get_us, 1),
+        "scan_all_s": round(scan_s, 2),
+    }
+    return result, repo
+
+
+def verify(path: str, repo) -> int:
+    """Records whose compact round trip differs from the file (expected 0)."""
+    with open(path, "r", encoding="utf-8") as f:
+        original = json.load(f)
+    return sum(1 for a, b in zip(original, repo.all()) if json.dumps(a) != json.dumps(b)) \
+        + abs(len(original) - len(repo.all()))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--size", default="100k", help="employees to generate (e.g. 10k, 100k, 1m)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--samples", type=int, default=1000, help="get() lookups to time")
+    ap.add_argument("--json", action="store_true", help="print results as JSON")
+    args = ap.parse_args(argv)
+
+    size = parse_size(args.size)
+    path = dataset(size, args.seed)
+    step = max(1, size // args.samples)
+    sample_ids = [f"EMP-{100000 + i}" for i in range(0, size, step)]
+
+    plain, repo = measure(path, False, sample_ids)
+    del repo
+    packed, repo = measure(path, True, sample_ids)
+    packed["mismatches"] = verify(path, repo)
+    packed.update(repo.pool_stats())
+    saving = 1 - packed["resident_mb"] / plain["resident_mb"] if plain["resident_mb"] else 0.0
+
+    if args.json:
+        print(json.dumps({"size": size, "results": [plain, packed], "saving": round(saving, 3)}, indent=2))
+    else:
+        cols = ["mode", "records", "resident_mb", "bytes_per_record", "load_peak_mb", "load_s", "get_us",
+                "scan_all_s"]
+        print(" ".join(f"{c:>16}" for c in cols))
+        for r in (plain, packed):
+            print(" ".join(f"{r[c]:>16}" for c in cols))
+        print(f"\ncompact saves {saving:.0%} resident memory; "
+              f"{packed['strings']} interned strings, {packed['shapes']} key layouts; "
+              f"round-trip mismatches: {packed['mismatches']}")
+    return 1 if packed["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Department / job-title norms: build time, incremental update time, and a
+correctness check that the incrementally maintained index matches a full
+rebuild.
+
+Generates --employees synthetic records, builds a NormsIndex, then edits
+--edits records (competency levels bumped, skills dropped, departments and
+job titles moved), removes and adds --edits more, and times update() on the
+changed dataset against a from-scratch build. Every department and job-title
+summary of the two indexes must be identical.
+
+Run from the server directory:
+    python3 bench/bench_norms.py
+    python3 bench/bench_norms.py --employees 100000 --edits 500
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, HERE)
+
+from gen_employees import generate  # noqa: E402
+from norms import NormsIndex        # noqa: E402
+
+
+def edit(emp, rng, departments, titles):
+    info = emp["employment_info"]
+    choice = rng.randrange(4)
+    if choice == 0 and emp.get("competencies"):
+        c = rng.choice(emp["competencies"])
+        c["level"] = {"Beginner": "Intermediate", "Intermediate": "Advanced"}.get(c["level"], "Beginner")
+    elif choice == 1 and emp.get("skills"):
+        emp["skills"].pop(rng.randrange(len(emp["skills"])))
+    elif choice == 2:
+        info["department"] = rng.choice(departments)
+    else:
+        info["job_title"] = rng.choice(titles)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--employees", type=int, default=20000)
+    ap.add_argument("--edits", type=int, default=200, help="records edited, and removed, and added")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    employees = list(generate(args.employees + args.edits, seed=args.seed))
+    extra, employees = employees[args.employees:], employees[:args.employees]
+    departments = sorted({e["employment_info"]["department"] for e in employees})
+    titles = sorted({e["employment_info"]["job_title"] for e in employees})
+
+    index = NormsIndex()
+    started = time.perf_counter()
+    index.update(employees)
+    build_s = time.perf_counter() - started
+    print(f"build: {args.employees} employees, {len(index.groups)} groups in {build_s:.2f}s")
+
+    changed = [copy.deepcopy(e) for e in employees]
+    for i in rng.sample(range(len(changed)), args.edits):
+        edit(changed[i], rng, departments, titles)
+    for i in sorted(rng.sample(range(len(changed)), args.edits), reverse=True):
+        changed.pop(i)
+    changed.extend(extra)
+
+    started = time.perf_counter()
+    stats = index.update(changed)
+    update_s = time.perf_counter() - started
+    print(f"update: {stats} in {update_s:.2f}s ({build_s / max(update_s, 1e-9):.1f}x faster than a build)")
+
+    fresh = NormsIndex()
+    fresh.update(changed)
+    keys = set(index.groups) | set(fresh.groups)
+    mismatched = [k for k in sorted(keys) if index.summary(*k) != fresh.summary(*k)]
+    sample = index.for_employee(changed[0])
+    print(f"summary for one employee: {len(json.dumps(sample))} bytes of JSON")
+    print(f"{len(keys)} group summaries compared, {len(mismatched)} mismatched")
+    for k in mismatched[:5]:
+        print("  mismatch:", k)
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Upstream rate limiter under a quota-enforcing mock (bench/mock_azure.py --rpm).
+
+Runs a bulk leadership summary batch (the leadership_all path:
+summarize_many over --batch synthetic employees) while interactive chat
+calls arrive every --chat-every seconds (for --duration seconds or until the
+batch is done, whichever is later), twice against the same quota:
+
+    no limiter   the pre-limiter behaviour: calls go straight upstream
+    limiter      RateLimiter(rpm=--rpm): RPM budget, Retry-After, lanes
+
+and reports upstream 429s, batch time and failures, and interactive
+latency (p50/p95/max) and failures for each.
+
+Run from the server directory:
+    python3 bench/bench_ratelimit.py
+    python3 bench/bench_ratelimit.py --rpm 120 --batch 200 --inflight 16
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, HERE)
+
+import mock_azure                   # noqa: E402
+from gen_employees import generate  # noqa: E402
+from loadtest import percentile     # noqa: E402
+
+
+def run_scenario(app, leadership, mock, jobs, args):
+    mock.stats.update({k: 0 for k in mock.stats})
+    mock._window.clear()
+    mock._window_tokens = 0
+
+    chats = []  # (seconds, ok)
+    done = threading.Event()
+
+    def chat(i):
+        started = time.perf_counter()
+        try:
+            app.azure_chat([{"role": "system", "content": app.SUPPORT_SYSTEM},
+                            {"role": "user", "content": f"Chat #{i}: how do I ask for feedback?"}],
+                           call_site="support_chat")
+            ok = True
+        except Exception:
+            ok = False
+        chats.append((time.perf_counter() - started, ok))
+
+    def interactive():
+        i, threads = 0, []
+        until = time.monotonic() + args.duration
+        while not done.is_set() or time.monotonic() < until:
+            t = threading.Thread(target=chat, args=(i,))
+            t.start()
+            threads.append(t)
+            i += 1
+            time.sleep(args.chat_every)
+        for t in threads:
+            t.join()
+
+    driver = threading.Thread(target=interactive)
+    started = time.perf_counter()
+    driver.start()
+    summaries = leadership.summarize_many(jobs, max_inflight=args.inflight, item_timeout=900)
+    batch_s = time.perf_counter() - started
+    done.set()
+    driver.join()
+
+    latencies = sorted(s for s, _ in chats)
+    return {
+        "upstream_429": mock.stats["429"],
+        "batch_s": round(batch_s, 1),
+        "batch_failed": sum(1 for s in summaries if str(s).startswith("(AI summary unavailable")),
+        "chats": len(chats),
+        "chat_failed": sum(1 for _, ok in chats if not ok),
+        "chat_p50_ms": round(percentile(latencies, 50) * 1000),
+        "chat_p95_ms": round(percentile(latencies, 95) * 1000),
+        "chat_max_ms": round(latencies[-1] * 1000) if latencies else 0,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rpm", type=int, default=60, help="deployment quota enforced by the mock and the limiter")
+    ap.add_argument("--batch", type=int, default=60, help="leadership summaries in the bulk run")
+    ap.add_argument("--inflight", type=int, default=16, help="LEADERSHIP_MAX_INFLIGHT for the batch")
+    ap.add_argument("--chat-every", type=float, default=4.0, help="seconds between interactive chat calls")
+    ap.add_argument("--duration", type=float, default=75, help="minimum seconds of interactive traffic")
+    ap.add_argument("--latency", default="fixed:300", help="mock completion latency")
+    ap.add_argument("--mock-port", type=int, default=18096)
+    args = ap.parse_args(argv)
+
+    mock = mock_azure.MockAzure(latency=args.latency, rpm=args.rpm)
+    server = mock_azure.serve(args.mock_port, mock)
+    workdir = tempfile.mkdtemp(prefix="ratelimit-")
+    os.environ.update({
+        "AZURE_OPENAI_BASE_URL": f"http://127.0.0.1:{args.mock_port}/openai",
+        "AZURE_OPENAI_API_KEY": "mock",
+        "AZURE_POOL_SIZE": "32",
+        "CHAT_STORE_PATH": os.path.join(workdir, "sessions.db"),
+        "LEADERSHIP_JOBS": "0",
+        "LEADERSHIP_MAX_INFLIGHT": str(args.inflight),  # sizes the shared summary pool
+        "SUMMARY_CACHE": "0",
+        "LPI_SCORES_PATH": os.path.join(workdir, "lpi_scores.db"),
+    })
+    import app                                # noqa: E402
+    import leadership                         # noqa: E402
+    from ratelimit import RateLimiter         # noqa: E402
+
+    employees = list(generate(args.batch, seed=7))
+    jobs = [(emp, score, subs) for emp, (score, subs)
+            in zip(employees, leadership.compute_weighted_LPI_batch(employees))]
+
+    results = {}
+    for name, limiter in (("no limiter", None), ("limiter", RateLimiter(rpm=args.rpm))):
+        app.upstream.limiter = limiter
+        print(f"{name}: {args.batch} summaries ({args.inflight} in flight) + chat every {args.chat_every:g}s, "
+              f"quota {args.rpm} rpm ...", flush=True)
+        results[name] = run_scenario(app, leadership, mock, jobs, args)
+
+    cols = list(next(iter(results.values())))
+    print(f"\n{'':<12}" + "".join(f"{c:>14}" for c in cols))
+    for name, row in results.items():
+        print(f"{name:<12}" + "".join(f"{row[c]:>14}" for c in cols))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
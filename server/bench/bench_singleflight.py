@@ -0,0 +1,136 @@
+"""
+Single-flight check for azure_chat against bench/mock_azure.py.
+
+Fires --callers threads at once, spread over --prompts distinct prompts, and
+checks that:
+  * the mock saw one upstream request per distinct prompt (not per caller),
+  * every caller of a prompt got the identical reply (the mock's replies
+    vary in length, so independent calls would differ),
+  * with --error-5xx 1 every caller gets the leader's error and the mock
+    sees one request per prompt per attempt,
+  * upstream_singleflight_total{role=...} matches.
+Then it runs concurrent admin-style leadership summary batches (summary
+cache off) and reports how many upstream calls they needed.
+
+Run from the server directory:
+    python3 bench/bench_singleflight.py
+    python3 bench/bench_singleflight.py --callers 200 --prompts 5 --latency fixed:1500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, HERE)
+
+import mock_azure  # noqa: E402
+
+
+def fire(fn, n):
+    """Run fn(i) on n threads released together -> ([result or exception], seconds)."""
+    out = [None] * n
+    gate = threading.Barrier(n)
+
+    def run(i):
+        gate.wait()
+        try:
+            out[i] = fn(i)
+        except Exception as e:
+            out[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return out, time.perf_counter() - started
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--callers", type=int, default=100, help="concurrent azure_chat callers")
+    ap.add_argument("--prompts", type=int, default=4, help="distinct prompts among them")
+    ap.add_argument("--admins", type=int, default=5, help="concurrent leadership summary batches")
+    ap.add_argument("--mock-port", type=int, default=18095)
+    ap.add_argument("--latency", default="fixed:800", help="mock completion latency")
+    args = ap.parse_args(argv)
+
+    mock = mock_azure.MockAzure(latency=args.latency)
+    server = mock_azure.serve(args.mock_port, mock)
+    workdir = tempfile.mkdtemp(prefix="singleflight-")
+    os.environ.update({
+        "AZURE_OPENAI_BASE_URL": f"http://127.0.0.1:{args.mock_port}/openai",
+        "AZURE_OPENAI_API_KEY": "mock",
+        "AZURE_POOL_SIZE": str(max(10, args.callers)),
+        "AZURE_BACKOFF_BASE": "0.05",
+        "CHAT_STORE_PATH": os.path.join(workdir, "sessions.db"),
+        "LEADERSHIP_JOBS": "0",
+        "SUMMARY_CACHE": "0",
+        "LPI_SCORES_PATH": os.path.join(workdir, "lpi_scores.db"),
+    })
+    import app                                      # noqa: E402
+    import leadership                               # noqa: E402
+    from singleflight import SINGLEFLIGHT_CALLS     # noqa: E402
+
+    def prompt(i):
+        return [{"role": "system", "content": app.SUPPORT_SYSTEM},
+                {"role": "user", "content": f"Question #{i % args.prompts}: how do I manage my workload?"}]
+
+    failures = []
+
+    def check(label, ok, detail):
+        print(f"  {'ok  ' if ok else 'FAIL'} {label}: {detail}")
+        if not ok:
+            failures.append(label)
+
+    # ---- shared results ----
+    print(f"{args.callers} concurrent callers, {args.prompts} distinct prompts, mock latency {args.latency}")
+    before = dict(mock.stats)
+    results, elapsed = fire(lambda i: app.azure_chat(prompt(i), call_site="bench"), args.callers)
+    upstream = mock.stats["requests"] - before["requests"]
+    check("upstream requests", upstream == args.prompts, f"{upstream} for {args.callers} callers ({elapsed:.2f}s)")
+    errors = [r for r in results if isinstance(r, Exception)]
+    check("errors", not errors, f"{len(errors)}")
+    shared = all(len({results[i] for i in range(p, args.callers, args.prompts)}) == 1 for p in range(args.prompts))
+    check("identical replies per prompt", shared, "yes" if shared else "replies differ")
+    leaders = SINGLEFLIGHT_CALLS.value(call_site="bench", role="leader")
+    coalesced = SINGLEFLIGHT_CALLS.value(call_site="bench", role="coalesced")
+    check("counters", (leaders, coalesced) == (args.prompts, args.callers - args.prompts),
+          f"leader={leaders} coalesced={coalesced} ({coalesced / args.callers:.0%} coalesced)")
+
+    # ---- shared errors ----
+    mock.error_5xx = 1.0
+    before = dict(mock.stats)
+    results, elapsed = fire(lambda i: app.azure_chat(prompt(i), call_site="bench_error"), args.callers)
+    mock.error_5xx = 0.0
+    upstream = mock.stats["requests"] - before["requests"]
+    attempts = app.upstream.max_retries + 1
+    check("error upstream requests", upstream == args.prompts * attempts,
+          f"{upstream} (= {args.prompts} prompts x {attempts} attempts)")
+    errors = [r for r in results if isinstance(r, Exception)]
+    check("every caller got the error", len(errors) == args.callers, f"{len(errors)}/{args.callers}")
+
+    # ---- leadership dashboard opened by several admins at once ----
+    employees = app.employee_source().all()
+    jobs = [(emp, score, subs) for emp, (score, subs) in zip(employees, leadership.compute_weighted_LPI_batch(employees))]
+    # The summary pool is shared by the whole process; size it so every admin's items are in flight together
+    # (it is created on first use, below), otherwise later duplicates start after their leader has finished
+    os.environ["LEADERSHIP_MAX_INFLIGHT"] = str(args.admins * len(jobs))
+    before = dict(mock.stats)
+    _, elapsed = fire(lambda i: leadership.summarize_many(jobs), args.admins)
+    upstream = mock.stats["requests"] - before["requests"]
+    check("leadership summaries", upstream == len(jobs),
+          f"{args.admins} admins x {len(jobs)} employees -> {upstream} upstream calls ({elapsed:.2f}s)")
+
+    server.shutdown()
+    print("all checks passed" if not failures else f"{len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
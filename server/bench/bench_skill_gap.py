@@ -0,0 +1,98 @@
+"""
+Bitset skill-gap engine: index build time, per-gap latency, and a check
+against a straightforward set-based implementation.
+
+Generates --employees synthetic records (skills drawn from
+Functions_Skills.xlsx), builds a SkillGapIndex, then for --queries random
+employees computes the gap against their own department and a random job
+title, and compares missing/shared/extra and coverage with Python sets of
+(function_area, specialization) pairs.
+
+Run from the server directory:
+    python3 bench/bench_skill_gap.py
+    python3 bench/bench_skill_gap.py --employees 100000 --queries 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, HERE)
+
+from gen_employees import generate                      # noqa: E402
+from loadtest import percentile                         # noqa: E402
+from skill_gap import SkillGapIndex, skill_key          # noqa: E402
+from skills_catalog import get_catalog                  # noqa: E402
+
+
+def skill_set(emp) -> set:
+    return {skill_key(s.get("function_area"), s.get("specialization")) for s in emp.get("skills") or []}
+
+
+def reference_gap(index, emp, kind, name):
+    """The same gap with sets; the typical profile is taken from the index so only the set algebra is checked."""
+    typical = {index.dictionary.keys[i] for i in range(len(index.dictionary.keys))
+               if index.groups[(kind, name)].typical >> i & 1}
+    have = skill_set(emp)
+    return typical - have, typical & have, have - typical
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--employees", type=int, default=20000)
+    ap.add_argument("--queries", type=int, default=5000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    employees = list(generate(args.employees, seed=args.seed))
+    rows = get_catalog().skills()
+    started = time.perf_counter()
+    index = SkillGapIndex(employees, rows)
+    build_s = time.perf_counter() - started
+    titles = sorted(name for kind, name in index.groups if kind == "job_title")
+    print(f"build: {args.employees} employees, {len(index.dictionary.keys)} skills "
+          f"({index.dictionary.catalog_size} from the catalog), {len(index.groups)} groups in {build_s:.2f}s")
+
+    queries = []
+    for _ in range(args.queries):
+        emp = rng.choice(employees)
+        queries.append((emp, "department", emp["employment_info"]["department"]))
+        queries.append((emp, "job_title", rng.choice(titles)))
+
+    # Set algebra alone, then the full report (ranking and rendering the listed skills)
+    algebra = []
+    for emp, kind, name in queries:
+        t0 = time.perf_counter()
+        have, target = index.encode(emp), index.groups[(kind, name)].typical
+        _ = (target & ~have, target & have, have & ~target, (target & have).bit_count())
+        algebra.append(time.perf_counter() - t0)
+    reports = []
+    for emp, kind, name in queries:
+        t0 = time.perf_counter()
+        index.gap(emp, kind, name, limit=1000)
+        reports.append(time.perf_counter() - t0)
+    for label, samples in (("set algebra", algebra), ("gap report", reports)):
+        samples.sort()
+        print(f"{label:<12} p50 {percentile(samples, 50) * 1e6:7.1f}us  p95 {percentile(samples, 95) * 1e6:7.1f}us  "
+              f"p99 {percentile(samples, 99) * 1e6:7.1f}us")
+
+    mismatches = 0
+    for emp, kind, name in queries:
+        report = index.gap(emp, kind, name, limit=1000)
+        missing, shared, extra = reference_gap(index, emp, kind, name)
+        got = [{skill_key(s["function_area"], s["specialization"]) for s in report[part]}
+               for part in ("missing", "shared", "extra")]
+        size = len(missing) + len(shared)
+        coverage = round(len(shared) / size, 2) if size else None
+        if got != [missing, shared, extra] or report["coverage"] != coverage:
+            mismatches += 1
+    print(f"{len(queries)} gaps compared with the set implementation, {mismatches} mismatched")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
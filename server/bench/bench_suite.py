@@ -0,0 +1,272 @@
+"""
+Scoring / data-path benchmark suite with saved baselines.
+
+For each dataset size (synthetic employees from bench/gen_employees.py) it
+measures wall time per operation and tracemalloc peak memory of:
+
+    lpi                  compute_weighted_LPI over every employee
+    employee_data_cold   first read_employee_data (parse + index the file)
+    employee_data_warm   read_employee_data lookups on a loaded repository
+    build_messages_cold  first mentor build_messages (includes peer-index build)
+    build_messages_warm  mentor build_messages once everything is cached
+    skills_excel_cold    read_skills_excel with no compiled sidecar (size-independent)
+    skills_excel_warm    read_skills_excel from the in-process catalog
+
+Results are compared with bench/baselines.json; a benchmark that is slower
+than baseline * (1 + --time-tolerance) or uses more than
+baseline * (1 + --mem-tolerance) peak memory fails the run (exit code 1).
+Baselines are machine-specific: regenerate them with --save-baseline on the
+machine that runs the comparison.
+
+Run from the server directory:
+    python3 bench/bench_suite.py                      # 1k, 10k, 100k, compare with baselines
+    python3 bench/bench_suite.py --sizes 1k,10k,100k,1m --only lpi,employee_data_cold
+    python3 bench/bench_suite.py --save-baseline
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, HERE)
+
+import app                                    # noqa: E402
+import employee_repo                          # noqa: E402
+import peer_index                             # noqa: E402
+import skills_catalog                         # noqa: E402
+from gen_employees import parse_size, write_json  # noqa: E402
+from leadership import compute_weighted_LPI   # noqa: E402
+
+BASELINES = os.path.join(HERE, "baselines.json")
+DATA_DIR = os.path.join(tempfile.gettempdir(), "psa-bench-data")
+QUESTIONS = [
+    "How can I grow into a team lead role?",
+    "Which cloud and automation skills should I build next?",
+    "Who has moved from operations into data analytics?",
+    "What certifications help with financial planning?",
+]
+
+
+def dataset(size: int, seed: int) -> str:
+    """Generated employees.json for this size/seed, reused across runs."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"employees_{size}_{seed}.json")
+    if not os.path.exists(path):
+        print(f"  generating {size} employees -> {path}")
+        write_json(path, size, seed)
+    return path
+
+
+def reset_employee_caches():
+    employee_repo._repos.clear()
+    peer_index._index = None
+    peer_index._index_version = None
+
+
+def reset_skills_caches(cache_dir):
+    skills_catalog._catalogs.clear()
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+# ---------- benchmarks ----------
+# Each takes the dataset path and returns (setup, run, ops): setup() is untimed
+# and called before every measured run(); run() performs `ops` operations.
+
+def bench_lpi(path):
+    employees = employee_repo.get_repository(path).all()
+
+    def run():
+        for emp in employees:
+            compute_weighted_LPI(emp)
+    return (lambda: None), run, len(employees)
+
+
+def bench_employee_data_cold(path):
+    emp_id = employee_repo.get_repository(path).all()[0]["employee_id"]
+    return reset_employee_caches, (lambda: app.read_employee_data(path, emp_id)), 1
+
+
+def bench_employee_data_warm(path):
+    employees = employee_repo.get_repository(path).all()
+    ids = [e["employee_id"] for e in employees[:: max(1, len(employees) // 1000)][:1000]]
+
+    def run():
+        for emp_id in ids:
+            app.read_employee_data(path, emp_id)
+    return (lambda: app.read_employee_data(path, ids[0])), run, len(ids)
+
+
+def _mentor_build(path):
+    employees = employee_repo.get_repository(path).all()
+    picks = [e["employee_id"] for e in employees[:: max(1, len(employees) // 20)][:20]]
+    app.EMPLOYEES_JSON = path  # build_messages / select_peers resolve this global at call time
+
+    def run():
+        for i, emp_id in enumerate(picks):
+            app.build_messages("mentor", QUESTIONS[i % len(QUESTIONS)], employee_id=emp_id)
+    return picks, run
+
+
+def bench_build_messages_cold(path):
+    picks, _ = _mentor_build(path)
+
+    def setup():
+        reset_employee_caches()
+
+    def run():
+        app.build_messages("mentor", QUESTIONS[0], employee_id=picks[0])
+    return setup, run, 1
+
+
+def bench_build_messages_warm(path):
+    picks, run = _mentor_build(path)
+    return (lambda: app.build_messages("mentor", QUESTIONS[0], employee_id=picks[0])), run, len(picks)
+
+
+def bench_skills_excel_cold(_path):
+    cache_dir = tempfile.mkdtemp(prefix="psa-bench-skills-")
+    skills_catalog.CACHE_DIR = cache_dir
+    return (lambda: reset_skills_caches(cache_dir)), (lambda: app.read_skills_excel(skills_catalog.SKILLS_XLSX)), 1
+
+
+def bench_skills_excel_warm(_path):
+    def run():
+        for _ in range(1000):
+            app.read_skills_excel(skills_catalog.SKILLS_XLSX)
+    return (lambda: app.read_skills_excel(skills_catalog.SKILLS_XLSX)), run, 1000
+
+
+BENCHES = {
+    "lpi": bench_lpi,
+    "employee_data_cold": bench_employee_data_cold,
+    "employee_data_warm": bench_employee_data_warm,
+    "build_messages_cold": bench_build_messages_cold,
+    "build_messages_warm": bench_build_messages_warm,
+    "skills_excel_cold": bench_skills_excel_cold,
+    "skills_excel_warm": bench_skills_excel_warm,
+}
+SIZE_INDEPENDENT = {"skills_excel_cold", "skills_excel_warm"}
+
+
+def measure(setup, run, ops, repeat):
+    """(best seconds per op, peak traced MB) — timing and memory in separate runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        setup()
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best / ops, peak / 1e6
+
+
+def compare(key, result, baselines, time_tol, mem_tol):
+    base = baselines.get(key)
+    if not base:
+        return "new", []
+    problems = []
+    # absolute floors keep sub-millisecond / sub-MB noise from failing the run
+    if result["time_s"] > base["time_s"] * (1 + time_tol) and \
+            (result["time_s"] - base["time_s"]) * result["ops"] > 0.010:
+        problems.append(f"time {result['time_s'] / base['time_s']:.2f}x")
+    if result["peak_mb"] > base["peak_mb"] * (1 + mem_tol) and result["peak_mb"] - base["peak_mb"] > 0.5:
+        problems.append(f"memory {result['peak_mb'] / base['peak_mb']:.2f}x")
+    return ("REGRESSION" if problems else "ok"), problems
+
+
+def fmt_time(s):
+    if s >= 1:
+        return f"{s:.2f} s"
+    if s >= 1e-3:
+        return f"{s * 1e3:.2f} ms"
+    return f"{s * 1e6:.1f} us"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="1k,10k,100k", help="comma-separated dataset sizes (e.g. 1k,10k,100k,1m)")
+    ap.add_argument("--only", help="comma-separated benchmark names")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark (best is kept)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--baseline", default=BASELINES)
+    ap.add_argument("--save-baseline", action="store_true", help="write results into the baseline file")
+    ap.add_argument("--time-tolerance", type=float, default=0.50)
+    ap.add_argument("--mem-tolerance", type=float, default=0.15)
+    ap.add_argument("--json", help="also write results to this file")
+    args = ap.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    names = args.only.split(",") if args.only else list(BENCHES)
+    unknown = [n for n in names if n not in BENCHES]
+    if unknown:
+        ap.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    try:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baselines = json.load(f).get("results", {})
+    except (OSError, ValueError):
+        baselines = {}
+
+    results, failures = {}, []
+    print(f"{'benchmark':<22}{'size':>9}{'ops':>7}{'time/op':>12}{'peak MB':>10}  status")
+    for size in sizes:
+        path = dataset(size, args.seed)
+        reset_employee_caches()
+        for name in names:
+            if name in SIZE_INDEPENDENT and size != sizes[0]:
+                continue
+            label = "-" if name in SIZE_INDEPENDENT else str(size)
+            setup, run, ops = BENCHES[name](path)
+            per_op, peak = measure(setup, run, ops, args.repeat)
+            key = f"{name}@{label}"
+            results[key] = {"time_s": per_op, "peak_mb": round(peak, 3), "ops": ops}
+            status, problems = compare(key, results[key], baselines, args.time_tolerance, args.mem_tolerance)
+            if problems:
+                failures.append(f"{key}: {', '.join(problems)}")
+            print(f"{name:<22}{label:>9}{ops:>7}{fmt_time(per_op):>12}{peak:>10.2f}  {status}"
+                  + (f" ({', '.join(problems)})" if problems else ""))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        merged = dict(baselines)
+        merged.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                            "processor": platform.processor() or platform.machine()},
+                "results": dict(sorted(merged.items())),
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Saved {len(results)} results to {args.baseline}")
+        return 0
+
+    if failures:
+        print("\nRegressions against baseline:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
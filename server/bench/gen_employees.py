@@ -0,0 +1,253 @@
+"""
+Synthetic employee generator for scaling tests.
+
+Produces records with the same shape as public/Data/employees.json
+(personal_info, employment_info, skills, competencies, experiences,
+positions_history, projects, education). Skills are drawn from
+Functions_Skills.xlsx via skills_catalog, weighted towards the employee's
+department. Output is deterministic for a given --seed and is written
+incrementally, so 1M records never sit in memory at once.
+
+Run from the server directory:
+    python3 bench/gen_employees.py 100000 -o /tmp/employees_100k.json [--seed 7]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from skills_catalog import SKILLS_XLSX, get_catalog   # noqa: E402
+
+FIRST_NAMES = ["Samantha", "Wei Ming", "Aisha", "Rahul", "Mei Ling", "Daniel", "Priya", "Hiroshi",
+               "Nurul", "Jonathan", "Farah", "Kenji", "Grace", "Arjun", "Siti", "Marcus", "Li Na",
+               "Ethan", "Chloe", "Hafiz", "Olivia", "Raj", "Yuki", "Benjamin"]
+LAST_NAMES = ["Lee", "Tan", "Lim", "Ng", "Wong", "Kumar", "Rahman", "Chen", "Goh", "Sato", "Ismail",
+              "Fernandez", "Koh", "Nair", "Teo", "Ong", "Park", "Yusof", "Chua", "Menon"]
+OFFICES = ["PSA Singapore", "PSA Antwerp", "PSA Panama", "PSA Mumbai", "PSA Genoa", "PSA Busan"]
+LANGUAGES = ["English", "Mandarin", "Malay", "Tamil", "Korean", "Japanese", "Hindi", "Dutch",
+             "Spanish", "Italian"]
+PROFICIENCY = ["Basic", "Intermediate", "Fluent", "Native"]
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+COMPETENCIES = ["Change & Transformation Management", "IT Audit", "IT Strategy & Planning",
+                "Incident Response Playbook Development",
+                "Process Improvement & Optimisation and Problem Management", "Quality Standards",
+                "Stakeholder & Partnership Management", "Technology Management & Innovation",
+                "Vendor and Contract Management", "People Leadership & Coaching",
+                "Strategic Planning", "Data-Driven Decision Making"]
+
+# department -> (units, job titles, skill-catalog prefixes)
+DEPARTMENTS = {
+    "Information Technology": (
+        ["Infrastructure Architecture & Cloud", "Cybersecurity Operations", "Enterprise Applications",
+         "IT Service Management"],
+        ["Cloud Solutions Architect", "Cybersecurity Analyst", "Systems Engineer", "DevOps Engineer",
+         "IT Project Manager", "Solutions Architect"],
+        ["Info Tech", "Data & AI"]),
+    "Finance": (
+        ["Financial Planning and Analysis", "Treasury", "Financial Accounting", "Tax"],
+        ["Finance Manager (FP&A)", "Treasury Analyst", "Financial Accountant", "Tax Specialist"],
+        ["Finance", "Procurement"]),
+    "Human Resource": (
+        ["HRBP – Operations Cluster", "Talent Acquisition", "Learning & Development", "Total Rewards"],
+        ["Senior HR Business Partner", "Talent Acquisition Specialist", "L&D Manager", "HR Analyst"],
+        ["Human Resource", "General Management"]),
+    "Operations": (
+        ["Terminal Operations", "Marine Services", "Yard Planning", "Operations Excellence"],
+        ["Operations Manager", "Yard Planner", "Vessel Planner", "Shift Supervisor"],
+        ["Operations", "Supply Chain and Logistics", "HSS"]),
+    "Engineering": (
+        ["Equipment Engineering", "Civil Engineering", "Electrical Engineering", "Automation"],
+        ["Equipment Engineer", "Civil Engineer", "Electrical Engineer", "Automation Engineer"],
+        ["Engineering", "Automation and Robotics", "Sustainability"]),
+    "Commercial": (
+        ["Business Development", "Account Management", "Corporate Affairs"],
+        ["Business Development Manager", "Key Account Manager", "Communications Executive"],
+        ["Business Development", "Commercial", "Corporate Affairs", "Legal and Corporate Secretariat"]),
+}
+SENIORITY = ["Junior ", "", "", "Senior ", "Lead ", "Principal "]
+EXPERIENCE_TYPES = ["Program", "Rotation", "Exercise", "Regional Portfolio", "Transformation",
+                    "Coaching", "Secondment"]
+FOCUS_PHRASES = ["cost optimization", "process automation", "stakeholder alignment", "digital rollout",
+                 "cloud migration", "team coaching", "risk reporting", "vendor consolidation",
+                 "service reliability", "data quality", "mentoring junior staff", "capacity planning",
+                 "regulatory compliance", "workflow redesign", "innovation pilots"]
+PROJECT_ROLES = ["Lead Architect", "Project Lead", "Contributor", "Analyst", "Workstream Lead",
+                 "Subject Matter Expert", "Coordinator"]
+PROJECT_NOUNS = ["Migration", "Transformation", "Automation", "Dashboard", "Optimisation",
+                 "Modernisation", "Rollout", "Review"]
+OUTCOMES = ["{n}% cost reduction", "{n}% faster turnaround", "{n} manual hours saved per month",
+            "{n}% fewer incidents", "adopted by {n} teams"]
+DEGREES = ["Bachelor's Degree, Computer Engineering", "Bachelor's Degree, Accountancy",
+           "Bachelor's Degree, Business Administration", "Master's Degree, Data Science",
+           "Bachelor's Degree, Mechanical Engineering", "Master of Business Administration",
+           "Diploma, Maritime Operations", "Bachelor's Degree, Human Resource Management"]
+INSTITUTIONS = ["National University of Singapore (NUS)", "Nanyang Technological University (NTU)",
+                "Singapore Management University (SMU)", "Singapore Polytechnic", "KU Leuven",
+                "University of Melbourne"]
+
+TODAY = date(2025, 10, 9)
+
+
+def _skill_pools(catalog):
+    """department -> list of skill dicts in employees.json shape."""
+    def to_skill(row):
+        spec = row["specialisation_unit"]
+        return {
+            "function_area": row["function_unit_skill"],
+            "specialization": spec,
+            "skill_name": spec.split(": ", 1)[-1],
+        }
+
+    all_skills = [to_skill(r) for r in catalog]
+    pools = {}
+    for dept, (_, _, prefixes) in DEPARTMENTS.items():
+        pools[dept] = [s for s in all_skills if s["function_area"].split(":")[0] in prefixes] or all_skills
+    return pools, all_skills
+
+
+def _day(rng, start: date, end: date) -> date:
+    return start + timedelta(days=rng.randint(0, max(0, (end - start).days)))
+
+
+def _period(start: date, end):
+    return {"start": start.isoformat(), "end": end.isoformat() if end else None}
+
+
+def make_employee(rng: random.Random, idx: int, pools, all_skills) -> dict:
+    dept = rng.choice(list(DEPARTMENTS))
+    units, titles, _ = DEPARTMENTS[dept]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    name = f"{first} {last}"
+    title = rng.choice(SENIORITY) + rng.choice(titles)
+
+    hire = _day(rng, date(2000, 1, 1), date(2024, 6, 30))
+    n_roles = rng.randint(1, 4)
+    # split hire..today into consecutive roles, newest first
+    cuts = sorted(_day(rng, hire, TODAY) for _ in range(n_roles - 1))
+    starts = [hire] + cuts
+    positions = []
+    for i in range(n_roles - 1, -1, -1):
+        start = starts[i]
+        end = (starts[i + 1] - timedelta(days=1)) if i + 1 < n_roles else None
+        pos = {
+            "role_title": title if end is None else rng.choice(titles),
+            "organization": rng.choice(OFFICES),
+            "period": _period(start, end),
+            "focus_areas": rng.sample(FOCUS_PHRASES, rng.randint(1, 3)),
+        }
+        positions.append(pos)
+
+    pool = pools[dept]
+    skills = rng.sample(pool, min(len(pool), rng.randint(3, 8)))
+    if rng.random() < 0.3:
+        extra = rng.choice(all_skills)
+        if extra not in skills:
+            skills.append(extra)
+    positions[0]["key_skills_used"] = [s["skill_name"] for s in skills[:3]]
+
+    experiences = []
+    for _ in range(rng.randint(0, 3)):
+        start = _day(rng, hire, TODAY - timedelta(days=60))
+        experiences.append({
+            "type": rng.choice(EXPERIENCE_TYPES),
+            "organization": rng.choice(OFFICES),
+            "program": f"{rng.choice(FOCUS_PHRASES).title()} {rng.choice(PROJECT_NOUNS)}",
+            "period": _period(start, _day(rng, start, TODAY)),
+            "focus": f"{rng.choice(FOCUS_PHRASES).capitalize()}; {rng.choice(FOCUS_PHRASES)}.",
+        })
+
+    projects = []
+    for _ in range(rng.randint(0, 3)):
+        start = _day(rng, hire, TODAY - timedelta(days=30))
+        projects.append({
+            "project_name": f"{rng.choice(units)} {rng.choice(PROJECT_NOUNS)} Initiative",
+            "role": rng.choice(PROJECT_ROLES),
+            "period": _period(start, _day(rng, start, TODAY)),
+            "description": f"{rng.choice(FOCUS_PHRASES).capitalize()} and {rng.choice(FOCUS_PHRASES)}.",
+            "outcomes": [rng.choice(OUTCOMES).format(n=rng.randint(5, 40)) for _ in range(rng.randint(1, 2))],
+        })
+
+    education = []
+    grad = hire - timedelta(days=rng.randint(30, 900))
+    for _ in range(rng.randint(1, 2)):
+        start = grad - timedelta(days=365 * rng.randint(2, 4))
+        education.append({
+            "degree": rng.choice(DEGREES),
+            "institution": rng.choice(INSTITUTIONS),
+            "period": _period(start, grad),
+        })
+        grad = start - timedelta(days=rng.randint(30, 400))
+
+    return {
+        "employee_id": f"EMP-{100000 + idx}",
+        "personal_info": {
+            "name": name,
+            "email": f"{first.lower().replace(' ', '.')}.{last.lower()}.{idx}@globalpsa.com",
+            "office_location": positions[0]["organization"],
+            "languages": [{"language": lang, "proficiency": rng.choice(PROFICIENCY)}
+                          for lang in rng.sample(LANGUAGES, rng.randint(1, 3))],
+        },
+        "employment_info": {
+            "job_title": title,
+            "department": dept,
+            "unit": rng.choice(units),
+            "line_manager": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "in_role_since": positions[0]["period"]["start"],
+            "hire_date": hire.isoformat(),
+            "last_updated": TODAY.isoformat(),
+        },
+        "skills": skills,
+        "competencies": [{"name": c, "level": rng.choice(LEVELS)}
+                         for c in rng.sample(COMPETENCIES, rng.randint(2, 4))],
+        "experiences": experiences,
+        "positions_history": positions,
+        "projects": projects,
+        "education": education,
+    }
+
+
+def generate(n: int, seed: int = 0, xlsx_path: str = SKILLS_XLSX):
+    """Yield n synthetic employees (deterministic for a given seed)."""
+    pools, all_skills = _skill_pools(get_catalog(xlsx_path).skills())
+    rng = random.Random(seed)
+    for i in range(n):
+        yield make_employee(rng, i, pools, all_skills)
+
+
+def write_json(path: str, n: int, seed: int = 0, xlsx_path: str = SKILLS_XLSX) -> str:
+    """Stream n employees to path as a JSON array; returns path."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, emp in enumerate(generate(n, seed, xlsx_path)):
+            f.write(",\n" if i else "\n")
+            f.write(json.dumps(emp, ensure_ascii=False))
+        f.write("\n]\n")
+    os.replace(tmp, path)
+    return path
+
+
+def parse_size(text: str) -> int:
+    """'1k' / '100K' / '1m' / '2500' -> int."""
+    text = text.strip().lower()
+    mult = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if mult > 1 else text) * mult)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("size", type=parse_size, help="number of employees (e.g. 1000, 10k, 1m)")
+    ap.add_argument("-o", "--output", required=True)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--xlsx", default=SKILLS_XLSX)
+    args = ap.parse_args()
+    write_json(args.output, args.size, args.seed, args.xlsx)
+    print(f"Wrote {args.size} employees to {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
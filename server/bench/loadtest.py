@@ -0,0 +1,289 @@
+"""
+Load-test harness: runs the app against bench/mock_azure.py and drives
+concurrent user sessions through it.
+
+Each virtual user logs in, sends a few mentor and support chat turns, then
+fetches /api/leadership/me; admin users also fetch /api/leadership/all.
+Reports requests, errors, throughput and p50/p95/p99 latency per endpoint.
+
+Run from the server directory:
+    python3 bench/loadtest.py --users 20 --duration 60
+    python3 bench/loadtest.py --users 50 --latency lognormal:1200,0.6 --error-429 0.05 --json out.json
+    python3 bench/loadtest.py --target http://localhost:8080   # existing server, no mock started
+    python3 bench/loadtest.py --server gevent --users 300 --chat-turns 5 --latency fixed:5000
+
+--server picks how the app is started: "threading" (app.py) or "gevent"
+(serve.py). The app's OS thread count is sampled during the run and the
+peak is reported with the results.
+
+Credentials come from db/auth.db (the seeded accounts all use "password").
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.join(HERE, "..")
+AUTH_DB = os.path.join(SERVER_DIR, "..", "db", "auth.db")
+sys.path.insert(0, HERE)
+
+import mock_azure  # noqa: E402
+
+QUESTIONS = {
+    "mentor": [
+        "How can I grow into a team lead role in the next year?",
+        "Which skills should I build to move towards cloud architecture?",
+        "Who in the company has a similar background I could learn from?",
+    ],
+    "support": [
+        "I've been feeling stretched thin with the release schedule.",
+        "How do I bring up workload concerns with my manager?",
+        "Any tips for switching off after long shifts?",
+    ],
+}
+
+# Starts the app without the interactive-terminal check Werkzeug applies to socketio.run
+APP_LAUNCHERS = {
+    "threading": [
+        "-c",
+        "import os, app; "
+        "app.socketio.run(app.app, host='127.0.0.1', port=int(os.environ['SERVER_PORT']), "
+        "allow_unsafe_werkzeug=True)",
+    ],
+    "gevent": ["serve.py"],
+}
+
+
+def percentile(sorted_vals, p):
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, max(0, round(p / 100 * len(sorted_vals) + 0.5) - 1))
+    return sorted_vals[idx]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, seconds, ok):
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def report(self, elapsed):
+        out = {}
+        for endpoint, vals in sorted(self.samples.items()):
+            vals = sorted(vals)
+            out[endpoint] = {
+                "requests": len(vals),
+                "errors": self.errors.get(endpoint, 0),
+                "rps": round(len(vals) / elapsed, 2),
+                "p50_ms": round(percentile(vals, 50) * 1000, 1),
+                "p95_ms": round(percentile(vals, 95) * 1000, 1),
+                "p99_ms": round(percentile(vals, 99) * 1000, 1),
+                "max_ms": round(vals[-1] * 1000, 1),
+            }
+        return out
+
+
+def load_accounts(path=AUTH_DB):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT username, password, isadmin FROM users").fetchall()
+    finally:
+        conn.close()
+
+
+def run_user(base, account, rec, stop_at, chat_turns, think):
+    username, password, isadmin = account
+    http = requests.Session()
+
+    def call(endpoint, method, path, **kw):
+        start = time.perf_counter()
+        try:
+            r = http.request(method, base + path, timeout=300, **kw)
+            ok = r.status_code < 400
+        except requests.RequestException:
+            ok = False
+        rec.add(endpoint, time.perf_counter() - start, ok)
+        if think:
+            time.sleep(random.uniform(0, think))
+        return ok
+
+    while time.monotonic() < stop_at:
+        http.cookies.clear()
+        if not call("login", "POST", "/api/login", json={"username": username, "password": password}):
+            continue
+        for _ in range(chat_turns):
+            mode = random.choice(("mentor", "support"))
+            call(f"chat:{mode}", "POST", "/api/chat",
+                 json={"mode": mode, "message": random.choice(QUESTIONS[mode])})
+            if time.monotonic() >= stop_at:
+                return
+        call("leadership:me", "GET", "/api/leadership/me")
+        if isadmin:
+            call("leadership:all", "GET", "/api/leadership/all")
+
+
+class ThreadSampler:
+    """Peak OS thread count of a process (Linux /proc), sampled on a background thread."""
+
+    def __init__(self, pid, interval=0.2):
+        self.path = f"/proc/{pid}/status"
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    if line.startswith("Threads:"):
+                        n = int(line.split()[1])
+                        self.peak = n if self.peak is None else max(self.peak, n)
+                        return
+        except OSError:
+            pass
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._sample()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.peak
+
+
+def wait_ready(base, proc, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"app exited during startup (code {proc.returncode})")
+        try:
+            if requests.get(base + "/api/health", timeout=2).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"app not ready at {base} after {timeout}s")
+
+
+def start_app(port, mock_port, workdir, args):
+    env = dict(os.environ)
+    env.update({
+        "SERVER_PORT": str(port),
+        "SERVER_HOST": "127.0.0.1",
+        "AZURE_OPENAI_BASE_URL": f"http://127.0.0.1:{mock_port}/openai",
+        "AZURE_OPENAI_API_KEY": "mock",
+        "CHAT_STORE_PATH": os.path.join(workdir, "sessions.db"),
+        "SUMMARY_CACHE_PATH": os.path.join(workdir, "summary_cache.db"),
+        "LEADERSHIP_JOBS_PATH": os.path.join(workdir, "leadership_jobs.db"),
+        "LPI_SCORES_PATH": os.path.join(workdir, "lpi_scores.db"),
+        "SUMMARY_CACHE": "1" if args.summary_cache else "0",
+    })
+    log = open(os.path.join(workdir, "app.log"), "w")
+    proc = subprocess.Popen([sys.executable, *APP_LAUNCHERS[args.server]], cwd=SERVER_DIR, env=env,
+                            stdout=log, stderr=subprocess.STDOUT)
+    return proc, log
+
+
+def print_table(report, elapsed):
+    cols = ("requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+    print(f"\n{'endpoint':<18}" + "".join(f"{c:>10}" for c in cols))
+    for endpoint, row in report.items():
+        print(f"{endpoint:<18}" + "".join(f"{row[c]:>10}" for c in cols))
+    total = sum(r["requests"] for r in report.values())
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    ap.add_argument("--duration", type=float, default=30, help="seconds to run")
+    ap.add_argument("--chat-turns", type=int, default=3, help="chat messages per login")
+    ap.add_argument("--think", type=float, default=0.0, help="max random pause between requests (s)")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--target", help="base URL of an already-running app (skips mock and app startup)")
+    ap.add_argument("--server", choices=sorted(APP_LAUNCHERS), default="threading",
+                    help="app serving mode: threads (app.py) or gevent greenlets (serve.py)")
+    ap.add_argument("--app-port", type=int, default=18080)
+    ap.add_argument("--mock-port", type=int, default=18090)
+    ap.add_argument("--summary-cache", action="store_true", help="leave the leadership summary cache on")
+    ap.add_argument("--json", help="also write the report to this file")
+    mock_azure.add_arguments(ap)
+    args = ap.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    mock_server = proc = log = None
+    workdir = tempfile.mkdtemp(prefix="loadtest-")
+    base = (args.target or f"http://127.0.0.1:{args.app_port}").rstrip("/")
+    try:
+        if not args.target:
+            mock_server = mock_azure.serve(args.mock_port, mock_azure.from_args(args))
+            proc, log = start_app(args.app_port, args.mock_port, workdir, args)
+        wait_ready(base, proc)
+
+        accounts = load_accounts()
+        rec = Recorder()
+        stop_at = time.monotonic() + args.duration
+        threads = [
+            threading.Thread(target=run_user, daemon=True,
+                             args=(base, accounts[i % len(accounts)], rec, stop_at, args.chat_turns, args.think))
+            for i in range(args.users)
+        ]
+        print(f"Running {args.users} users for {args.duration:g}s against {base} ...")
+        sampler = ThreadSampler(proc.pid).start() if proc is not None else None
+        started = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - started
+        peak_threads = sampler.stop() if sampler is not None else None
+
+        report = rec.report(elapsed)
+        print_table(report, elapsed)
+        if peak_threads is not None:
+            print(f"app ({args.server}): peak {peak_threads} OS threads")
+        if mock_server is not None:
+            print(f"mock upstream: {dict(mock_server.mock.stats)}")
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"config": vars(args), "elapsed_s": round(elapsed, 2), "peak_app_threads": peak_threads,
+                           "endpoints": report}, f, indent=2)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+            log.close()
+            print(f"app log: {os.path.join(workdir, 'app.log')}")
+        if mock_server is not None:
+            mock_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
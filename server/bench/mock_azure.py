@@ -0,0 +1,227 @@
+"""
+Local stand-in for the Azure OpenAI chat-completions endpoint used by
+azure_chat / azure_chat_stream, for benchmarks and load tests.
+
+Serves POST .../deployments/<name>/chat/completions (any query string) with
+a configurable latency distribution, optional SSE streaming, and injectable
+429 / 5xx errors. Responses carry a `usage` block like the real service.
+--rpm / --tpm enforce a quota over a sliding 60s window the way a deployment
+does: requests over it get 429 with the Retry-After that would clear it.
+
+Run from the server directory:
+    python3 bench/mock_azure.py --port 18090 --latency lognormal:800,0.5 --error-429 0.02
+
+Latency specs (milliseconds):
+    fixed:MS | uniform:MIN,MAX | normal:MEAN,SD | lognormal:MEDIAN,SIGMA
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_PATH = re.compile(r"/deployments/[^/]+/chat/completions$")
+REPLY_WORDS = ("Focus on one measurable goal this quarter: lead a cross-functional initiative, "
+               "document the outcome, and review progress with your manager. "
+               "What would you like to explore next?").split()
+
+
+def parse_latency(spec: str):
+    """'kind:args' in milliseconds -> zero-arg callable returning seconds."""
+    kind, _, args = spec.partition(":")
+    vals = [float(v) for v in args.split(",") if v]
+    if kind == "fixed":
+        return lambda: vals[0] / 1000
+    if kind == "uniform":
+        return lambda: random.uniform(vals[0], vals[1]) / 1000
+    if kind == "normal":
+        return lambda: max(0.0, random.gauss(vals[0], vals[1])) / 1000
+    if kind == "lognormal":
+        mu = math.log(vals[0])
+        return lambda: random.lognormvariate(mu, vals[1]) / 1000
+    raise ValueError(f"unknown latency spec: {spec}")
+
+
+class MockAzure:
+    """Shared configuration and counters for the request handler."""
+
+    def __init__(self, latency="fixed:200", ttft="fixed:150", token_delay_ms=15.0,
+                 error_429=0.0, error_5xx=0.0, retry_after=1.0, rpm=0, tpm=0):
+        self.latency = parse_latency(latency)
+        self.ttft = parse_latency(ttft)
+        self.token_delay = token_delay_ms / 1000
+        self.error_429 = error_429
+        self.error_5xx = error_5xx
+        self.retry_after = retry_after
+        self.rpm = rpm
+        self.tpm = tpm
+        self.stats = {"requests": 0, "streams": 0, "429": 0, "5xx": 0, "quota_429": 0}
+        self._window = deque()  # (time, tokens) of admitted requests in the last 60s
+        self._window_tokens = 0
+        self._lock = threading.Lock()
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def admit(self, tokens: int):
+        """None if within the rpm/tpm quota (and record it), else seconds until it would be."""
+        if not self.rpm and not self.tpm:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            while self._window and self._window[0][0] <= now - 60:
+                self._window_tokens -= self._window.popleft()[1]
+            over_rpm = self.rpm and len(self._window) >= self.rpm
+            over_tpm = self.tpm and self._window_tokens + tokens > self.tpm
+            if over_rpm or over_tpm:
+                self.stats["quota_429"] += 1
+                return max(0.1, self._window[0][0] + 60 - now) if self._window else 1.0
+            self._window.append((now, tokens))
+            self._window_tokens += tokens
+            return None
+
+
+def make_handler(mock: MockAzure):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _json(self, status, body, headers=None):
+            raw = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_GET(self):
+            if self.path.startswith("/stats"):
+                return self._json(200, mock.stats)
+            self._json(404, {"error": "not_found"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length)
+            if not CHAT_PATH.search(self.path.split("?", 1)[0]):
+                return self._json(404, {"error": {"code": "404", "message": "Resource not found"}})
+            mock.count("requests")
+            try:
+                body = json.loads(raw or b"{}")
+            except ValueError:
+                return self._json(400, {"error": {"code": "invalid_json"}})
+
+            prompt_tokens = max(1, len(raw) // 4)
+            wait = mock.admit(prompt_tokens + len(REPLY_WORDS))
+            if wait is not None:
+                mock.count("429")
+                return self._json(429, {"error": {"code": "429", "message": "Rate limit is exceeded."}},
+                                  {"Retry-After": str(math.ceil(wait))})
+
+            roll = random.random()
+            if roll < mock.error_429:
+                mock.count("429")
+                return self._json(429, {"error": {"code": "429", "message": "Rate limit is exceeded."}},
+                                  {"Retry-After": f"{mock.retry_after:g}"})
+            if roll < mock.error_429 + mock.error_5xx:
+                mock.count("5xx")
+                time.sleep(mock.latency() / 4)
+                return self._json(random.choice([500, 502, 503]), {"error": {"code": "server_error"}})
+
+            words = REPLY_WORDS[: random.randint(8, len(REPLY_WORDS))]
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(words),
+                     "total_tokens": prompt_tokens + len(words),
+                     "prompt_tokens_details": {"cached_tokens": 0}}
+
+            if body.get("stream"):
+                mock.count("streams")
+                return self._stream(words, usage, (body.get("stream_options") or {}).get("include_usage"))
+
+            time.sleep(mock.latency())
+            self._json(200, {
+                "id": "chatcmpl-mock", "object": "chat.completion", "model": "mock",
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": " ".join(words)}}],
+                "usage": usage,
+            })
+
+        def _stream(self, words, usage, include_usage):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def send(obj):
+                data = b"data: " + (obj if isinstance(obj, bytes) else json.dumps(obj).encode()) + b"\n\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            time.sleep(mock.ttft())
+            send({"choices": [], "prompt_filter_results": []})
+            for i, w in enumerate(words):
+                send({"choices": [{"index": 0, "delta": {"content": (" " if i else "") + w}}]})
+                time.sleep(mock.token_delay)
+            send({"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            if include_usage:
+                send({"choices": [], "usage": usage})
+            send(b"[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 1024  # hundreds of concurrent upstream connections in load tests
+
+
+def serve(port: int, mock: MockAzure, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Start the mock on a daemon thread and return the server (call .shutdown() to stop)."""
+    server = _Server((host, port), make_handler(mock))
+    server.daemon_threads = True
+    server.mock = mock
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_arguments(ap):
+    ap.add_argument("--latency", default="lognormal:600,0.4", help="non-streaming completion latency")
+    ap.add_argument("--ttft", default="lognormal:300,0.3", help="streaming time to first token")
+    ap.add_argument("--token-delay", type=float, default=15.0, help="ms between streamed tokens")
+    ap.add_argument("--error-429", type=float, default=0.0, help="fraction of requests answered 429")
+    ap.add_argument("--error-5xx", type=float, default=0.0, help="fraction of requests answered 5xx")
+    ap.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429")
+    ap.add_argument("--rpm", type=int, default=0, help="requests-per-minute quota (0 = none)")
+    ap.add_argument("--tpm", type=int, default=0, help="tokens-per-minute quota (0 = none)")
+
+
+def from_args(args) -> MockAzure:
+    return MockAzure(args.latency, args.ttft, args.token_delay, args.error_429, args.error_5xx,
+                     args.retry_after, args.rpm, args.tpm)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=18090)
+    ap.add_argument("--host", default="127.0.0.1")
+    add_arguments(ap)
+    args = ap.parse_args()
+    server = serve(args.port, from_args(args), args.host)
+    print(f"Mock Azure OpenAI listening on http://{args.host}:{args.port} (stats at /stats)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# compact.py
+from collections.abc import Sequence
+
+# Competency levels as small ints (index into LEVELS); unknown levels stay strings
+LEVELS = ("Beginner", "Intermediate", "Advanced")
+LEVEL_CODES = {name: i for i, name in enumerate(LEVELS)}
+
+INTERN_MAX_LEN = 80  # longer strings (descriptions, focus text) are rarely repeated
+
+_COMPETENCY_KEYS = ("name", "level")
+
+
+class Node:
+    """A JSON object as a shared key tuple (one per distinct key layout) plus a value tuple."""
+    __slots__ = ("keys", "values")
+
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.values = values
+
+
+class Competency:
+    """{"name": ..., "level": ...} with the level stored as its LEVEL_CODES int."""
+    __slots__ = ("name", "level")
+
+    def __init__(self, name, level):
+        self.name = name
+        self.level = level
+
+    def level_name(self) -> str:
+        return LEVELS[self.level]
+
+
+class InternPool:
+    """
+    Interned strings and shared key layouts for one load of the dataset.
+    The repository keeps the pool on the snapshot it encoded, so values
+    that only older files contained are freed together with that snapshot.
+    """
+    __slots__ = ("strings", "shapes", "encode")
+
+    def __init__(self):
+        self.strings = {}
+        self.shapes = {}
+        self.encode = _encoder(self.strings, self.shapes)
+
+    def intern(self, s: str) -> str:
+        """Dictionary-encode a string: equal values share one object within this pool."""
+        return self.strings.setdefault(s, s)
+
+    def stats(self) -> dict:
+        return {"strings": len(self.strings), "shapes": len(self.shapes)}
+
+
+def _encoder(strings: dict, shapes: dict):
+    """encode(value) -> compact, lossless form of a JSON value (see decode), interning into these pools."""
+    intern = strings.setdefault
+
+    def encode(value):
+        cls = type(value)
+        if cls is str:
+            return intern(value, value) if len(value) <= INTERN_MAX_LEN else value
+        if cls is dict:
+            keys = tuple(value)
+            if keys == _COMPETENCY_KEYS:
+                level = LEVEL_CODES.get(value["level"])
+                if level is not None and type(value["name"]) is str:
+                    return Competency(intern(value["name"], value["name"]), level)
+            shape = shapes.get(keys)
+            if shape is None:
+                shape = shapes.setdefault(keys, tuple(intern(k, k) for k in keys))
+            return Node(shape, tuple([encode(v) for v in value.values()]))
+        if cls is list:
+            return tuple([encode(v) for v in value])
+        return value  # numbers, bools, None
+    return encode
+
+
+def decode(value):
+    """Rebuild the original dicts/lists: json.dumps(decode(encode(x))) == json.dumps(x)."""
+    cls = type(value)
+    if cls is Node:
+        return dict(zip(value.keys, map(decode, value.values)))
+    if cls is tuple:
+        return [decode(v) for v in value]
+    if cls is Competency:
+        return {"name": value.name, "level": LEVELS[value.level]}
+    return value
+
+
+class CompactEmployee:
+    """
+    One employee record in compact form. employee_id, department and unit
+    are kept as attributes for indexing; everything else lives in the
+    encoded body. to_dict() returns a fresh dict equal to the loaded JSON.
+    """
+    __slots__ = ("employee_id", "department", "unit", "body")
+
+    def __init__(self, emp: dict, pool: InternPool):
+        info = emp.get("employment_info")
+        info = info if isinstance(info, dict) else {}
+        self.employee_id = pool.encode(emp.get("employee_id"))
+        self.department = pool.encode(info.get("department"))
+        self.unit = pool.encode(info.get("unit"))
+        self.body = pool.encode(emp)
+
+    def to_dict(self) -> dict:
+        return decode(self.body)
+
+
+def compact(record, pool: InternPool):
+    """CompactEmployee for dict records; anything else is kept as-is."""
+    return CompactEmployee(record, pool) if isinstance(record, dict) else record
+
+
+def expand(record):
+    return record.to_dict() if type(record) is CompactEmployee else record
+
+
+class ExpandingList(Sequence):
+    """Read-only list view over compact records that yields plain dicts on access."""
+    __slots__ = ("_records",)
+
+    def __init__(self, records):
+        self._records = records
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [expand(r) for r in self._records[i]]
+        return expand(self._records[i])
+
+    def __iter__(self):
+        return map(expand, self._records)
@@ -0,0 +1,138 @@
+# employee_repo.py
+import json
+import os
+import threading
+
+from compact import CompactEmployee, ExpandingList, InternPool, compact, expand
+
+EMPLOYEES_JSON = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "public", "Data", "employees.json"
+)
+
+
+class _Snapshot:
+    """One immutable, fully indexed load of the dataset (and, when compact, the pool it was encoded with)."""
+    __slots__ = ("signature", "employees", "pool", "by_id", "by_department", "by_unit")
+
+    def __init__(self, signature, employees, pool=None):
+        self.signature = signature
+        self.employees = employees
+        self.pool = pool
+        self.by_id = {}
+        self.by_department = {}
+        self.by_unit = {}
+        for emp in employees:
+            if type(emp) is CompactEmployee:
+                emp_id, dept, unit = emp.employee_id, emp.department, emp.unit
+            else:
+                info = emp.get("employment_info") or {}
+                emp_id, dept, unit = emp.get("employee_id"), info.get("department"), info.get("unit")
+            if emp_id is not None:
+                self.by_id[emp_id] = emp
+            if dept:
+                self.by_department.setdefault(dept, []).append(emp)
+            if unit:
+                self.by_unit.setdefault(unit, []).append(emp)
+
+
+class EmployeeRepository:
+    """
+    Loads employees.json once and serves indexed lookups from memory.
+    The file is re-parsed only when its mtime/size changes; the new
+    snapshot is swapped in whole, so readers never see a half-built index.
+    Returned records are shared — treat them as read-only.
+
+    With compact=True records are held as compact.CompactEmployee
+    (interned strings, shared key layouts, int competency levels) and
+    expanded back to plain dicts on access: far less resident memory for
+    large datasets, at the cost of rebuilding dicts on every read.
+    """
+
+    def __init__(self, json_path: str = EMPLOYEES_JSON, compact: bool = False):
+        self.json_path = os.path.abspath(json_path)
+        self.compact = compact
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def _signature(self):
+        st = os.stat(self.json_path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _current(self) -> _Snapshot:
+        snap = self._snapshot
+        try:
+            sig = self._signature()
+        except OSError:
+            if snap is not None:
+                return snap  # file briefly missing (e.g. mid-replace): keep serving
+            raise
+        if snap is not None and snap.signature == sig:
+            return snap
+
+        with self._lock:
+            snap = self._snapshot
+            if snap is not None and snap.signature == sig:
+                return snap  # another thread already reloaded
+            try:
+                with open(self.json_path, "r", encoding="utf-8") as f:
+                    employees = json.load(f)
+                if not isinstance(employees, list):
+                    raise ValueError("employees.json must contain a JSON array")
+                pool = None
+                if self.compact:
+                    pool = InternPool()  # fresh per load, so strings only old files had go with the old snapshot
+                    for i, emp in enumerate(employees):
+                        employees[i] = compact(emp, pool)  # in place: each dict is freed as it is encoded
+            except Exception as e:
+                if snap is not None:
+                    print(f"[WARN] Employee reload failed, serving previous data: {e}")
+                    return snap
+                raise
+            self._snapshot = _Snapshot(sig, employees, pool)
+            return self._snapshot
+
+    # ---- queries ----
+    def version(self):
+        """Changes whenever a new snapshot is loaded (for derived caches)."""
+        return self._current().signature
+
+    def all(self) -> list:
+        employees = self._current().employees
+        return ExpandingList(employees) if self.compact else employees
+
+    def get(self, employee_id):
+        return expand(self._current().by_id.get(employee_id))
+
+    def by_department(self, department: str) -> list:
+        employees = self._current().by_department.get(department, [])
+        return [expand(e) for e in employees] if self.compact else employees
+
+    def by_unit(self, unit: str) -> list:
+        employees = self._current().by_unit.get(unit, [])
+        return [expand(e) for e in employees] if self.compact else employees
+
+    def departments(self) -> list:
+        return sorted(self._current().by_department)
+
+    def units(self) -> list:
+        return sorted(self._current().by_unit)
+
+    def pool_stats(self) -> dict:
+        """Interned strings and key layouts of the current snapshot (empty unless compact)."""
+        pool = self._current().pool
+        return pool.stats() if pool is not None else {}
+
+
+_repos = {}
+_repos_lock = threading.Lock()
+
+def get_repository(json_path: str = EMPLOYEES_JSON) -> EmployeeRepository:
+    """Process-wide repository per file path (EMPLOYEE_COMPACT=1 for compact records)."""
+    key = os.path.abspath(json_path)
+    repo = _repos.get(key)
+    if repo is None:
+        with _repos_lock:
+            repo = _repos.get(key)
+            if repo is None:
+                repo = _repos[key] = EmployeeRepository(key, compact=os.getenv("EMPLOYEE_COMPACT", "0") == "1")
+    return repo
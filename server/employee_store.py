@@ -0,0 +1,317 @@
+# employee_store.py
+import json
+import os
+import sqlite3
+import threading
+
+EMPLOYEES_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "db", "employees.db")
+
+LEVEL_RANK = {"Beginner": 1, "Intermediate": 2, "Advanced": 3}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS employees (
+    employee_id TEXT PRIMARY KEY,
+    name TEXT,
+    email TEXT,
+    office_location TEXT,
+    job_title TEXT,
+    department TEXT,
+    unit TEXT,
+    line_manager TEXT,
+    in_role_since TEXT,
+    hire_date TEXT,
+    last_updated TEXT,
+    profile TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_employees_department ON employees(department);
+CREATE INDEX IF NOT EXISTS idx_employees_unit ON employees(unit);
+CREATE INDEX IF NOT EXISTS idx_employees_office ON employees(office_location);
+CREATE INDEX IF NOT EXISTS idx_employees_job_title ON employees(job_title);
+
+CREATE TABLE IF NOT EXISTS skills (
+    employee_id TEXT NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    function_area TEXT,
+    specialization TEXT,
+    skill_name TEXT,
+    PRIMARY KEY (employee_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_skills_name ON skills(skill_name);
+CREATE INDEX IF NOT EXISTS idx_skills_area ON skills(function_area);
+
+CREATE TABLE IF NOT EXISTS competencies (
+    employee_id TEXT NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    level TEXT,
+    level_rank INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (employee_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_competencies_name ON competencies(name, level_rank);
+
+CREATE TABLE IF NOT EXISTS positions (
+    employee_id TEXT NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    role_title TEXT,
+    organization TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    PRIMARY KEY (employee_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_positions_role ON positions(role_title);
+
+CREATE TABLE IF NOT EXISTS projects (
+    employee_id TEXT NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    project_name TEXT,
+    role TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    PRIMARY KEY (employee_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS education (
+    employee_id TEXT NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    degree TEXT,
+    institution TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    PRIMARY KEY (employee_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS languages (
+    employee_id TEXT NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    language TEXT,
+    proficiency TEXT,
+    PRIMARY KEY (employee_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_languages_language ON languages(language);
+"""
+CHILD_TABLES = ("skills", "competencies", "positions", "projects", "education", "languages")
+
+
+def _dict(value) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def _list(value) -> list:
+    return [x for x in value if isinstance(x, dict)] if isinstance(value, list) else []
+
+
+def _period(item):
+    p = _dict(item.get("period"))
+    return p.get("start"), p.get("end")
+
+
+def connect(db_path: str = EMPLOYEES_DB) -> sqlite3.Connection:
+    """Open (creating if needed) the employee database in WAL mode."""
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def ingest(conn: sqlite3.Connection, employees, replace: bool = True) -> dict:
+    """
+    Load employees.json-shaped records. Each employee's child rows are
+    rewritten; with replace=True employees missing from the input are
+    deleted, so the database mirrors the input exactly. One transaction,
+    and the store version is bumped so running readers reload.
+    """
+    latest, skipped = {}, 0
+    for emp in employees:
+        emp_id = emp.get("employee_id") if isinstance(emp, dict) else None
+        if not emp_id:
+            skipped += 1
+            continue
+        latest[emp_id] = emp  # duplicate ids: last record wins, like the JSON repository index
+
+    rows = {name: [] for name in ("employees",) + CHILD_TABLES}
+    ids = list(latest)
+    for emp_id, emp in latest.items():
+        info, person = _dict(emp.get("employment_info")), _dict(emp.get("personal_info"))
+        rows["employees"].append((
+            emp_id, person.get("name"), person.get("email"), person.get("office_location"),
+            info.get("job_title"), info.get("department"), info.get("unit"), info.get("line_manager"),
+            info.get("in_role_since"), info.get("hire_date"), info.get("last_updated"),
+            json.dumps(emp, ensure_ascii=False),
+        ))
+        for i, s in enumerate(_list(emp.get("skills"))):
+            rows["skills"].append((emp_id, i, s.get("function_area"), s.get("specialization"), s.get("skill_name")))
+        for i, c in enumerate(_list(emp.get("competencies"))):
+            rows["competencies"].append((emp_id, i, c.get("name"), c.get("level"),
+                                         LEVEL_RANK.get(c.get("level"), 0)))
+        for i, p in enumerate(_list(emp.get("positions_history"))):
+            rows["positions"].append((emp_id, i, p.get("role_title"), p.get("organization"), *_period(p)))
+        for i, p in enumerate(_list(emp.get("projects"))):
+            rows["projects"].append((emp_id, i, p.get("project_name"), p.get("role"), *_period(p)))
+        for i, e in enumerate(_list(emp.get("education"))):
+            rows["education"].append((emp_id, i, e.get("degree"), e.get("institution"), *_period(e)))
+        for i, lang in enumerate(_list(person.get("languages"))):
+            rows["languages"].append((emp_id, i, lang.get("language"), lang.get("proficiency")))
+
+    with conn:
+        if replace:
+            for table in CHILD_TABLES + ("employees",):
+                conn.execute(f"DELETE FROM {table}")
+        else:
+            conn.executemany("DELETE FROM employees WHERE employee_id=?", ((i,) for i in ids))
+        for table, table_rows in rows.items():
+            if table_rows:
+                marks = ", ".join("?" * len(table_rows[0]))
+                conn.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({marks})", table_rows)
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('version', '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+    return {"employees": len(rows["employees"]), "skipped": skipped,
+            **{t: len(rows[t]) for t in CHILD_TABLES}}
+
+
+def is_ingested(db_path: str = EMPLOYEES_DB) -> bool:
+    """True once db/init.py has loaded the database (meta 'version' row); never creates the file."""
+    key = os.path.abspath(db_path)
+    if key in _ingested:
+        return True
+    if not os.path.exists(key):
+        return False
+    conn = sqlite3.connect(key, timeout=10)
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key='version'").fetchone()
+    except sqlite3.OperationalError:  # file exists but has no schema yet
+        row = None
+    finally:
+        conn.close()
+    if row is not None:
+        _ingested.add(key)  # ingest only ever bumps the version, so this stays true
+    return row is not None
+
+_ingested = set()
+
+
+class EmployeeStore:
+    """
+    Read-side access to db/employees.db with the same interface as
+    employee_repo.EmployeeRepository (version/all/get/by_department/...),
+    plus indexed filtered queries. get() and query() read only the rows
+    they need; all() loads every profile once per store version.
+    """
+
+    def __init__(self, db_path: str = EMPLOYEES_DB):
+        self.db_path = os.path.abspath(db_path)
+        self._local = threading.local()
+        self._all = (None, None)
+        self._lock = threading.Lock()
+        connect(self.db_path).close()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            self._local.conn = conn
+        return conn
+
+    def _profiles(self, sql, args=()) -> list:
+        return [json.loads(r[0]) for r in self._conn().execute(sql, args)]
+
+    # ---- EmployeeRepository interface ----
+    def version(self):
+        row = self._conn().execute("SELECT value FROM meta WHERE key='version'").fetchone()
+        return (self.db_path, row[0] if row else None)
+
+    def all(self) -> list:
+        version = self.version()
+        cached_version, employees = self._all
+        if cached_version == version:
+            return employees
+        with self._lock:
+            if self._all[0] != version:
+                self._all = (version, self._profiles("SELECT profile FROM employees ORDER BY rowid"))
+            return self._all[1]
+
+    def get(self, employee_id):
+        row = self._conn().execute("SELECT profile FROM employees WHERE employee_id=?", (employee_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def by_department(self, department: str) -> list:
+        return self._profiles("SELECT profile FROM employees WHERE department=? ORDER BY rowid", (department,))
+
+    def by_unit(self, unit: str) -> list:
+        return self._profiles("SELECT profile FROM employees WHERE unit=? ORDER BY rowid", (unit,))
+
+    def departments(self) -> list:
+        return [r[0] for r in self._conn().execute(
+            "SELECT DISTINCT department FROM employees WHERE department IS NOT NULL AND department != '' "
+            "ORDER BY department")]
+
+    def units(self) -> list:
+        return [r[0] for r in self._conn().execute(
+            "SELECT DISTINCT unit FROM employees WHERE unit IS NOT NULL AND unit != '' ORDER BY unit")]
+
+    # ---- filtered queries ----
+    def query(self, department=None, unit=None, office_location=None, job_title=None, skill=None,
+              function_area=None, competency=None, min_level=None, language=None,
+              limit=None, offset=0, ids_only=False) -> list:
+        """
+        Employees matching every given filter, in ingest order. skill /
+        function_area / competency / language match any entry in the
+        respective list; min_level (Beginner/Intermediate/Advanced) applies
+        to competency.
+        """
+        where, args = [], []
+        for column, value in (("department", department), ("unit", unit),
+                              ("office_location", office_location), ("job_title", job_title)):
+            if value is not None:
+                where.append(f"e.{column} = ?")
+                args.append(value)
+        if skill is not None:
+            where.append("e.employee_id IN (SELECT employee_id FROM skills WHERE skill_name = ?)")
+            args.append(skill)
+        if function_area is not None:
+            where.append("e.employee_id IN (SELECT employee_id FROM skills WHERE function_area = ?)")
+            args.append(function_area)
+        if competency is not None:
+            where.append("e.employee_id IN (SELECT employee_id FROM competencies WHERE name = ? AND level_rank >= ?)")
+            args += [competency, LEVEL_RANK.get(min_level, 0)]
+        if language is not None:
+            where.append("e.employee_id IN (SELECT employee_id FROM languages WHERE language = ?)")
+            args.append(language)
+
+        sql = f"SELECT {'e.employee_id' if ids_only else 'e.profile'} FROM employees e"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY e.rowid LIMIT ? OFFSET ?"
+        args += [-1 if limit is None else limit, offset]
+        if ids_only:
+            return [r[0] for r in self._conn().execute(sql, args)]
+        return self._profiles(sql, args)
+
+    def skill_counts(self, department=None, limit=50) -> list:
+        """Most common skills (optionally within a department) -> [(skill_name, employees), ...]."""
+        sql = "SELECT s.skill_name, COUNT(DISTINCT s.employee_id) AS n FROM skills s"
+        args = []
+        if department is not None:
+            sql += " JOIN employees e ON e.employee_id = s.employee_id WHERE e.department = ?"
+            args.append(department)
+        sql += " GROUP BY s.skill_name ORDER BY n DESC, s.skill_name LIMIT ?"
+        return [tuple(r) for r in self._conn().execute(sql, (*args, limit))]
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_store(db_path: str = EMPLOYEES_DB) -> EmployeeStore:
+    """Process-wide store per database path."""
+    key = os.path.abspath(db_path)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(key, EmployeeStore(key))
+    return store
@@ -0,0 +1,39 @@
+# keywords.py
+class KeywordMatcher:
+    """
+    Case-insensitive multi-group keyword matcher.
+
+    Built once from {group_name: [keywords]}; match(text) lowercases the text
+    once and reports which groups occur in it, with the same semantics as
+    `any(k in text.lower() for k in keywords)` per group.
+
+    Keywords are lowercased and de-duplicated, and any keyword that contains a
+    shorter keyword of the same group is dropped (if the longer one occurs, so
+    does the shorter). Each remaining keyword is a C-level substring scan and a
+    group stops scanning on its first hit. On CPython this beats a compiled
+    regex alternation and a pure-Python Aho-Corasick for the keyword set sizes
+    used here — see bench/bench_keywords.py.
+    """
+
+    def __init__(self, groups: dict):
+        self.groups = {}
+        for name, words in groups.items():
+            words = sorted({w.lower() for w in words if w}, key=len)
+            kept = []
+            for w in words:
+                if not any(k in w for k in kept):
+                    kept.append(w)
+            self.groups[name] = tuple(kept)
+
+    def match_lowered(self, text: str) -> set:
+        """Like match(), for text that is already lowercase."""
+        return {name for name, words in self.groups.items() if any(w in text for w in words)}
+
+    def match(self, text: str) -> set:
+        return self.match_lowered(text.lower())
+
+    def matches_any(self, text: str, group=None) -> bool:
+        """True if any keyword (of `group`, or of any group) occurs in text."""
+        lowered = text.lower()
+        names = self.groups if group is None else (group,)
+        return any(w in lowered for name in names for w in self.groups[name])
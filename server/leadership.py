@@ -1,9 +1,20 @@
 # leadership.py
+import gc
 import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
 from datetime import datetime
+import numpy as np
 from dateutil.parser import parse
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, session, stream_with_context
 from flask_cors import cross_origin
+from keywords import KeywordMatcher
+from usage import LEADERSHIP_SUMMARY
+import metrics
 
 # ---- import azure_chat from app.py without circular import ----
 # We'll inject the function from app.py via set_azure_chat(...)
@@ -12,57 +23,175 @@ def set_azure_chat(fn):
     global azure_chat_func
     azure_chat_func = fn
 
+# Optional persistent summary cache (summary_cache.SummaryCache), injected the same way
+summary_cache = None
+def set_summary_cache(cache):
+    global summary_cache
+    summary_cache = cache
+
 # Blueprint (accept both with and without trailing slash)
 leadership_bp = Blueprint("leadership", __name__, url_prefix="/api/leadership")
 leadership_bp.strict_slashes = False
 
 # ---------- scoring ----------
-def compute_weighted_LPI(emp: dict):
+# Bump whenever compute_weighted_LPI changes so materialized scores (score_store) are recomputed
+LPI_VERSION = 2
+LEVEL_MAP = {"Beginner": 1, "Intermediate": 2, "Advanced": 3}
+PEOPLE_KEYWORDS = ["coach", "mentor", "development", "leadership"]
+CHANGE_KEYWORDS = ["innovation", "transformation", "automation", "digital", "cloud"]
+LPI_MATCHER = KeywordMatcher({"people": PEOPLE_KEYWORDS, "innovation": CHANGE_KEYWORDS})
+LPI_WEIGHTS = {
+    "experience": 0.20, "projects": 0.15, "competencies": 0.20, "people": 0.10,
+    "cross_functional": 0.10, "innovation": 0.15, "progression": 0.10,
+    "communication": 0.05, "education": 0.05
+}
+
+# ---------- keyword flags ----------
+# Each keyword group is one bit; a record's flags are the OR over its keys and string values
+PEOPLE_BIT, INNOVATION_BIT = 1, 2
+ALL_KEYWORD_BITS = PEOPLE_BIT | INNOVATION_BIT
+_GROUP_BITS = ((PEOPLE_BIT, LPI_MATCHER.groups["people"]), (INNOVATION_BIT, LPI_MATCHER.groups["innovation"]))
+# Fields that carry most keyword hits (by hit rate per string), checked before the full walk so a
+# typical record stops after a handful of strings. Tuned to employees.json; any other layout just
+# falls through to the walk, which is what makes the result exact.
+KEYWORD_HOT_FIELDS = (
+    ("projects", "description"), ("experiences", "focus"), ("experiences", "program"),
+    ("projects", "project_name"), ("competencies", "name"), ("positions_history", "focus_areas"),
+    ("experiences", "type"), ("employment_info", "unit"), ("employment_info", "job_title"),
+    ("positions_history", "role_title"), ("skills", "specialization"), ("positions_history", "key_skills_used"),
+)
+# Field values repeat heavily (skill names, titles, levels, keys): memoize each string's bits
+TEXT_MASK_CACHE_MAX = 200_000
+_text_masks = {}
+
+
+def _text_mask(text: str) -> int:
+    low = text.lower()
+    mask = 0
+    for bit, words in _GROUP_BITS:
+        if any(w in low for w in words):
+            mask |= bit
+    if len(_text_masks) >= TEXT_MASK_CACHE_MAX:
+        _text_masks.clear()
+    _text_masks[text] = mask
+    return mask
+
+
+def keyword_mask(emp: dict) -> int:
+    """
+    Keyword groups (PEOPLE_BIT / INNOVATION_BIT) found, case-insensitively,
+    in any key or string value of the record. Strings are matched one at a
+    time, so nothing is serialized; KEYWORD_HOT_FIELDS are tried first and
+    the full walk only runs while some group is still missing.
+    """
+    get = _text_masks.get
+    mask = 0
+    for section, field in KEYWORD_HOT_FIELDS:
+        items = emp.get(section)
+        for item in (items if isinstance(items, list) else (items,)):
+            value = item.get(field) if isinstance(item, dict) else None
+            if isinstance(value, str):
+                m = get(value)
+                mask |= _text_mask(value) if m is None else m
+            elif isinstance(value, list):
+                for v in value:
+                    if isinstance(v, str):
+                        m = get(v)
+                        mask |= _text_mask(v) if m is None else m
+        if mask == ALL_KEYWORD_BITS:
+            return mask
+
+    stack = [emp]
+    while stack and mask != ALL_KEYWORD_BITS:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key in node:
+                if isinstance(key, str):
+                    m = get(key)
+                    mask |= _text_mask(key) if m is None else m
+            node = node.values()
+        for value in node:
+            if isinstance(value, str):
+                m = get(value)
+                mask |= _text_mask(value) if m is None else m
+            elif isinstance(value, (dict, list, tuple)):
+                stack.append(value)
+    return mask
+
+
+# ---------- features ----------
+def lpi_features(emp: dict) -> tuple:
+    """
+    Everything compute_weighted_LPI needs from a record, as a flat tuple:
+    (role_count, has_projects, lead_roles, comp_sum, comp_n, keyword_mask,
+    distinct_areas, hire_date, lang_count, has_master). None of it depends
+    on the date, so it can be cached per profile. Raises where
+    compute_weighted_LPI would.
+    """
     e = emp.get("employment_info", {}) or {}
     competencies = emp.get("competencies", []) or []
     skills = emp.get("skills", []) or []
     projects = emp.get("projects", []) or []
     positions = emp.get("positions_history", []) or []
-    text_block = json.dumps(emp).lower()
-
-    role_count = len(positions)
-    experience_score = min(10, role_count * 2)
 
-    lead_roles = sum(1 for p in projects if "lead" in (p.get("role", "").lower()))
-    project_score = min(10, 5 + 2 * lead_roles) if projects else 0
+    lead_roles = 0
+    for p in projects:
+        if "lead" in p.get("role", "").lower():
+            lead_roles += 1
+    comp_sum = 0
+    for c in competencies:
+        comp_sum += LEVEL_MAP.get(c.get("level", ""), 0)
+    distinct_areas = len({s.get("function_area") for s in skills if s.get("function_area")}) if skills else 0
+    try:
+        hire_date = e.get("hire_date")
+    except Exception:
+        hire_date = None  # scored as 1.0 year, like an unparseable date
+    lang_count = len((emp.get("personal_info") or {}).get("languages", []))
+    master = False
+    for x in emp.get("education", []) or []:
+        if "Master" in x.get("degree", ""):
+            master = True
+            break
+    return (len(positions), bool(projects), lead_roles, comp_sum, len(competencies), keyword_mask(emp),
+            distinct_areas, hire_date, lang_count, master)
 
-    level_map = {"Beginner": 1, "Intermediate": 2, "Advanced": 3}
-    avg_comp = (
-        sum(level_map.get(c.get("level", ""), 0) for c in competencies) /
-        max(1, len(competencies))
-    ) if competencies else 0
-    competency_score = round((avg_comp / 3) * 10, 1)
 
-    people_score = 10 if any(k in text_block for k in ["coach", "mentor", "development", "leadership"]) else 6
+_ISO_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
 
-    distinct_areas = len(set(s.get("function_area") for s in skills if s.get("function_area"))) if skills else 0
-    cross_score = min(10, distinct_areas * 2)
+def _parse_date(value):
+    # Plain YYYY-MM-DD (what employees.json uses) without dateutil's tokenizer; same result as parse()
+    if isinstance(value, str) and _ISO_DATE.fullmatch(value):
+        try:
+            return datetime(int(value[:4]), int(value[5:7]), int(value[8:]))
+        except ValueError:
+            pass
+    return parse(value)
 
-    change_score = 10 if any(k in text_block for k in ["innovation", "transformation", "automation", "digital", "cloud"]) else 6
 
+def _years_since_hire(hire_date, now) -> float:
     try:
-        hire = parse(e.get("hire_date"))
-        years = max(0.01, (datetime.utcnow() - hire).days / 365.0)
+        return max(0.01, (now - _parse_date(hire_date)).days / 365.0)
     except Exception:
-        years = 1.0
-    progression_score = min(10, max(5, (role_count - 1) / years * 10))
+        return 1.0
 
-    lang_count = len((emp.get("personal_info") or {}).get("languages", []))
-    comm_score = min(10, 4 + lang_count * 3)
 
-    edu = emp.get("education", []) or []
-    edu_score = 10 if any("Master" in (x.get("degree", "")) for x in edu) else 8
+def compute_weighted_LPI(emp: dict):
+    role_count, has_projects, lead_roles, comp_sum, comp_n, mask, distinct_areas, hire_date, lang_count, master = \
+        lpi_features(emp)
 
-    weights = {
-        "experience": 0.20, "projects": 0.15, "competencies": 0.20, "people": 0.10,
-        "cross_functional": 0.10, "innovation": 0.15, "progression": 0.10,
-        "communication": 0.05, "education": 0.05
-    }
+    experience_score = min(10, role_count * 2)
+    project_score = min(10, 5 + 2 * lead_roles) if has_projects else 0
+    avg_comp = comp_sum / max(1, comp_n) if comp_n else 0
+    competency_score = round((avg_comp / 3) * 10, 1)
+    people_score = 10 if mask & PEOPLE_BIT else 6
+    cross_score = min(10, distinct_areas * 2)
+    change_score = 10 if mask & INNOVATION_BIT else 6
+    years = _years_since_hire(hire_date, datetime.utcnow())
+    progression_score = min(10, max(5, (role_count - 1) / years * 10))
+    comm_score = min(10, 4 + lang_count * 3)
+    edu_score = 10 if master else 8
+
+    weights = LPI_WEIGHTS
 
     dims = {
         "experience": experience_score,
@@ -80,14 +209,154 @@ def compute_weighted_LPI(emp: dict):
     return overall, dims
 
 
+# Date-independent features by profile_hash, for callers that already hash profiles
+# (score_store, norms); their daily full rescore then skips extraction entirely
+FEATURE_CACHE_MAX = int(os.getenv("LPI_FEATURE_CACHE_MAX", "200000"))
+_feature_cache = {}
+_feature_cache_lock = threading.Lock()
+
+
+def _cached_features(emp, digest):
+    features = _feature_cache.get(digest)
+    if features is None:
+        features = lpi_features(emp)
+        with _feature_cache_lock:
+            if len(_feature_cache) >= FEATURE_CACHE_MAX:
+                # Drop the older half (dicts keep insertion order)
+                for old in list(_feature_cache)[:len(_feature_cache) // 2]:
+                    del _feature_cache[old]
+            _feature_cache[digest] = features
+    return features
+
+
+@contextmanager
+def _gc_paused():
+    # The batch allocates a few acyclic objects per record; with a large dataset resident every
+    # collection they trigger walks all of it (~1.7s at 100k employees), so hold the collector off
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def compute_weighted_LPI_batch(employees, hashes=None):
+    """
+    Score many employees at once. Each record is reduced to lpi_features()
+    (hire dates parsed once per distinct value), the features are
+    transposed into columns and the nine dimensions and the weighted
+    overall are computed with NumPy. With hashes (score_store.profile_hash
+    per record) features are reused across calls for unchanged profiles.
+    Element i equals compute_weighted_LPI(employees[i]) value-for-value and
+    type-for-type; where that call would raise, element i is the exception
+    instance instead.
+    """
+    with _gc_paused():
+        return _score_batch(employees, hashes)
+
+
+def _score_batch(employees, hashes):
+    n = len(employees)
+    if n == 0:
+        return []
+
+    features, failed = [], {}
+    blank = (0, False, 0, 0, 0, 0, 0, None, 0, False)
+    for i, emp in enumerate(employees):
+        try:
+            features.append(lpi_features(emp) if hashes is None else _cached_features(emp, hashes[i]))
+        except Exception as ex:
+            failed[i] = ex
+            features.append(blank)
+
+    columns = list(zip(*features))
+    hire_dates = columns.pop(7)
+    role_count, has_projects, lead_roles, comp_sum, comp_n, masks, areas, langs, master = map(np.array, columns)
+
+    now = datetime.utcnow()
+    years_by_date = {}
+    cached_years = years_by_date.get
+    years = np.empty(n, dtype=np.float64)
+    for i, raw in enumerate(hire_dates):
+        y = cached_years(raw) if isinstance(raw, str) else None
+        if y is None:
+            y = _years_since_hire(raw, now)
+            if isinstance(raw, str):
+                years_by_date[raw] = y
+        years[i] = y
+
+    experience = np.minimum(10, role_count * 2)
+    project = np.where(has_projects, np.minimum(10, 5 + 2 * lead_roles), 0)
+    avg = np.where(comp_n > 0, comp_sum / np.maximum(1, comp_n), 0.0)
+    competency = [round(x, 1) for x in (avg / 3 * 10).tolist()]
+    people_s = np.where(masks & PEOPLE_BIT, 10, 6)
+    cross = np.minimum(10, areas * 2)
+    change_s = np.where(masks & INNOVATION_BIT, 10, 6)
+    # min(10, max(5, x)) keeps the int bound when it clamps, the float otherwise
+    progression = [x if 5 < x < 10 else (5 if not x > 5 else 10)
+                   for x in ((role_count - 1) / years * 10).tolist()]
+    comm = np.minimum(10, 4 + langs * 3)
+    edu_s = np.where(master, 10, 8)
+
+    columns = {
+        "experience": experience,
+        "projects": project,
+        "competencies": np.array(competency, dtype=np.float64),
+        "people": people_s,
+        "cross_functional": cross,
+        "innovation": change_s,
+        "progression": np.array(progression, dtype=np.float64),
+        "communication": comm,
+        "education": edu_s,
+    }
+    total = 0
+    for k, col in columns.items():  # same left-to-right order as the scalar sum()
+        total = total + col * LPI_WEIGHTS[k]
+    overall = [round(x, 1) for x in (total * 10).tolist()]
+
+    values = {
+        "experience": experience.tolist(),
+        "projects": project.tolist(),
+        "competencies": competency,
+        "people": people_s.tolist(),
+        "cross_functional": cross.tolist(),
+        "innovation": change_s.tolist(),
+        "progression": progression,
+        "communication": comm.tolist(),
+        "education": edu_s.tolist(),
+    }
+    keys = list(values)
+    out = []
+    for i, dim_row in enumerate(zip(*values.values())):
+        if i in failed:
+            out.append(failed[i])
+        else:
+            out.append((overall[i], dict(zip(keys, dim_row))))
+    return out
+
+
 # ---------- summarizer (AI call) ----------
-def summarize_leadership(emp: dict, score: float, subs: dict, temperature: float = 1) -> str:
+# Bump whenever the prompt below changes so cached summaries are not reused
+LEADERSHIP_PROMPT_VERSION = 1
+
+def summarize_leadership(emp: dict, score: float, subs: dict, temperature: float = 1, timeout=None) -> str:
     """
     Default temperature set to 1 because some Azure deployments
     reject non-default values (like 0.3).
+    Served from summary_cache when the same profile/scores were summarized before.
+    timeout (seconds) bounds the upstream call, retries included.
     """
     assert azure_chat_func is not None, "azure_chat not set; call set_azure_chat(azure_chat) in app.py"
 
+    cache_key = None
+    if summary_cache is not None:
+        cache_key = summary_cache.key(emp, score, subs, LEADERSHIP_PROMPT_VERSION)
+        cached = summary_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     prompt = f"""
 You are an HR leadership evaluator.
 Leadership Potential Index: {score}/100
@@ -106,7 +375,196 @@ Employee profile:
         {"role": "user", "content": prompt},
     ]
     # ✅ Use default temperature=1 for Azure compatibility
-    return azure_chat_func(msgs, temperature=1)
+    if timeout is None:
+        summary = azure_chat_func(msgs, temperature=1, call_site=LEADERSHIP_SUMMARY)
+    else:
+        summary = azure_chat_func(msgs, temperature=1, call_site=LEADERSHIP_SUMMARY, timeout=timeout)
+    if cache_key is not None:
+        summary_cache.put(cache_key, summary, employee_id=emp.get("employee_id"))
+    return summary
+
+
+# ---------- concurrent summaries ----------
+# Below the upstream read timeout (AZURE_READ_TIMEOUT, 60s), so one slow completion cannot use up an item
+DEFAULT_SUMMARY_TIMEOUT = 45
+
+# One pool for the whole process, so LEADERSHIP_MAX_INFLIGHT bounds summary calls across
+# concurrent requests and background jobs rather than per summarize_many call
+_summary_pool = None
+_summary_pool_lock = threading.Lock()
+
+def summary_pool() -> ThreadPoolExecutor:
+    global _summary_pool
+    if _summary_pool is None:
+        with _summary_pool_lock:
+            if _summary_pool is None:
+                _summary_pool = ThreadPoolExecutor(
+                    max_workers=max(1, int(os.getenv("LEADERSHIP_MAX_INFLIGHT", "8"))),
+                    thread_name_prefix="lpi-summary",
+                )
+    return _summary_pool
+
+
+def summarize_many(jobs, max_inflight=None, item_timeout=None):
+    """
+    Run summarize_leadership over [(emp, score, subs), ...] on the shared
+    summary pool, with at most max_inflight of this call's items queued or
+    running at once. Results come back in input order.
+    Each item gets item_timeout seconds from the moment it starts; the
+    deadline is passed down to the upstream call (rate-limit wait and
+    retries included), so a timed-out item frees its worker instead of
+    holding it until the read timeout. A slow or failing item gets the usual
+    "(AI summary unavailable: ...)" text instead of stalling the batch.
+    Defaults: LEADERSHIP_MAX_INFLIGHT (8), LEADERSHIP_SUMMARY_TIMEOUT (45s).
+    """
+    if max_inflight is None:
+        max_inflight = int(os.getenv("LEADERSHIP_MAX_INFLIGHT", "8"))
+    if item_timeout is None:
+        item_timeout = float(os.getenv("LEADERSHIP_SUMMARY_TIMEOUT", str(DEFAULT_SUMMARY_TIMEOUT)))
+
+    results = [None] * len(jobs)
+    if not jobs:
+        return results
+    if max_inflight <= 1:
+        for i, (emp, score, subs) in enumerate(jobs):
+            try:
+                results[i] = summarize_leadership(emp, score, subs, timeout=item_timeout)
+            except Exception as e:
+                results[i] = f"(AI summary unavailable: {e})"
+        return results
+
+    started = {}
+    def run(i, emp, score, subs):
+        started[i] = time.monotonic()
+        return summarize_leadership(emp, score, subs, timeout=item_timeout)
+
+    pool = summary_pool()
+    queued = iter(enumerate(jobs))
+    pending = {}
+
+    def submit_next():
+        for i, job in queued:
+            pending[pool.submit(run, i, *job)] = i
+            return
+
+    for _ in range(max_inflight):
+        submit_next()
+    while pending:
+        now = time.monotonic()
+        for fut, i in list(pending.items()):
+            if i in started and now - started[i] >= item_timeout:
+                # Backstop: the upstream deadline normally ends the call first
+                del pending[fut]
+                results[i] = f"(AI summary unavailable: timed out after {item_timeout:g}s)"
+                submit_next()
+        if not pending:
+            break
+        deadlines = [started[i] + item_timeout for i in pending.values() if i in started]
+        wait_for = max(0.0, min(deadlines) - now) if deadlines else item_timeout
+        done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+        for fut in done:
+            i = pending.pop(fut)
+            try:
+                results[i] = fut.result()
+            except Exception as e:
+                results[i] = f"(AI summary unavailable: {e})"
+            submit_next()
+    return results
+
+
+def score_rows(employees, scored_all=None):
+    """
+    Score every employee -> (results, jobs, rows, skipped). results has one
+    row per input (scored rows with ai_summary=None, or an error row); jobs
+    and rows line up for summarize_many. scored_all, if given, holds
+    precomputed compute_weighted_LPI_batch-style results for employees.
+    """
+    results, skipped, jobs, rows = [], 0, [], []
+    if scored_all is None:
+        with metrics.phase("scoring"):
+            scored_all = compute_weighted_LPI_batch(employees)
+    for emp, scored in zip(employees, scored_all):
+        try:
+            if isinstance(scored, Exception):
+                raise scored
+            score, subs = scored
+            row = {
+                "employee_id": emp.get("employee_id"),
+                "name": (emp.get("personal_info") or {}).get("name"),
+                "leadership_score": score,
+                "dimension_scores": subs,
+                "ai_summary": None,
+            }
+            jobs.append((emp, score, subs))
+            rows.append(row)
+            results.append(row)
+        except Exception as e:
+            skipped += 1
+            results.append({
+                "employee_id": emp.get("employee_id"),
+                "name": (emp.get("personal_info") or {}).get("name"),
+                "error": f"scoring_failed: {e}",
+            })
+    return results, jobs, rows, skipped
+
+
+def score_and_summarize(employees, scored_all=None):
+    """Score every employee, then fetch AI summaries concurrently -> (results, skipped)."""
+    results, jobs, rows, skipped = score_rows(employees, scored_all)
+    for row, summary in zip(rows, summarize_many(jobs)):
+        row["ai_summary"] = summary
+    return results, skipped
+
+
+# ---------- NDJSON streaming ----------
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+def wants_ndjson() -> bool:
+    """Accept: application/x-ndjson, or ?format=ndjson."""
+    return (request.args.get("format", "").lower() == "ndjson"
+            or NDJSON_MIMETYPE in request.headers.get("Accept", ""))
+
+
+def iter_score_and_summarize(employees, chunk_size=None, scored_all=None):
+    """
+    Same rows as score_and_summarize, yielded in input order a chunk at a
+    time (default chunk: LEADERSHIP_MAX_INFLIGHT), so only one chunk of
+    rows is held in memory.
+    """
+    if chunk_size is None:
+        chunk_size = int(os.getenv("LEADERSHIP_MAX_INFLIGHT", "8"))
+    chunk_size = max(1, chunk_size)
+    for start in range(0, len(employees), chunk_size):
+        chunk_scores = None if scored_all is None else scored_all[start:start + chunk_size]
+        results, jobs, rows, _ = score_rows(employees[start:start + chunk_size], chunk_scores)
+        for row, summary in zip(rows, summarize_many(jobs)):
+            row["ai_summary"] = summary
+        yield from results
+
+
+def ndjson_response(employees, route_name, scored_all=None):
+    """One JSON line per employee as it completes, then {"done": true, "count", "skipped"}."""
+    return ndjson_rows_response(iter_score_and_summarize(employees, scored_all=scored_all), route_name)
+
+
+def ndjson_rows_response(rows, route_name, headers=None):
+    """NDJSON body for already-built result rows (e.g. a stored job's), with the same trailer."""
+    def generate():
+        count = skipped = 0
+        try:
+            for row in rows:
+                count += 1
+                skipped += 1 if "error" in row else 0
+                yield json.dumps(row, ensure_ascii=False) + "\n"
+        except Exception as e:
+            print(f"{route_name} stream error:", repr(e))
+            yield json.dumps({"done": True, "error": "internal_error", "detail": str(e),
+                              "count": count, "skipped": skipped}) + "\n"
+            return
+        yield json.dumps({"done": True, "count": count, "skipped": skipped}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE,
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **(headers or {})})
 
 
 # ---------- quick ping for testing ----------
@@ -116,6 +574,27 @@ def ping():
     return {"ok": True}
 
 
+# ---------- summary cache admin ----------
+@leadership_bp.route("/cache", methods=["OPTIONS", "GET", "DELETE"])
+@cross_origin(origins=["http://localhost:3000"], allow_headers=["Content-Type"], supports_credentials=True)
+def leadership_cache():
+    """GET -> cache stats; DELETE (optional ?employee_id=...) -> invalidate entries."""
+    if request.method == "OPTIONS":
+        return ("", 204)
+
+    if not session.get("isadmin"):
+        return jsonify({"error": "forbidden", "detail": "Admin access only"}), 403
+    if summary_cache is None:
+        return jsonify({"error": "not_configured", "detail": "Summary cache is disabled"}), 404
+
+    if request.method == "DELETE":
+        employee_id = request.args.get("employee_id")
+        removed = summary_cache.invalidate(employee_id)
+        return jsonify({"ok": True, "removed": removed, "employee_id": employee_id}), 200
+
+    return jsonify(summary_cache.stats()), 200
+
+
 # ---------- routes ----------
 @leadership_bp.route("/", methods=["OPTIONS", "POST"])
 @leadership_bp.route("",  methods=["OPTIONS", "POST"])  # no trailing slash
@@ -130,28 +609,10 @@ def leadership_batch():
         if not isinstance(employees, list) or len(employees) == 0:
             return jsonify({"error": "bad_request", "detail": "Expected non-empty employees array"}), 400
 
-        results, skipped = [], 0
-        for emp in employees:
-            try:
-                score, subs = compute_weighted_LPI(emp)
-                try:
-                    summary = summarize_leadership(emp, score, subs)
-                except Exception as e:
-                    summary = f"(AI summary unavailable: {e})"
-                results.append({
-                    "employee_id": emp.get("employee_id"),
-                    "name": (emp.get("personal_info") or {}).get("name"),
-                    "leadership_score": score,
-                    "dimension_scores": subs,
-                    "ai_summary": summary,
-                })
-            except Exception as e:
-                skipped += 1
-                results.append({
-                    "employee_id": emp.get("employee_id"),
-                    "name": (emp.get("personal_info") or {}).get("name"),
-                    "error": f"scoring_failed: {e}",
-                })
+        if wants_ndjson():
+            return ndjson_response(employees, "leadership_batch")
+
+        results, skipped = score_and_summarize(employees)
 
         return jsonify({"count": len(results), "skipped": skipped, "results": results}), 200
 
@@ -173,7 +634,8 @@ def leadership_one():
         if not isinstance(emp, dict):
             return jsonify({"error": "bad_request", "detail": "Body must include 'employee' object"}), 400
 
-        score, subs = compute_weighted_LPI(emp)
+        with metrics.phase("scoring"):
+            score, subs = compute_weighted_LPI(emp)
         try:
             summary = summarize_leadership(emp, score, subs)
         except Exception as e:
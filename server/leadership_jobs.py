@@ -0,0 +1,410 @@
+# leadership_jobs.py
+import json
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from flask import Blueprint, jsonify, request, session
+from flask_cors import cross_origin
+
+from leadership import score_rows, summarize_many
+
+LEADERSHIP_JOBS_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "db", "leadership_jobs.db")
+
+QUEUED, RUNNING, COMPLETED, FAILED = "queued", "running", "completed", "failed"
+UNFINISHED = (QUEUED, RUNNING)
+
+
+def _iso(ts):
+    return datetime.utcfromtimestamp(ts).isoformat() + "Z" if ts else None
+
+
+class JobStore:
+    """
+    SQLite persistence for org-wide scoring jobs. Every job lists its
+    employee ids up front (job_items); a worker fills in each item's result,
+    so an interrupted job resumes from the first item without one.
+
+    Several processes (e.g. gunicorn workers) share the database, so a job
+    is run by whoever claim()s it: the claim is one conditional UPDATE, and
+    it holds while the owner keeps writing results within the lease.
+    """
+
+    def __init__(self, db_path: str = LEADERSHIP_JOBS_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+        CREATE TABLE IF NOT EXISTS leadership_jobs (
+            job_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            department TEXT,
+            total INTEGER NOT NULL,
+            done INTEGER NOT NULL DEFAULT 0,
+            skipped INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            finished_at REAL,
+            owner TEXT,
+            dataset_version TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_status ON leadership_jobs(status);
+        CREATE TABLE IF NOT EXISTS leadership_job_items (
+            job_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            employee_id TEXT,
+            result TEXT,
+            PRIMARY KEY (job_id, position)
+        );
+        """)
+        columns = {r["name"] for r in conn.execute("PRAGMA table_info(leadership_jobs)")}
+        for column in ("owner", "dataset_version"):
+            if column not in columns:  # databases created before the column existed
+                conn.execute(f"ALTER TABLE leadership_jobs ADD COLUMN {column} TEXT")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _job(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job["progress"] = round(job["done"] / job["total"], 4) if job["total"] else 1.0
+        for k in ("created_at", "updated_at", "finished_at"):
+            job[k] = _iso(job[k])
+        return job
+
+    def create(self, department, employee_ids, dataset_version=None) -> dict:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO leadership_jobs (job_id, status, department, total, created_at, updated_at, "
+                "dataset_version) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, department, len(employee_ids), now, now, dataset_version),
+            )
+            conn.executemany(
+                "INSERT INTO leadership_job_items (job_id, position, employee_id) VALUES (?, ?, ?)",
+                ((job_id, i, emp_id) for i, emp_id in enumerate(employee_ids)),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id) -> dict:
+        row = self._conn().execute("SELECT * FROM leadership_jobs WHERE job_id=?", (job_id,)).fetchone()
+        return self._job(row)
+
+    def recent(self, limit: int = 20) -> list:
+        rows = self._conn().execute(
+            "SELECT * FROM leadership_jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._job(r) for r in rows]
+
+    def active(self, department):
+        """Queued/running job for the same scope (department None = whole org)."""
+        row = self._conn().execute(
+            "SELECT * FROM leadership_jobs WHERE status IN (?, ?) AND department IS ? "
+            "ORDER BY created_at DESC LIMIT 1", (*UNFINISHED, department)).fetchone()
+        return self._job(row)
+
+    def latest_completed(self, department):
+        row = self._conn().execute(
+            "SELECT * FROM leadership_jobs WHERE status=? AND department IS ? "
+            "ORDER BY finished_at DESC LIMIT 1", (COMPLETED, department)).fetchone()
+        return self._job(row)
+
+    def claimable(self, lease: float) -> list:
+        """Queued jobs, and running ones whose owner has not written anything for lease seconds."""
+        rows = self._conn().execute(
+            "SELECT job_id FROM leadership_jobs WHERE status=? OR (status=? AND updated_at<?) ORDER BY created_at",
+            (QUEUED, RUNNING, time.time() - lease)).fetchall()
+        return [r["job_id"] for r in rows]
+
+    def claim(self, job_id, owner: str, lease: float) -> bool:
+        """Atomically take a queued job, a running job whose lease expired, or one owner already holds."""
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            cur = conn.execute(
+                "UPDATE leadership_jobs SET status=?, owner=?, updated_at=? WHERE job_id=? "
+                "AND (status=? OR (status=? AND (owner IS NULL OR owner=? OR updated_at<?)))",
+                (RUNNING, owner, now, job_id, QUEUED, RUNNING, owner, now - lease),
+            )
+        return cur.rowcount == 1
+
+    def pending_items(self, job_id, limit: int) -> list:
+        """Next [(position, employee_id), ...] without a stored result."""
+        return [tuple(r) for r in self._conn().execute(
+            "SELECT position, employee_id FROM leadership_job_items "
+            "WHERE job_id=? AND result IS NULL ORDER BY position LIMIT ?", (job_id, limit))]
+
+    def save_results(self, job_id, items, skipped: int = 0, owner: str = None) -> bool:
+        """
+        items: [(position, result_dict), ...] written with the progress counters in one transaction
+        (which also renews owner's lease). False, and nothing written, if owner no longer holds the job.
+        """
+        conn = self._conn()
+        with conn:
+            cur = conn.execute(
+                "UPDATE leadership_jobs SET done=done+?, skipped=skipped+?, updated_at=? "
+                "WHERE job_id=? AND (? IS NULL OR owner=?)",
+                (len(items), skipped, time.time(), job_id, owner, owner),
+            )
+            if cur.rowcount != 1:
+                return False
+            conn.executemany(
+                "UPDATE leadership_job_items SET result=? WHERE job_id=? AND position=?",
+                ((json.dumps(result, ensure_ascii=False), job_id, pos) for pos, result in items),
+            )
+        return True
+
+    def set_status(self, job_id, status, error=None, owner: str = None) -> bool:
+        """With owner, only if owner still holds the job."""
+        now = time.time()
+        finished = now if status in (COMPLETED, FAILED) else None
+        conn = self._conn()
+        with conn:
+            cur = conn.execute(
+                "UPDATE leadership_jobs SET status=?, error=?, updated_at=?, finished_at=? "
+                "WHERE job_id=? AND (? IS NULL OR owner=?)",
+                (status, error, now, finished, job_id, owner, owner),
+            )
+        return cur.rowcount == 1
+
+    def results(self, job_id, offset: int = 0, limit: int = None) -> list:
+        """Stored results in dataset order (partial while the job is running)."""
+        rows = self._conn().execute(
+            "SELECT result FROM leadership_job_items WHERE job_id=? AND result IS NOT NULL "
+            "ORDER BY position LIMIT ? OFFSET ?", (job_id, -1 if limit is None else limit, offset))
+        return [json.loads(r[0]) for r in rows]
+
+    def iter_results(self, job_id, batch: int = 1000):
+        """All stored results in dataset order, read batch rows at a time."""
+        offset = 0
+        while True:
+            page = self.results(job_id, offset, batch)
+            yield from page
+            if len(page) < batch:
+                return
+            offset += batch
+
+
+class JobRunner:
+    """
+    Background worker pool for leadership jobs. Workers take one job at a
+    time and process it in chunks: score the chunk, fetch its summaries
+    (summarize_many, so LEADERSHIP_MAX_INFLIGHT still applies) and commit
+    the results before moving on.
+
+    Every process may run a JobRunner on the same store: a job only runs
+    where JobStore.claim() succeeds. resume() queues the claimable jobs
+    (queued, or running with an expired lease, e.g. their process died) and
+    idle workers call it again every half lease, so jobs orphaned by one
+    process are picked up by another.
+    """
+
+    def __init__(self, store: JobStore, repo, workers: int = 1, chunk_size: int = 32, lease: float = 600):
+        self.store = store
+        self.repo = repo
+        self.chunk_size = max(1, chunk_size)
+        self.lease = max(1.0, lease)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue = queue.Queue()
+        self._queued = set()
+        self._lock = threading.Lock()
+        for i in range(max(1, workers)):
+            threading.Thread(target=self._worker, name=f"lpi-job-{i}", daemon=True).start()
+
+    @classmethod
+    def from_env(cls, repo):
+        """LEADERSHIP_JOBS_PATH, LEADERSHIP_JOB_WORKERS (1), LEADERSHIP_JOB_CHUNK (32), LEADERSHIP_JOB_LEASE (600s)."""
+        return cls(
+            JobStore(os.getenv("LEADERSHIP_JOBS_PATH", LEADERSHIP_JOBS_DB)),
+            repo,
+            workers=int(os.getenv("LEADERSHIP_JOB_WORKERS", "1")),
+            chunk_size=int(os.getenv("LEADERSHIP_JOB_CHUNK", "32")),
+            lease=float(os.getenv("LEADERSHIP_JOB_LEASE", "600")),
+        )
+
+    def dataset_version(self) -> str:
+        return json.dumps(self.repo.version(), default=str)
+
+    def _enqueue(self, job_id) -> bool:
+        with self._lock:
+            if job_id in self._queued:
+                return False
+            self._queued.add(job_id)
+        self._queue.put(job_id)
+        return True
+
+    def submit(self, department=None):
+        """Start a job (or return the one already running for this scope) -> (job, created)."""
+        with self._lock:
+            existing = self.store.active(department)
+            if existing:
+                return existing, False
+            employees = self.repo.by_department(department) if department else self.repo.all()
+            if not employees:
+                raise LookupError(f"No employees found for department '{department}'" if department
+                                  else "No employees found")
+            job = self.store.create(department, [e.get("employee_id") for e in employees],
+                                    self.dataset_version())
+        self._enqueue(job["job_id"])
+        return job, True
+
+    def latest(self, department=None):
+        """Latest completed job for this scope if it scored the current dataset today, else None."""
+        job = self.store.latest_completed(department)
+        if job is None or job.get("dataset_version") != self.dataset_version():
+            return None
+        if (job["finished_at"] or "")[:10] != datetime.utcnow().date().isoformat():
+            return None  # LPI progression depends on the date
+        return job
+
+    def resume(self) -> int:
+        job_ids = [job_id for job_id in self.store.claimable(self.lease) if self._enqueue(job_id)]
+        if job_ids:
+            print(f"[INFO] Resuming {len(job_ids)} leadership job(s)")
+        return len(job_ids)
+
+    def _worker(self):
+        while True:
+            try:
+                job_id = self._queue.get(timeout=self.lease / 2)
+            except queue.Empty:
+                try:
+                    self.resume()
+                except Exception as e:
+                    print(f"[WARN] Leadership job poll failed: {e}")
+                continue
+            try:
+                self.run(job_id)
+            except Exception as e:
+                print(f"[WARN] Leadership job {job_id} failed: {e}")
+                self.store.set_status(job_id, FAILED, str(e), owner=self.owner)
+            finally:
+                with self._lock:
+                    self._queued.discard(job_id)
+
+    def run(self, job_id) -> bool:
+        """Run job_id to completion if this runner can claim it -> False if another owner has it."""
+        if not self.store.claim(job_id, self.owner, self.lease):
+            return False
+        while True:
+            items = self.store.pending_items(job_id, self.chunk_size)
+            if not items:
+                break
+            found, out = [], {}
+            for pos, emp_id in items:
+                emp = self.repo.get(emp_id)
+                if emp is None:
+                    out[pos] = {"employee_id": emp_id, "name": None, "error": "not_found"}
+                else:
+                    found.append((pos, emp))
+
+            results, jobs, rows, skipped = score_rows([emp for _, emp in found])
+            for row, summary in zip(rows, summarize_many(jobs)):
+                row["ai_summary"] = summary
+            for (pos, _), result in zip(found, results):
+                out[pos] = result
+            if not self.store.save_results(job_id, sorted(out.items()), skipped + len(items) - len(found),
+                                           owner=self.owner):
+                print(f"[WARN] Leadership job {job_id} was taken over by another worker")
+                return False
+        return self.store.set_status(job_id, COMPLETED, owner=self.owner)
+
+
+# ---------- routes ----------
+job_runner = None
+def set_job_runner(runner):
+    global job_runner
+    job_runner = runner
+
+jobs_bp = Blueprint("leadership_jobs", __name__, url_prefix="/api/leadership/jobs")
+jobs_bp.strict_slashes = False
+
+
+def _page_args():
+    try:
+        offset = max(0, int(request.args.get("offset", 0)))
+        limit = min(1000, max(1, int(request.args.get("limit", 100))))
+    except ValueError:
+        return None
+    return offset, limit
+
+
+@jobs_bp.route("", methods=["OPTIONS", "GET", "POST"])
+@cross_origin(origins=["http://localhost:3000"], allow_headers=["Content-Type"], supports_credentials=True)
+def jobs():
+    """POST {"department": optional} -> start a scoring job; GET -> recent jobs."""
+    if request.method == "OPTIONS":
+        return ("", 204)
+    if not session.get("isadmin"):
+        return jsonify({"error": "forbidden", "detail": "Admin access only"}), 403
+    if job_runner is None:
+        return jsonify({"error": "not_configured", "detail": "Leadership jobs are disabled"}), 404
+
+    if request.method == "GET":
+        return jsonify({"jobs": job_runner.store.recent()}), 200
+
+    body = request.get_json(force=True, silent=True) or {}
+    department = body.get("department") or None
+    try:
+        job, created = job_runner.submit(department)
+    except LookupError as e:
+        return jsonify({"error": "not_found", "detail": str(e)}), 404
+    return jsonify({**job, "created": created}), 202 if created else 200
+
+
+@jobs_bp.route("/latest", methods=["OPTIONS", "GET"])
+@cross_origin(origins=["http://localhost:3000"], allow_headers=["Content-Type"], supports_credentials=True)
+def latest_job():
+    """Most recent completed job for ?department= (or the whole org) with its results page."""
+    if request.method == "OPTIONS":
+        return ("", 204)
+    if not session.get("isadmin"):
+        return jsonify({"error": "forbidden", "detail": "Admin access only"}), 403
+    if job_runner is None:
+        return jsonify({"error": "not_configured", "detail": "Leadership jobs are disabled"}), 404
+
+    page = _page_args()
+    if page is None:
+        return jsonify({"error": "bad_request", "detail": "offset and limit must be integers"}), 400
+    job = job_runner.store.latest_completed(request.args.get("department") or None)
+    if job is None:
+        return jsonify({"error": "not_found", "detail": "No completed leadership job yet"}), 404
+    return jsonify({**job, "offset": page[0], "results": job_runner.store.results(job["job_id"], *page)}), 200
+
+
+@jobs_bp.route("/<job_id>", methods=["OPTIONS", "GET"])
+@cross_origin(origins=["http://localhost:3000"], allow_headers=["Content-Type"], supports_credentials=True)
+def job_status(job_id):
+    """Progress plus the stored (possibly partial) results, paged by ?offset=&limit=."""
+    if request.method == "OPTIONS":
+        return ("", 204)
+    if not session.get("isadmin"):
+        return jsonify({"error": "forbidden", "detail": "Admin access only"}), 403
+    if job_runner is None:
+        return jsonify({"error": "not_configured", "detail": "Leadership jobs are disabled"}), 404
+
+    page = _page_args()
+    if page is None:
+        return jsonify({"error": "bad_request", "detail": "offset and limit must be integers"}), 400
+    job = job_runner.store.get(job_id)
+    if job is None:
+        return jsonify({"error": "not_found", "detail": f"No job '{job_id}'"}), 404
+    return jsonify({**job, "offset": page[0], "results": job_runner.store.results(job_id, *page)}), 200
@@ -0,0 +1,212 @@
+# metrics.py
+# Minimal in-process metrics registry rendered in Prometheus text format
+# (exposition format 0.0.4), so the app needs no extra dependency.
+import threading
+import time
+from contextlib import contextmanager
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _num(v) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        if not items and not self.labelnames:
+            items = [((), 0)]  # unlabelled series are always exported, starting at 0
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        with self._lock:
+            items = sorted((k, ([*s[0]], s[1], s[2])) for k, s in self._values.items())
+        lines = self.header()
+        for key, (counts, total, n) in items:
+            running = 0
+            for bound, c in zip(self.buckets, counts):
+                running += c
+                le = f'le="{_num(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, [le])} {running}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_num(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._add(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, fn):
+        """fn() -> iterable of metrics (fresh Counter/Gauge objects) computed at scrape time."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        for fn in self._collectors:
+            try:
+                for m in fn():
+                    lines.extend(m.render())
+            except Exception as e:
+                lines.append(f"# collector {getattr(fn, '__name__', fn)} failed: {_escape(e)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# ---------- app-wide metrics ----------
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("route", "method", "status"))
+REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ("route",))
+PHASE_LATENCY = registry.histogram(
+    "app_phase_duration_seconds", "Time spent per request phase (data_load, skills_load, scoring, rate_limit, upstream)",
+    ("phase",))
+UPSTREAM_IN_FLIGHT = registry.gauge(
+    "upstream_requests_in_flight", "Upstream (Azure OpenAI) requests currently in flight")
+UPSTREAM_ERRORS = registry.counter(
+    "upstream_errors_total", "Upstream attempts that failed, by kind (http_4xx, http_5xx, connection)", ("kind",))
+UPSTREAM_429 = registry.counter(
+    "upstream_429_total", "Upstream attempts rejected with 429 Too Many Requests")
+
+
+def phase(name):
+    """Context manager timing one phase of a request."""
+    return PHASE_LATENCY.time(phase=name)
+
+
+def init_app(app):
+    """
+    Record per-route latency and in-flight gauges for every Flask request.
+    Streamed bodies (NDJSON, SSE) are still being produced when
+    after_request runs, so their latency is observed when the response is
+    closed, i.e. once the last byte has been handed to the server.
+    """
+    from flask import g, request
+
+    def route_label():
+        return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+    @app.before_request
+    def _metrics_start():
+        g._metrics_start = time.perf_counter()
+        g._metrics_route = route_label()
+        REQUESTS_IN_FLIGHT.inc(route=g._metrics_route)
+
+    @app.after_request
+    def _metrics_observe(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            labels = {"route": g._metrics_route, "method": request.method, "status": response.status_code}
+
+            def observe():
+                REQUEST_LATENCY.observe(time.perf_counter() - start, **labels)
+            if response.is_streamed:
+                response.call_on_close(observe)
+            else:
+                observe()
+        return response
+
+    @app.teardown_request
+    def _metrics_done(exc=None):
+        route = g.pop("_metrics_route", None)
+        if route is not None:
+            REQUESTS_IN_FLIGHT.dec(route=route)
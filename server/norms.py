@@ -0,0 +1,266 @@
+# norms.py
+import threading
+from collections import Counter
+from datetime import date, datetime
+
+from leadership import LPI_WEIGHTS, compute_weighted_LPI_batch
+from score_store import profile_hash
+
+LEVELS = ("Beginner", "Intermediate", "Advanced")
+TOP_AREAS = 5
+TOP_SPECIALIZATIONS = 8
+TOP_COMPETENCIES = 6
+PERCENTILES = (25, 50, 75)
+
+
+def _month(value):
+    """'YYYY-MM-DD...' -> 'YYYY-MM', or None."""
+    if isinstance(value, str) and len(value) >= 7 and value[4] == "-":
+        return value[:7]
+    return None
+
+
+def _years_since(month: str, today: date) -> float:
+    y, m = int(month[:4]), int(month[5:7])
+    return round(max(0, (today.year - y) * 12 + today.month - m) / 12, 1)
+
+
+def _top(counts: Counter, k: int, n: int) -> list:
+    ranked = sorted((item for item in counts.items() if item[1] > 0), key=lambda kv: (-kv[1], kv[0]))
+    return [[name, round(c / n, 2)] for name, c in ranked[:k]]
+
+
+def _tenure(months: Counter, today: date) -> Counter:
+    years = Counter()
+    for month, n in months.items():
+        if n > 0:
+            years[_years_since(month, today)] += n
+    return years
+
+
+def percentiles(counts: Counter, ps=PERCENTILES):
+    """Nearest-rank percentiles [p25, p50, p75] of a value -> count histogram, or None when empty."""
+    total = sum(counts.values())
+    if not total:
+        return None
+    out, seen, items = [], 0, iter(sorted(counts.items()))
+    value = None
+    for p in ps:
+        rank = max(1, -(-p * total // 100))  # ceil(p% of total)
+        while seen < rank:
+            value, n = next(items)
+            seen += n
+        out.append(value)
+    return out
+
+
+def percentile_rank(counts: Counter, value) -> int:
+    """Share (0-100) of the group scoring at or below value."""
+    total = sum(counts.values())
+    if not total or value is None:
+        return None
+    return round(100 * sum(n for v, n in counts.items() if v <= value) / total)
+
+
+def contribution(emp: dict, scored) -> tuple:
+    """What one employee adds to each of their groups (hashable parts only)."""
+    info = emp.get("employment_info") or {}
+    skills = [s for s in emp.get("skills") or [] if isinstance(s, dict)]
+    areas = frozenset(s["function_area"] for s in skills if s.get("function_area"))
+    specs = frozenset(s["specialization"] for s in skills if s.get("specialization"))
+    comps = tuple((c.get("name"), c.get("level")) for c in emp.get("competencies") or []
+                  if isinstance(c, dict) and c.get("name"))
+    lpi = ()
+    if not isinstance(scored, Exception):
+        score, dims = scored
+        lpi = (("overall", score), *((d, round(dims[d], 2)) for d in LPI_WEIGHTS))
+    return areas, specs, comps, _month(info.get("hire_date")), _month(info.get("in_role_since")), lpi
+
+
+class GroupNorms:
+    """Additive aggregates for one department or job title."""
+    __slots__ = ("headcount", "areas", "specs", "competencies", "hired", "in_role", "lpi")
+
+    def __init__(self):
+        self.headcount = 0
+        self.areas = Counter()
+        self.specs = Counter()
+        self.competencies = {}
+        self.hired = Counter()
+        self.in_role = Counter()
+        self.lpi = {}
+
+    def apply(self, contrib, sign: int):
+        areas, specs, comps, hired, in_role, lpi = contrib
+        self.headcount += sign
+        for a in areas:
+            self.areas[a] += sign
+        for s in specs:
+            self.specs[s] += sign
+        for name, level in comps:
+            levels = self.competencies.get(name)
+            if levels is None:
+                levels = self.competencies[name] = Counter()
+            levels[level] += sign
+        if hired:
+            self.hired[hired] += sign
+        if in_role:
+            self.in_role[in_role] += sign
+        for dim, value in lpi:
+            counts = self.lpi.get(dim)
+            if counts is None:
+                counts = self.lpi[dim] = Counter()
+            counts[value] += sign
+
+    def summary(self, today: date) -> dict:
+        n = self.headcount or 1
+        top_comps = sorted(self.competencies.items(), key=lambda kv: (-sum(kv[1].values()), kv[0]))
+        return {
+            "headcount": self.headcount,
+            "function_areas": _top(self.areas, TOP_AREAS, n),
+            "specializations": _top(self.specs, TOP_SPECIALIZATIONS, n),
+            "competency_levels": {
+                name: {lvl: round(levels[lvl] / total, 2) for lvl in LEVELS if levels[lvl] > 0}
+                for name, levels in top_comps[:TOP_COMPETENCIES]
+                if (total := sum(levels.values())) > 0
+            },
+            "tenure_years": percentiles(_tenure(self.hired, today)),
+            "years_in_role": percentiles(_tenure(self.in_role, today)),
+            "lpi": {dim: percentiles(+counts) for dim, counts in self.lpi.items()},
+        }
+
+
+class NormsIndex:
+    """
+    Per-department and per-job-title norms for mentor grounding: skill
+    frequency by function area / specialization, competency level mix,
+    tenure and time-in-role percentiles and LPI (overall and per dimension)
+    percentiles.
+
+    Aggregates are counters, so update() only subtracts the old and adds the
+    new contribution of employees whose profile hash changed (or who were
+    added/removed); LPI progression depends on the date, so everyone is
+    rescored once per day. Summaries and per-employee norms are memoized
+    until the next change.
+
+    update() diffs and scores without blocking readers and holds _lock only
+    while it applies the changes; summary() and for_employee() read under
+    the same lock, so they never see a half-applied update.
+    """
+
+    def __init__(self):
+        self.groups = {}
+        self._members = {}  # employee_id -> (hash, department, job_title, contribution)
+        self._summaries = {}
+        self._employees = {}  # (employee_id, department, job_title) -> for_employee()
+        self._lock = threading.Lock()         # groups, _members, _summaries, _employees
+        self._update_lock = threading.Lock()  # one update() at a time
+        self.scored_on = None
+        self.last_update = {}
+
+    def _group(self, kind, name):
+        group = self.groups.get((kind, name))
+        if group is None:
+            group = self.groups[(kind, name)] = GroupNorms()
+        return group
+
+    def _apply(self, department, job_title, contrib, sign):
+        for kind, name in (("department", department), ("job_title", job_title)):
+            if name:
+                group = self._group(kind, name)
+                group.apply(contrib, sign)
+                if group.headcount == 0:
+                    del self.groups[(kind, name)]
+
+    def update(self, employees, today: date = None) -> dict:
+        today = today or datetime.utcnow().date()
+        with self._update_lock:
+            # Only update() writes _members and it is serialized, so the diff can read it unlocked
+            rescore_all = self.scored_on != today
+            changed, seen = [], set()
+            for emp in employees:
+                emp_id = emp.get("employee_id") if isinstance(emp, dict) else None
+                if emp_id is None or emp_id in seen:
+                    continue
+                seen.add(emp_id)
+                digest = profile_hash(emp)
+                old = self._members.get(emp_id)
+                if rescore_all or old is None or old[0] != digest:
+                    changed.append((emp_id, digest, emp))
+            removed = [k for k in self._members if k not in seen]
+            scored = compute_weighted_LPI_batch([emp for _, _, emp in changed], [d for _, d, _ in changed])
+            members = []
+            for (emp_id, digest, emp), s in zip(changed, scored):
+                info = emp.get("employment_info") or {}
+                members.append((emp_id, (digest, info.get("department"), info.get("job_title"), contribution(emp, s))))
+
+            with self._lock:
+                for emp_id in removed:
+                    _, dept, title, contrib = self._members.pop(emp_id)
+                    self._apply(dept, title, contrib, -1)
+                for emp_id, member in members:
+                    old = self._members.get(emp_id)
+                    if old is not None:
+                        self._apply(old[1], old[2], old[3], -1)
+                    self._members[emp_id] = member
+                    self._apply(member[1], member[2], member[3], +1)
+                if changed or removed or rescore_all:
+                    self._summaries.clear()
+                    self._employees.clear()
+                self.scored_on = today
+                self.last_update = {"updated": len(changed), "removed": len(removed),
+                                    "employees": len(self._members), "groups": len(self.groups)}
+            return self.last_update
+
+    def _summary(self, kind: str, name: str, today: date = None):
+        key = (kind, name)
+        cached = self._summaries.get(key)
+        if cached is None:
+            group = self.groups.get(key)
+            if group is None:
+                return None
+            cached = self._summaries[key] = {kind: name, **group.summary(today or datetime.utcnow().date())}
+        return cached
+
+    def summary(self, kind: str, name: str, today: date = None):
+        with self._lock:
+            return self._summary(kind, name, today)
+
+    def for_employee(self, emp: dict) -> dict:
+        """Compact norms for emp's department and job title, plus where emp stands in each."""
+        info = emp.get("employment_info") or {}
+        key = (emp.get("employee_id"), info.get("department"), info.get("job_title"))
+        out = {"percentiles": [f"p{p}" for p in PERCENTILES]}
+        with self._lock:
+            cached = self._employees.get(key)
+            if cached is not None:
+                return cached
+            member = self._members.get(emp.get("employee_id"))
+            lpi = dict(member[3][5]) if member else {}
+            for kind, name in (("department", info.get("department")), ("job_title", info.get("job_title"))):
+                norms = self._summary(kind, name) if name else None
+                if norms is None:
+                    continue
+                overall = self.groups[(kind, name)].lpi.get("overall", Counter())
+                out[kind] = {**norms, "your_lpi_percentile": percentile_rank(overall, lpi.get("overall"))}
+            if member is not None:
+                self._employees[key] = out
+        return out
+
+
+_index = None
+_index_key = None
+_index_lock = threading.Lock()
+
+def get_norms(repo) -> NormsIndex:
+    """Norms for the repository's current snapshot, updated incrementally when it (or the day) changes."""
+    global _index, _index_key
+    key = (repo.version(), datetime.utcnow().date())
+    if _index is not None and _index_key == key:
+        return _index
+    with _index_lock:
+        if _index is None or _index_key != key:
+            index = _index or NormsIndex()
+            index.update(repo.all(), key[1])
+            _index, _index_key = index, key
+        return _index
@@ -0,0 +1,150 @@
+# peer_index.py
+import math
+import re
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+STOPWORDS = {
+    "a", "an", "and", "as", "at", "be", "by", "do", "for", "from", "how", "i", "in", "is", "it",
+    "me", "my", "of", "on", "or", "should", "the", "to", "what", "which", "with", "can", "could",
+    "would", "want", "like", "get", "more", "about", "next", "am", "are",
+}
+QUESTION_WEIGHT = 2.0  # words the user just typed count more than their standing profile
+_token = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _token.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+@lru_cache(maxsize=65536)
+def _field_terms(key: str, value: str) -> tuple:
+    # Field values are highly repetitive (departments, skill names), so memoize
+    return (f"{key}:{value.lower()}", *tokenize(value))
+
+
+def profile_terms(emp: dict) -> list:
+    """Skills, specializations, competencies and org placement as weighted terms."""
+    info = emp.get("employment_info") or {}
+    terms = []
+    for key, value in (("dept", info.get("department")), ("unit", info.get("unit")),
+                       ("title", info.get("job_title"))):
+        if value:
+            terms.extend(_field_terms(key, value))
+    for s in emp.get("skills") or []:
+        for key in ("skill_name", "specialization", "function_area"):
+            value = s.get(key)
+            if value:
+                terms.extend(_field_terms(key, value))
+    for c in emp.get("competencies") or []:
+        if c.get("name"):
+            terms.extend(_field_terms("competency", c["name"]))
+    return terms
+
+
+def anonymize(emp: dict) -> dict:
+    """Peer view for prompts: role, placement and capabilities only (no names/ids/contacts)."""
+    info = emp.get("employment_info") or {}
+    return {
+        "job_title": info.get("job_title"),
+        "department": info.get("department"),
+        "unit": info.get("unit"),
+        "hire_year": (info.get("hire_date") or "")[:4] or None,
+        "skills": [s.get("skill_name") for s in emp.get("skills") or [] if s.get("skill_name")],
+        "competencies": [{"name": c.get("name"), "level": c.get("level")}
+                         for c in emp.get("competencies") or []],
+        "roles": [p.get("role_title") for p in emp.get("positions_history") or [] if p.get("role_title")],
+        "projects": [{"role": p.get("role"), "outcomes": p.get("outcomes")}
+                     for p in emp.get("projects") or []],
+        "education": [e.get("degree") for e in emp.get("education") or [] if e.get("degree")],
+    }
+
+
+class PeerIndex:
+    """
+    Offline TF-IDF index over employee profiles with cosine-similarity
+    retrieval. Postings are stored per term as NumPy arrays, so a query
+    only touches the documents that share a term with it.
+    """
+
+    def __init__(self, employees: list):
+        self.employees = employees
+        self.position = {e.get("employee_id"): i for i, e in enumerate(employees)}
+        n = len(employees)
+
+        counts = []
+        df = {}
+        for emp in employees:
+            tf = {}
+            for t in profile_terms(emp):
+                tf[t] = tf.get(t, 0) + 1
+            counts.append(tf)
+            for t in tf:
+                df[t] = df.get(t, 0) + 1
+
+        self.idf = {t: math.log((1 + n) / (1 + d)) + 1.0 for t, d in df.items()}
+        postings = {}
+        norms = np.zeros(n, dtype=np.float64)
+        for doc, tf in enumerate(counts):
+            for t, c in tf.items():
+                w = c * self.idf[t]
+                norms[doc] += w * w
+                postings.setdefault(t, ([], []))
+                postings[t][0].append(doc)
+                postings[t][1].append(w)
+        self.norms = np.sqrt(norms)
+        self.norms[self.norms == 0] = 1.0
+        self.postings = {
+            t: (np.asarray(docs, dtype=np.int32), np.asarray(ws, dtype=np.float64))
+            for t, (docs, ws) in postings.items()
+        }
+
+    def _query_vector(self, emp, question):
+        q = {}
+        for t in profile_terms(emp or {}):
+            q[t] = q.get(t, 0.0) + 1.0
+        for t in tokenize(question or ""):
+            q[t] = q.get(t, 0.0) + QUESTION_WEIGHT
+        return {t: c * self.idf[t] for t, c in q.items() if t in self.idf}
+
+    def top_peers(self, emp: dict, question: str = "", k: int = 10) -> list:
+        """Indexes of the k most similar employees, excluding `emp` itself, best first."""
+        q = self._query_vector(emp, question)
+        n = len(self.employees)
+        if not q or n == 0 or k <= 0:
+            return []
+        docs = [self.postings[t][0] for t in q]
+        weights = [self.postings[t][1] * w for t, w in q.items()]
+        scores = np.bincount(np.concatenate(docs), weights=np.concatenate(weights), minlength=n)
+        scores /= self.norms
+
+        me = self.position.get((emp or {}).get("employee_id"))
+        if me is not None:
+            scores[me] = 0.0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        return sorted(candidates.tolist(), key=lambda i: -scores[i])
+
+    def peer_context(self, emp: dict, question: str = "", k: int = 10) -> list:
+        """Anonymized top-k peers ready to embed in a prompt."""
+        return [anonymize(self.employees[i]) for i in self.top_peers(emp, question, k)]
+
+
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+def get_peer_index(repo) -> PeerIndex:
+    """Index for the repository's current snapshot; rebuilt when the data changes."""
+    global _index, _index_version
+    version = repo.version()
+    if _index is not None and _index_version == version:
+        return _index
+    with _index_lock:
+        if _index is None or _index_version != version:
+            _index = PeerIndex(repo.all())
+            _index_version = version
+        return _index
@@ -0,0 +1,222 @@
+# ratelimit.py
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from metrics import registry
+from usage import LEADERSHIP_SUMMARY, estimate_tokens
+
+# Lanes in priority order: a batch call only starts when no interactive call is waiting
+INTERACTIVE = "interactive"
+BATCH = "batch"
+LANES = (INTERACTIVE, BATCH)
+BATCH_SITES = {LEADERSHIP_SUMMARY}
+
+MIN_SCALE = 0.1  # 429s never throttle below this fraction of the configured RPM/TPM
+
+RATE_QUEUE_DEPTH = registry.gauge(
+    "upstream_ratelimit_queue_depth", "Upstream calls waiting for rate-limit capacity", ("lane",))
+RATE_WAIT = registry.histogram(
+    "upstream_ratelimit_wait_seconds", "Time upstream calls waited for rate-limit capacity", ("lane",))
+RATE_REJECTED = registry.counter(
+    "upstream_ratelimit_rejected_total", "Upstream calls given up after waiting longer than their lane allows",
+    ("lane",))
+RATE_SCALE = registry.gauge(
+    "upstream_ratelimit_scale", "Fraction of the configured RPM/TPM currently used (halved on 429, recovers on success)")
+
+
+class RateLimitTimeout(Exception):
+    def __init__(self, lane: str, waited: float):
+        super().__init__(f"upstream rate limit: no capacity for {lane} call after {waited:.1f}s")
+        self.lane = lane
+        self.waited = waited
+
+
+def lane_for(call_site) -> str:
+    return BATCH if call_site in BATCH_SITES else INTERACTIVE
+
+
+def retry_after_seconds(response, default: float = 1.0) -> float:
+    """Delay requested by a 429: retry-after-ms (Azure), Retry-After seconds or HTTP date."""
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        value = headers.get("Retry-After")
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        pass
+    return default
+
+
+class _Bucket:
+    """
+    Token bucket for a per-minute quota: holds burst of it and refills the
+    rest over the minute, so no 60s window (sliding or fixed) can exceed it.
+    """
+    __slots__ = ("capacity", "rate", "level", "stamp")
+
+    def __init__(self, per_minute: int, burst: float):
+        self.capacity = max(1.0, per_minute * min(burst, 0.5))
+        self.rate = max(per_minute - self.capacity, per_minute / 2) / 60.0
+        self.level = self.capacity
+        self.stamp = time.monotonic()
+
+    def refill(self, now: float, scale: float):
+        self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate * scale)
+        self.stamp = now
+
+    def wait(self, amount: float, reserve: float, scale: float) -> float:
+        """Seconds until amount can be taken while leaving reserve in the bucket."""
+        amount = min(amount, self.capacity - reserve)  # a single oversized call must still fit eventually
+        deficit = amount + reserve - self.level
+        return 0.0 if deficit <= 0 else deficit / (self.rate * scale)
+
+    def take(self, amount: float, reserve: float):
+        self.level -= min(amount, self.capacity - reserve)
+
+
+class RateLimiter:
+    """
+    Process-wide admission control for Azure OpenAI calls.
+
+    Two token buckets budget requests/minute (rpm) and estimated
+    tokens/minute (tpm); 0 leaves that dimension unlimited. Each holds
+    burst (a fraction of the quota) and refills the remainder over the
+    minute. Calls queue per lane and are admitted strictly in priority
+    order (interactive chat before batch summaries), FIFO within a lane,
+    and batch calls must leave batch_reserve of each bucket for interactive
+    traffic arriving later.
+
+    A 429 pauses every lane until its Retry-After has passed, empties the
+    buckets and halves the refill rate; each success restores 5% of the
+    configured rate. Token estimates are corrected with the actual usage
+    once a call completes (settle).
+    """
+
+    def __init__(self, rpm: int = 0, tpm: int = 0, burst: float = 0.1, batch_reserve: float = 0.2,
+                 max_wait=None, completion_tokens: int = 500):
+        self.requests = _Bucket(rpm, burst) if rpm > 0 else None
+        self.tokens = _Bucket(tpm, burst) if tpm > 0 else None
+        self.batch_reserve = batch_reserve
+        self.max_wait = {INTERACTIVE: 30.0, BATCH: 600.0, **(max_wait or {})}
+        self.completion_tokens = completion_tokens
+        self.scale = 1.0
+        self.paused_until = 0.0
+        self._queues = {lane: deque() for lane in LANES}
+        self._cond = threading.Condition()
+        RATE_SCALE.set(self.scale)
+
+    @classmethod
+    def from_env(cls):
+        """AZURE_RPM, AZURE_TPM, AZURE_RATE_BURST, AZURE_RATE_BATCH_RESERVE, AZURE_RATE_MAX_WAIT(_BATCH),
+        AZURE_COMPLETION_TOKENS."""
+        return cls(
+            rpm=int(os.getenv("AZURE_RPM", "0")),
+            tpm=int(os.getenv("AZURE_TPM", "0")),
+            burst=float(os.getenv("AZURE_RATE_BURST", "0.1")),
+            batch_reserve=float(os.getenv("AZURE_RATE_BATCH_RESERVE", "0.2")),
+            max_wait={INTERACTIVE: float(os.getenv("AZURE_RATE_MAX_WAIT", "30")),
+                      BATCH: float(os.getenv("AZURE_RATE_MAX_WAIT_BATCH", "600"))},
+            completion_tokens=int(os.getenv("AZURE_COMPLETION_TOKENS", "500")),
+        )
+
+    def estimate(self, payload_bytes: int) -> int:
+        """Tokens a call is charged up front: prompt estimate plus expected completion."""
+        return estimate_tokens(payload_bytes) + self.completion_tokens
+
+    def _buckets(self, tokens):
+        if self.requests is not None:
+            yield self.requests, 1
+        if self.tokens is not None:
+            yield self.tokens, tokens
+
+    def _wait(self, ticket, lane, tokens, now):
+        """0 when ticket may go now, seconds to sleep, or None to wait for a notify."""
+        if now < self.paused_until:
+            return self.paused_until - now
+        for other in LANES:
+            if other == lane:
+                break
+            if self._queues[other]:
+                return None
+        if self._queues[lane][0] is not ticket:
+            return None
+        longest = 0.0
+        for bucket, amount in self._buckets(tokens):
+            bucket.refill(now, self.scale)
+            reserve = bucket.capacity * self.batch_reserve if lane == BATCH else 0.0
+            longest = max(longest, bucket.wait(amount, reserve, self.scale))
+        return longest
+
+    def acquire(self, tokens: int = 0, lane: str = INTERACTIVE, deadline=None) -> float:
+        """
+        Block until the call may be sent; returns seconds waited or raises
+        RateLimitTimeout after the lane's max wait (or the caller's deadline,
+        a time.monotonic() value, if earlier).
+        """
+        started = time.monotonic()
+        limit = started + self.max_wait[lane]
+        deadline = limit if deadline is None else min(limit, deadline)
+        ticket = object()
+        with self._cond:
+            queue = self._queues[lane]
+            queue.append(ticket)
+            RATE_QUEUE_DEPTH.inc(lane=lane)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self._wait(ticket, lane, tokens, now)
+                    if wait == 0:
+                        for bucket, amount in self._buckets(tokens):
+                            bucket.take(amount, bucket.capacity * self.batch_reserve if lane == BATCH else 0.0)
+                        break
+                    if now + (wait or 0.0) > deadline:
+                        RATE_REJECTED.inc(lane=lane)
+                        raise RateLimitTimeout(lane, now - started)
+                    self._cond.wait(wait if wait is not None else deadline - now)
+            finally:
+                queue.remove(ticket)
+                RATE_QUEUE_DEPTH.dec(lane=lane)
+                self._cond.notify_all()
+        waited = time.monotonic() - started
+        RATE_WAIT.observe(waited, lane=lane)
+        return waited
+
+    def settle(self, estimated: int, usage=None):
+        """A call succeeded: charge/refund the token estimate against actual usage, recover the rate."""
+        with self._cond:
+            if self.tokens is not None and usage and usage.get("total_tokens") is not None:
+                self.tokens.level = max(-self.tokens.capacity,
+                                        self.tokens.level + estimated - int(usage["total_tokens"]))
+            if self.scale < 1.0:
+                self.scale = min(1.0, self.scale + 0.05)
+                RATE_SCALE.set(self.scale)
+            self._cond.notify_all()
+
+    def throttled(self, retry_after: float):
+        """Upstream answered 429: pause all lanes for retry_after and back off the refill rate."""
+        with self._cond:
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            for bucket, _ in self._buckets(0):
+                bucket.level = min(bucket.level, 0.0)
+            self.scale = max(MIN_SCALE, self.scale / 2)
+            RATE_SCALE.set(self.scale)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "queued": {lane: len(q) for lane, q in self._queues.items()},
+                "scale": round(self.scale, 3),
+                "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 2),
+                "rpm_available": round(self.requests.level, 1) if self.requests else None,
+                "tpm_available": round(self.tokens.level) if self.tokens else None,
+            }
@@ -0,0 +1,270 @@
+# score_store.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from leadership import LPI_VERSION, LPI_WEIGHTS, compute_weighted_LPI_batch
+
+LPI_SCORES_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "db", "lpi_scores.db")
+DIMENSIONS = list(LPI_WEIGHTS)
+# Key order is kept as loaded: a reordered-but-equal profile only costs one extra rescore
+_hash_encode = json.JSONEncoder(check_circular=False, separators=(",", ":"), ensure_ascii=False, default=str).encode
+
+
+class ScoringError(Exception):
+    """Stored scoring failure; str() is the original error message."""
+
+
+def profile_hash(emp: dict) -> str:
+    return hashlib.blake2b(_hash_encode(emp).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ScoreStore:
+    """
+    Materialized compute_weighted_LPI results (SQLite).
+
+    One row per employee_id with the overall score, each dimension (as a
+    column for filtering/sorting, plus the exact dims JSON for output) and
+    the profile content hash it was computed from. sync() rescores only
+    rows whose hash, LPI_VERSION or scoring day differ — progression
+    depends on today's date, so every row is refreshed once per UTC day.
+    """
+
+    def __init__(self, db_path: str = LPI_SCORES_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        self._synced = None
+        self._scores = None
+        self._scores_lock = threading.Lock()
+        self._generation = 0  # bumped after every committed change; scores() only caches a fill from the current one
+        self.last_sync = {}
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        dim_cols = "".join(f"{d} REAL,\n            " for d in DIMENSIONS)
+        conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS lpi_scores (
+            employee_id TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            lpi_version INTEGER NOT NULL,
+            scored_on TEXT NOT NULL,
+            name TEXT,
+            department TEXT,
+            unit TEXT,
+            job_title TEXT,
+            office_location TEXT,
+            score REAL,
+            {dim_cols}dims TEXT,
+            error TEXT,
+            scored_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_lpi_score ON lpi_scores(score DESC);
+        CREATE INDEX IF NOT EXISTS idx_lpi_department_score ON lpi_scores(department, score DESC);
+        CREATE INDEX IF NOT EXISTS idx_lpi_unit_score ON lpi_scores(unit, score DESC);
+        CREATE INDEX IF NOT EXISTS idx_lpi_office_score ON lpi_scores(office_location, score DESC);
+        """)
+        conn.commit()
+
+    @classmethod
+    def from_env(cls):
+        """LPI_SCORES_PATH."""
+        return cls(os.getenv("LPI_SCORES_PATH", LPI_SCORES_DB))
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    # ---- maintenance ----
+    def sync(self, employees) -> dict:
+        """Rescore new/changed employees, drop ones no longer in the dataset."""
+        started = time.perf_counter()
+        today = datetime.utcnow().date().isoformat()
+        conn = self._conn()
+        stored = {r[0]: (r[1], r[2], r[3]) for r in conn.execute(
+            "SELECT employee_id, content_hash, lpi_version, scored_on FROM lpi_scores")}
+
+        changed, hashes, seen = [], [], set()
+        for emp in employees:
+            emp_id = emp.get("employee_id") if isinstance(emp, dict) else None
+            if emp_id is None or emp_id in seen:
+                continue
+            seen.add(emp_id)
+            digest = profile_hash(emp)
+            if stored.get(emp_id) != (digest, LPI_VERSION, today):
+                changed.append(emp)
+                hashes.append(digest)
+
+        now = time.time()
+        rows = []
+        for emp, digest, scored in zip(changed, hashes, compute_weighted_LPI_batch(changed, hashes)):
+            e = emp.get("employment_info") if isinstance(emp.get("employment_info"), dict) else {}
+            p = emp.get("personal_info") if isinstance(emp.get("personal_info"), dict) else {}
+            if isinstance(scored, Exception):
+                score, dims, error = None, None, str(scored)
+            else:
+                score, dims, error = scored[0], scored[1], None
+            rows.append((
+                emp["employee_id"], digest, LPI_VERSION, today, p.get("name"), e.get("department"),
+                e.get("unit"), e.get("job_title"), p.get("office_location"), score,
+                *[dims[d] if dims else None for d in DIMENSIONS],
+                json.dumps(dims) if dims else None, error, now,
+            ))
+
+        removed = [k for k in stored if k not in seen]
+        columns = ["employee_id", "content_hash", "lpi_version", "scored_on", "name", "department", "unit",
+                   "job_title", "office_location", "score", *DIMENSIONS, "dims", "error", "scored_at"]
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO lpi_scores ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})", rows)
+            conn.executemany("DELETE FROM lpi_scores WHERE employee_id=?", ((k,) for k in removed))
+        if rows or removed:
+            with self._scores_lock:
+                self._generation += 1
+                self._scores = None
+
+        self.last_sync = {
+            "scored": len(rows), "unchanged": len(seen) - len(rows), "removed": len(removed),
+            "failed": sum(1 for r in rows if r[-2] is not None),
+            "seconds": round(time.perf_counter() - started, 3), "scored_on": today,
+        }
+        return self.last_sync
+
+    def ensure_current(self, repo) -> dict:
+        """sync(repo.all()) unless this repo snapshot was already synced today."""
+        key = (repo.version(), datetime.utcnow().date())
+        if self._synced == key:
+            return self.last_sync
+        with self._sync_lock:
+            if self._synced != key:
+                self.sync(repo.all())
+                self._synced = key
+        return self.last_sync
+
+    # ---- reads ----
+    def scores(self) -> dict:
+        """employee_id -> (score, dims), or a ScoringError for records that failed to score."""
+        cached = self._scores
+        if cached is not None:
+            return cached
+        generation = self._generation
+        out = {}
+        for r in self._conn().execute("SELECT employee_id, score, dims, error FROM lpi_scores"):
+            out[r[0]] = ScoringError(r[3]) if r[3] is not None else (r[1], json.loads(r[2]))
+        with self._scores_lock:
+            if self._generation == generation:  # else a sync committed mid-read: serve these rows, keep none
+                self._scores = out
+        return out
+
+    @staticmethod
+    def _row(r) -> dict:
+        out = {
+            "employee_id": r["employee_id"],
+            "name": r["name"],
+            "department": r["department"],
+            "unit": r["unit"],
+            "job_title": r["job_title"],
+            "leadership_score": r["score"],
+            "dimension_scores": json.loads(r["dims"]) if r["dims"] else None,
+        }
+        if "rank" in r.keys():
+            out["rank"] = r["rank"]
+        return out
+
+    @staticmethod
+    def _filters(department=None, min_score=None, max_score=None, unit=None, office_location=None):
+        where, args = ["score IS NOT NULL"], []
+        for column, value in (("department", department), ("unit", unit), ("office_location", office_location)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+        if min_score is not None:
+            where.append("score >= ?")
+            args.append(min_score)
+        if max_score is not None:
+            where.append("score <= ?")
+            args.append(max_score)
+        return " AND ".join(where), args
+
+    def top(self, limit=10, offset=0, department=None, min_score=None, max_score=None) -> list:
+        """Highest scores first (ties by employee_id), optionally by department / score range."""
+        where, args = self._filters(department, min_score, max_score)
+        rows = self._conn().execute(
+            f"SELECT * FROM lpi_scores WHERE {where} ORDER BY score DESC, employee_id LIMIT ? OFFSET ?",
+            (*args, limit, offset))
+        return [self._row(r) for r in rows]
+
+    def count(self, department=None, min_score=None, max_score=None, unit=None, office_location=None) -> int:
+        where, args = self._filters(department, min_score, max_score, unit, office_location)
+        return self._conn().execute(f"SELECT COUNT(*) FROM lpi_scores WHERE {where}", args).fetchone()[0]
+
+    def page(self, sort="score", descending=True, limit=50, after=None, department=None, unit=None,
+             office_location=None, min_score=None, max_score=None):
+        """
+        Keyset page ordered by sort ("score" or a dimension), ties by
+        employee_id. after is the (sort value, employee_id) of the previous
+        page's last row. Returns (rows, next_after or None). SQLite serves
+        ORDER BY ... LIMIT with a bounded top-k sorter (or an index scan), so
+        the filtered set is never fully sorted.
+        """
+        if sort != "score" and sort not in DIMENSIONS:
+            raise ValueError(f"unknown sort field: {sort}")
+        where, args = self._filters(department, min_score, max_score, unit, office_location)
+        op = "<" if descending else ">"
+        if after is not None:
+            where += f" AND ({sort} {op} ? OR ({sort} = ? AND employee_id > ?))"
+            args += [after[0], after[0], after[1]]
+        rows = self._conn().execute(
+            f"SELECT *, {sort} AS sort_value FROM lpi_scores WHERE {where} "
+            f"ORDER BY {sort} {'DESC' if descending else 'ASC'}, employee_id LIMIT ?",
+            (*args, limit + 1)).fetchall()
+        next_after = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_after = (rows[-1]["sort_value"], rows[-1]["employee_id"])
+        return [self._row(r) for r in rows], next_after
+
+    def department_ranking(self, department, limit=50, offset=0, min_score=None, max_score=None) -> list:
+        """Rows of one department with their competition rank inside it (1 = best)."""
+        where, args = self._filters(None, min_score, max_score)
+        rows = self._conn().execute(
+            f"SELECT * FROM (SELECT *, RANK() OVER (ORDER BY score DESC) AS rank FROM lpi_scores "
+            f"WHERE department = ? AND score IS NOT NULL) WHERE {where} "
+            f"ORDER BY score DESC, employee_id LIMIT ? OFFSET ?",
+            (department, *args, limit, offset))
+        return [self._row(r) for r in rows]
+
+    def rank(self, employee_id):
+        """{org_rank, department_rank, org_size, department_size} for one employee, or None."""
+        conn = self._conn()
+        row = conn.execute("SELECT score, department FROM lpi_scores WHERE employee_id=? AND score IS NOT NULL",
+                           (employee_id,)).fetchone()
+        if row is None:
+            return None
+        score, dept = row
+        org_rank = conn.execute("SELECT COUNT(*) + 1 FROM lpi_scores WHERE score > ?", (score,)).fetchone()[0]
+        dept_rank = conn.execute("SELECT COUNT(*) + 1 FROM lpi_scores WHERE department IS ? AND score > ?",
+                                 (dept, score)).fetchone()[0]
+        return {
+            "org_rank": org_rank, "org_size": self.count(),
+            "department": dept, "department_rank": dept_rank,
+            "department_size": conn.execute("SELECT COUNT(*) FROM lpi_scores WHERE department IS ? "
+                                            "AND score IS NOT NULL", (dept,)).fetchone()[0],
+        }
+
+    def departments(self) -> list:
+        """Per-department headcount and score stats, best average first."""
+        rows = self._conn().execute(
+            "SELECT department, COUNT(*), ROUND(AVG(score), 1), MAX(score), MIN(score) FROM lpi_scores "
+            "WHERE score IS NOT NULL GROUP BY department ORDER BY AVG(score) DESC")
+        return [{"department": r[0], "count": r[1], "avg_score": r[2], "max_score": r[3], "min_score": r[4]}
+                for r in rows]
@@ -0,0 +1,62 @@
+# serve.py
+"""
+Cooperative (gevent) server for the Flask app.
+
+    python3 serve.py              # instead of python3 app.py
+
+gevent monkey-patches sockets, ssl, time.sleep and threading before the app
+is imported, so every request, Socket.IO connection, worker "thread" and
+upstream Azure call (requests over the patched sockets) is a greenlet.
+A chat turn waiting on Azure parks its greenlet instead of holding an OS
+thread, so one process can keep hundreds of turns in flight.
+
+CPU-bound work (LPI scoring, score-store sync, peer-index builds) and
+SQLite calls still run on the single hub thread and block other greenlets
+while they run; they are short per request, but a first org-wide
+/api/leadership/all on a large dataset stalls the server until scoring is
+done. Use app.py (threads) if that matters more than concurrency.
+
+Env: SERVER_HOST (0.0.0.0), SERVER_PORT (8080), AZURE_POOL_SIZE (defaults
+to 100 here: keep-alive connections to Azure shared by all greenlets).
+"""
+from gevent import monkey
+
+monkey.patch_all()
+
+import os  # noqa: E402
+import socket  # noqa: E402
+
+from dotenv import load_dotenv  # noqa: E402
+
+load_dotenv()  # before the pool default below, so a .env AZURE_POOL_SIZE still wins
+os.environ.setdefault("AZURE_POOL_SIZE", "100")
+
+from gevent import pywsgi  # noqa: E402
+
+from app import app, socketio  # noqa: E402
+
+
+class NoDelayHandler(pywsgi.WSGIHandler):
+    """
+    pywsgi writes headers and body in separate sends; with Nagle on, every
+    keep-alive response after the first waits for the client's delayed ACK
+    (~40ms on Linux).
+    """
+
+    def handle(self):
+        if self.socket.family in (socket.AF_INET, socket.AF_INET6):
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return super().handle()
+
+
+def main():
+    host = os.getenv("SERVER_HOST", "0.0.0.0")
+    port = int(os.getenv("SERVER_PORT", "8080"))
+    print(f"[INFO] Serving with {socketio.async_mode} on {host}:{port}")
+    # What socketio.run does for gevent (app.wsgi_app already carries the Socket.IO
+    # middleware; websockets come from simple-websocket), with the handler above
+    pywsgi.WSGIServer((host, port), app, handler_class=NoDelayHandler).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
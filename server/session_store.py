@@ -0,0 +1,203 @@
+# session_store.py
+import itertools
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+SESSIONS_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "db", "sessions.db")
+SESSION_TTL = 86400          # seconds
+SESSION_CACHE_SIZE = 1024
+SESSION_PURGE_EVERY = 500    # writes between sweeps of expired rows
+
+
+def new_session_id() -> str:
+    return secrets.token_urlsafe(18)
+
+
+# ---------- backends ----------
+class ConversationStore:
+    """Interface: opaque session id -> JSON-serializable dict."""
+
+    def get(self, sid: str):
+        raise NotImplementedError
+
+    def put(self, sid: str, data: dict):
+        raise NotImplementedError
+
+    def delete(self, sid: str):
+        raise NotImplementedError
+
+    # Persistent backends behind MemoryConversationStore also provide
+    # load(sid) -> (updated_at, data) | None and updated_at(sid), with put()
+    # returning the updated_at it stored.
+
+
+class SQLiteConversationStore(ConversationStore):
+    """
+    Shared by every process on the host. Rows carry updated_at, which
+    put() returns and updated_at() reads back, so a cache in front can tell
+    whether another process has written the session since. Expired rows
+    are swept every purge_every writes.
+    """
+
+    def __init__(self, db_path: str = SESSIONS_DB, ttl: int = SESSION_TTL, purge_every: int = SESSION_PURGE_EVERY):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._writes = itertools.count(1)
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS chat_sessions (
+            sid TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_sessions_updated ON chat_sessions(updated_at)")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.execute("PRAGMA synchronous=NORMAL")  # WAL: no fsync per chat turn, still crash-safe
+            self._local.conn = conn
+        return conn
+
+    def _expired(self, sid, updated_at) -> bool:
+        if self.ttl and updated_at < time.time() - self.ttl:
+            self.delete(sid)
+            return True
+        return False
+
+    def load(self, sid):
+        """(updated_at, data), or None when missing or expired."""
+        row = self._conn().execute(
+            "SELECT data, updated_at FROM chat_sessions WHERE sid=?", (sid,)
+        ).fetchone()
+        if not row or self._expired(sid, row[1]):
+            return None
+        return row[1], json.loads(row[0])
+
+    def get(self, sid):
+        loaded = self.load(sid)
+        return loaded[1] if loaded else None
+
+    def updated_at(self, sid):
+        """The stored row's updated_at without reading its data, or None when missing or expired."""
+        row = self._conn().execute("SELECT updated_at FROM chat_sessions WHERE sid=?", (sid,)).fetchone()
+        if not row or self._expired(sid, row[0]):
+            return None
+        return row[0]
+
+    def put(self, sid, data):
+        conn = self._conn()
+        updated_at = time.time()
+        conn.execute(
+            """
+            INSERT INTO chat_sessions (sid, data, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(sid) DO UPDATE SET data=excluded.data, updated_at=excluded.updated_at
+            """,
+            (sid, json.dumps(data, separators=(",", ":")), updated_at),
+        )
+        conn.commit()
+        if self.purge_every and next(self._writes) % self.purge_every == 0:
+            self.purge_expired()
+        return updated_at
+
+    def delete(self, sid):
+        conn = self._conn()
+        conn.execute("DELETE FROM chat_sessions WHERE sid=?", (sid,))
+        conn.commit()
+
+    def purge_expired(self) -> int:
+        if not self.ttl:
+            return 0
+        conn = self._conn()
+        cur = conn.execute("DELETE FROM chat_sessions WHERE updated_at < ?", (time.time() - self.ttl,))
+        conn.commit()
+        return cur.rowcount
+
+
+class MemoryConversationStore(ConversationStore):
+    """
+    In-process LRU with TTL. Used on its own (single worker, no persistence)
+    or in front of a persistent backend as a write-through cache. With a
+    backend, a cached session is served only while the backend's
+    updated_at still matches the one it was cached with, so a turn written
+    by another worker process is reloaded instead of overwritten.
+    """
+
+    def __init__(self, max_entries: int = SESSION_CACHE_SIZE, ttl: int = SESSION_TTL, backend=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self._items = OrderedDict()  # sid -> (stored_at, backend updated_at, data)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, sid, data, version=None):
+        with self._lock:
+            self._items[sid] = (time.monotonic(), version, data)
+            self._items.move_to_end(sid)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def get(self, sid):
+        with self._lock:
+            hit = self._items.get(sid)
+            if hit is not None and self.ttl and time.monotonic() - hit[0] > self.ttl:
+                del self._items[sid]
+                hit = None
+        if hit is not None and (self.backend is None or self.backend.updated_at(sid) == hit[1]):
+            with self._lock:
+                if sid in self._items:
+                    self._items.move_to_end(sid)
+                self.hits += 1
+            return hit[2]
+        with self._lock:
+            self.misses += 1
+        if self.backend is None:
+            return None
+        loaded = self.backend.load(sid)
+        if loaded is None:
+            with self._lock:
+                self._items.pop(sid, None)
+            return None
+        self._remember(sid, loaded[1], loaded[0])
+        return loaded[1]
+
+    def put(self, sid, data):
+        version = self.backend.put(sid, data) if self.backend is not None else None
+        self._remember(sid, data, version)
+
+    def delete(self, sid):
+        with self._lock:
+            self._items.pop(sid, None)
+        if self.backend is not None:
+            self.backend.delete(sid)
+
+
+def create_store() -> ConversationStore:
+    """
+    CHAT_STORE_BACKEND=sqlite (default, LRU-cached) | memory.
+    Read at call time so values from .env are honoured.
+    """
+    backend = os.getenv("CHAT_STORE_BACKEND", "sqlite").lower()
+    ttl = int(os.getenv("CHAT_SESSION_TTL", SESSION_TTL))
+    size = int(os.getenv("CHAT_SESSION_CACHE_SIZE", SESSION_CACHE_SIZE))
+    if backend == "memory":
+        return MemoryConversationStore(max_entries=size, ttl=ttl)
+    if backend == "sqlite":
+        db_path = os.getenv("CHAT_STORE_PATH", SESSIONS_DB)
+        return MemoryConversationStore(max_entries=size, ttl=ttl,
+                                       backend=SQLiteConversationStore(db_path, ttl=ttl))
+    raise ValueError(f"Unknown CHAT_STORE_BACKEND: {backend}")
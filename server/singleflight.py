@@ -0,0 +1,105 @@
+# singleflight.py
+import copy
+import hashlib
+import json
+import threading
+import time
+
+from metrics import registry
+
+SINGLEFLIGHT_CALLS = registry.counter(
+    "upstream_singleflight_total",
+    "Upstream chat calls by single-flight role: leader (sent upstream) or coalesced (shared a leader's result)",
+    ("call_site", "role"))
+
+
+def flight_key(url: str, payload: dict) -> str:
+    """Canonical hash of the request: deployment/api-version URL plus messages, temperature and options."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{url}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+def _fresh_error(error: BaseException) -> BaseException:
+    """
+    A new exception for one waiter. Raising the leader's instance from every
+    waiter would append each waiter's frames to its shared __traceback__.
+    """
+    cls = type(error)
+    try:
+        fresh = copy.copy(error)  # same type and args, no traceback/cause/context
+    except Exception:
+        try:  # __init__ with a signature other than *args: rebuild without calling it
+            fresh = cls.__new__(cls)
+            fresh.args = error.args
+            fresh.__dict__.update(getattr(error, "__dict__", {}))
+        except Exception:
+            fresh = None
+    if type(fresh) is not cls:
+        fresh = RuntimeError(f"coalesced call failed: {error!r}")
+    return fresh.with_traceback(None)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls: the first caller for a key runs
+    fn, callers arriving while it is in flight wait and get the same result
+    (or a copy of the same exception, chained to the original). Nothing is
+    kept once the call finishes, so a later identical request goes upstream
+    again.
+
+    Each caller keeps its own deadline (time.monotonic()): a caller that
+    joins a call already in flight stops waiting at its deadline with
+    TimeoutError, whatever the leader's budget is.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, call_site="other", deadline=None, joined=None):
+        """
+        fn() for the first caller of key, the shared outcome for the rest.
+        joined(error) is called in a caller that shared another's call once
+        its outcome is known (error is None on success), e.g. to account
+        for that caller's own turn.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            SINGLEFLIGHT_CALLS.inc(call_site=call_site, role="coalesced")
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            error = None
+            if not call.done.wait(remaining):
+                error = TimeoutError(f"identical call still in flight after {remaining:.1f}s")
+            elif call.error is not None:
+                error = _fresh_error(call.error)
+            if joined is not None:
+                joined(error)
+            if error is not None:
+                raise error from call.error
+            return call.result
+
+        SINGLEFLIGHT_CALLS.inc(call_site=call_site, role="leader")
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
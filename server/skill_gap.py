@@ -0,0 +1,230 @@
+# skill_gap.py
+import re
+import threading
+
+from skills_catalog import get_catalog
+
+TYPICAL_SHARE = 0.5   # a skill is part of a group's typical profile when at least this share holds it
+MIN_TYPICAL = 3       # ...topped up with the group's most common skills so small groups still have a profile
+MAX_LISTED = 10       # skills listed per section in a gap report
+MAX_CACHED_GAPS = 100_000
+
+
+_SEPARATOR = re.compile(r"\s*([:/&,-])\s*")
+_WORD = re.compile(r"[^\W_]+")
+
+
+def _normalize(text) -> str:
+    """Case-, whitespace- and separator-spacing-insensitive form ("Governance : Risk" == "governance: risk")."""
+    return _SEPARATOR.sub(r"\1", " ".join(str(text or "").split())).casefold()
+
+
+def skill_key(function_area, specialization) -> tuple:
+    """Identity of a skill. The catalog's function_unit_skill / specialisation_unit and the profile's
+    function_area / specialization are spelled independently, so both sides are normalized."""
+    return (_normalize(function_area), _normalize(specialization))
+
+
+def words(text) -> tuple:
+    return tuple(_WORD.findall(str(text or "").casefold()))
+
+
+def bit_indexes(bits: int):
+    """Positions of the set bits, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class SkillDictionary:
+    """
+    Dictionary encoding of (function area, specialization) pairs to bit
+    positions. Functions_Skills.xlsx rows take the first positions, so
+    catalog order is stable; skills seen only on profiles are appended.
+    keys are skill_key()s; labels keep the first spelling seen (the
+    catalog's where it has the skill) for display. units holds the
+    catalog's function units, so a profile specialization the catalog does
+    not list can still be placed under its unit.
+    """
+
+    def __init__(self, catalog_rows=()):
+        self.keys = []
+        self.labels = []
+        self.ids = {}
+        for row in catalog_rows:
+            self.add(row.get("function_unit_skill"), row.get("specialisation_unit"))
+        self.catalog_size = len(self.keys)
+        self.units = {area for area, _ in self.keys}
+
+    def add(self, function_area, specialization) -> int:
+        key = skill_key(function_area, specialization)
+        i = self.ids.get(key)
+        if i is None:
+            i = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.labels.append((str(function_area or "").strip(), str(specialization or "").strip()))
+        return i
+
+    def encode(self, skills, grow: bool = True) -> int:
+        """Bitset of skills; with grow=False unknown skills are skipped instead of added."""
+        bits = 0
+        for s in skills or ():
+            if isinstance(s, dict) and (s.get("function_area") or s.get("specialization")):
+                area, spec = s.get("function_area"), s.get("specialization")
+                i = self.add(area, spec) if grow else self.ids.get(skill_key(area, spec))
+                if i is not None:
+                    bits |= 1 << i
+        return bits
+
+
+class GroupProfile:
+    """Skill holders per bit for one department or job title, and its typical profile."""
+    __slots__ = ("headcount", "counts", "typical")
+
+    def __init__(self):
+        self.headcount = 0
+        self.counts = {}
+        self.typical = 0
+
+    def add(self, bits: int):
+        self.headcount += 1
+        for i in bit_indexes(bits):
+            self.counts[i] = self.counts.get(i, 0) + 1
+
+    def finish(self):
+        ranked = sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        cutoff = self.headcount * TYPICAL_SHARE
+        typical = 0
+        for n, (i, c) in enumerate(ranked):
+            if c < cutoff and n >= MIN_TYPICAL:
+                break
+            typical |= 1 << i
+        self.typical = typical
+
+    def share(self, i: int) -> float:
+        return round(self.counts.get(i, 0) / self.headcount, 2) if self.headcount else 0.0
+
+
+class SkillGapIndex:
+    """
+    Every employee's skills as a bitset over the SkillDictionary, plus a
+    GroupProfile per department and job title. A gap is then three
+    big-int operations against the group's typical profile:
+
+        missing = typical & ~have
+        shared  = typical & have
+        extra   = have & ~typical
+
+    The index is not modified after it is built (one per snapshot), so
+    reports for indexed employees are memoized.
+    """
+
+    def __init__(self, employees, catalog_rows=()):
+        self.dictionary = SkillDictionary(catalog_rows)
+        self.bits = {}
+        self.groups = {}
+        self._gaps = {}
+        for emp in employees:
+            emp_id = emp.get("employee_id") if isinstance(emp, dict) else None
+            if emp_id is None:
+                continue
+            bits = self.dictionary.encode(emp.get("skills"))
+            self.bits[emp_id] = bits
+            info = emp.get("employment_info") or {}
+            for kind in ("department", "job_title"):
+                name = info.get(kind)
+                if name:
+                    group = self.groups.get((kind, name))
+                    if group is None:
+                        group = self.groups[(kind, name)] = GroupProfile()
+                    group.add(bits)
+        for group in self.groups.values():
+            group.finish()
+        # Job titles by their words, so "Analyst" is found in "an analyst role" but not in "analysts"
+        self.titles = {}
+        for kind, name in self.groups:
+            if kind == "job_title" and words(name):
+                self.titles.setdefault(words(name), []).append(name)
+        self.title_lengths = sorted({len(w) for w in self.titles}, reverse=True)
+
+    def encode(self, emp: dict) -> int:
+        """Indexed bitset for a known employee, else encoded on the fly (skills no one else has are skipped)."""
+        bits = self.bits.get(emp.get("employee_id"))
+        return bits if bits is not None else self.dictionary.encode(emp.get("skills"), grow=False)
+
+    def titles_in(self, text: str) -> list:
+        """Known job titles mentioned in text (e.g. a mentor question) as whole words, longest first."""
+        tokens = words(text)
+        found = set()
+        for n in self.title_lengths:
+            for i in range(len(tokens) - n + 1):
+                names = self.titles.get(tokens[i:i + n])
+                if names:
+                    found.update(names)
+        return sorted(found, key=len, reverse=True)
+
+    def _skills(self, bits: int, group: GroupProfile, limit: int) -> list:
+        ranked = sorted(bit_indexes(bits), key=lambda i: (-group.counts.get(i, 0), i))
+        out = []
+        for i in ranked[:limit]:
+            area, spec = self.dictionary.labels[i]
+            out.append({"function_area": area, "specialization": spec, "share": group.share(i),
+                        "in_catalog": i < self.dictionary.catalog_size,
+                        "catalog_unit": self.dictionary.keys[i][0] in self.dictionary.units})
+        return out
+
+    def gap(self, emp: dict, kind: str, name: str, limit: int = MAX_LISTED):
+        """Gap between emp's skills and the typical profile of a department or job title, or None."""
+        group = self.groups.get((kind, name))
+        if group is None:
+            return None
+        emp_id = emp.get("employee_id")
+        key = (emp_id, kind, name, limit)
+        cached = self._gaps.get(key)
+        if cached is not None:
+            return cached
+        have = self.encode(emp)
+        target = group.typical
+        missing, shared, extra = target & ~have, target & have, have & ~target
+        size = target.bit_count()
+        report = {
+            kind: name,
+            "headcount": group.headcount,
+            "typical_skills": size,
+            "coverage": round(shared.bit_count() / size, 2) if size else None,
+            "missing": self._skills(missing, group, limit),
+            "shared": self._skills(shared, group, limit),
+            "extra": self._skills(extra, group, limit),
+        }
+        if emp_id in self.bits:
+            if len(self._gaps) >= MAX_CACHED_GAPS:
+                self._gaps.clear()
+            self._gaps[key] = report
+        return report
+
+    def gaps_for(self, emp: dict, question: str = "", limit: int = MAX_LISTED) -> list:
+        """Gaps against emp's own department and job title, then any job titles named in question."""
+        info = emp.get("employment_info") or {}
+        targets = [("department", info.get("department")), ("job_title", info.get("job_title"))]
+        targets += [("job_title", t) for t in self.titles_in(question) if t != info.get("job_title")]
+        return [g for g in (self.gap(emp, kind, name, limit) for kind, name in targets if name) if g]
+
+
+_index = None
+_index_key = None
+_index_rows = None
+_index_lock = threading.Lock()
+
+def get_skill_gap_index(repo, xlsx_path=None) -> SkillGapIndex:
+    """Index for the repository's current snapshot and catalog; rebuilt when either changes."""
+    global _index, _index_key, _index_rows
+    rows = (get_catalog(xlsx_path) if xlsx_path else get_catalog()).skills()
+    version = repo.version()
+    if _index is not None and _index_key == version and _index_rows is rows:
+        return _index
+    with _index_lock:
+        if _index is None or _index_key != version or _index_rows is not rows:
+            _index = SkillGapIndex(repo.all(), rows)
+            _index_key, _index_rows = version, rows
+        return _index
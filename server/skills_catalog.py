@@ -0,0 +1,121 @@
+# skills_catalog.py
+import glob
+import hashlib
+import json
+import os
+import threading
+
+SKILLS_XLSX = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "public", "Data", "Functions_Skills.xlsx"
+)
+CACHE_DIR = os.getenv(
+    "SKILLS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"),
+)
+
+# Workbook column -> catalog field
+COLUMNS = {
+    "Function / Unit / Skill": "function_unit_skill",
+    "Specialisation / Unit": "specialisation_unit",
+}
+FORMAT_VERSION = 1
+
+
+def _file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _sidecar_path(xlsx_path: str, digest: str) -> str:
+    base = os.path.splitext(os.path.basename(xlsx_path))[0]
+    return os.path.join(CACHE_DIR, f"{base}.{digest[:16]}.catalog.json")
+
+
+def compile_workbook(xlsx_path: str) -> list:
+    """Parse the workbook once, column-wise (no per-row Series objects)."""
+    import pandas as pd  # only needed when the sidecar is missing or stale
+
+    df = pd.read_excel(xlsx_path)
+    n = len(df)
+    columns = {
+        field: ([str(v) for v in df[col].tolist()] if col in df.columns else [""] * n)
+        for col, field in COLUMNS.items()
+    }
+    fields = list(columns)
+    return [dict(zip(fields, row)) for row in zip(*columns.values())]
+
+
+def _load_sidecar(path: str, digest: str):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            blob = json.load(f)
+        if blob.get("version") == FORMAT_VERSION and blob.get("sha256") == digest:
+            return blob["skills"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _write_sidecar(xlsx_path: str, digest: str, skills: list):
+    path = _sidecar_path(xlsx_path, digest)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": FORMAT_VERSION, "sha256": digest, "skills": skills},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+        # Drop artifacts built from older revisions of the same workbook
+        base = os.path.splitext(os.path.basename(xlsx_path))[0]
+        for old in glob.glob(os.path.join(CACHE_DIR, f"{base}.*.catalog.json")):
+            if old != path:
+                os.remove(old)
+    except OSError as e:
+        print(f"[WARN] Could not persist skills catalog: {e}")
+
+
+class SkillsCatalog:
+    """
+    Compiled view of Functions_Skills.xlsx. Checked by mtime/size on each
+    access; on change the workbook is hashed and the matching sidecar is
+    used if present, so openpyxl only runs when the content really changed.
+    """
+
+    def __init__(self, xlsx_path: str = SKILLS_XLSX):
+        self.xlsx_path = os.path.abspath(xlsx_path)
+        self._signature = None
+        self._skills = None
+        self._lock = threading.Lock()
+
+    def skills(self) -> list:
+        st = os.stat(self.xlsx_path)
+        sig = (st.st_mtime_ns, st.st_size)
+        if self._skills is not None and self._signature == sig:
+            return self._skills
+
+        with self._lock:
+            if self._skills is not None and self._signature == sig:
+                return self._skills
+            digest = _file_hash(self.xlsx_path)
+            skills = _load_sidecar(_sidecar_path(self.xlsx_path, digest), digest)
+            if skills is None:
+                skills = compile_workbook(self.xlsx_path)
+                _write_sidecar(self.xlsx_path, digest, skills)
+            self._skills, self._signature = skills, sig
+            return skills
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+def get_catalog(xlsx_path: str = SKILLS_XLSX) -> SkillsCatalog:
+    """Process-wide catalog per workbook path."""
+    key = os.path.abspath(xlsx_path)
+    cat = _catalogs.get(key)
+    if cat is None:
+        with _catalogs_lock:
+            cat = _catalogs.setdefault(key, SkillsCatalog(key))
+    return cat
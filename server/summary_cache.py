@@ -0,0 +1,151 @@
+# summary_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SUMMARY_CACHE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "db", "summary_cache.db")
+
+
+def summary_key(emp: dict, score, subs: dict, prompt_version, model: str) -> str:
+    """Stable content hash: same profile + scores + prompt + deployment -> same key."""
+    canonical = json.dumps(
+        {"emp": emp, "score": score, "subs": subs, "prompt": prompt_version, "model": model},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """
+    Persistent cache of leadership summaries (SQLite).
+    Bounded to max_entries with least-recently-used eviction; entries older
+    than ttl seconds are treated as misses and dropped.
+
+    Recency is tracked at touch_interval resolution: a hit only writes
+    accessed_at when the stored value is older than that, so repeated hits
+    on a hot entry are read-only.
+    """
+
+    def __init__(self, db_path: str = SUMMARY_CACHE_DB, max_entries: int = 5000,
+                 ttl: int = 7 * 86400, model: str = "", touch_interval: int = 300):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.touch_interval = touch_interval
+        self.model = model
+        self.counters = {"hits": 0, "misses": 0, "puts": 0, "evictions": 0}
+        self._counter_lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS leadership_summaries (
+            key TEXT PRIMARY KEY,
+            employee_id TEXT,
+            summary TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_accessed ON leadership_summaries(accessed_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_employee ON leadership_summaries(employee_id)")
+        conn.commit()
+
+    @classmethod
+    def from_env(cls, model: str = ""):
+        """SUMMARY_CACHE_PATH, SUMMARY_CACHE_MAX_ENTRIES, SUMMARY_CACHE_TTL and SUMMARY_CACHE_TOUCH_INTERVAL (seconds)."""
+        return cls(
+            db_path=os.getenv("SUMMARY_CACHE_PATH", SUMMARY_CACHE_DB),
+            max_entries=int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "5000")),
+            ttl=int(os.getenv("SUMMARY_CACHE_TTL", str(7 * 86400))),
+            model=model,
+            touch_interval=int(os.getenv("SUMMARY_CACHE_TOUCH_INTERVAL", "300")),
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.execute("PRAGMA synchronous=NORMAL")  # per connection; durable enough under WAL for a cache
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name, n=1):
+        with self._counter_lock:
+            self.counters[name] += n
+
+    def key(self, emp, score, subs, prompt_version) -> str:
+        return summary_key(emp, score, subs, prompt_version, self.model)
+
+    def get(self, key: str):
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT summary, created_at, accessed_at FROM leadership_summaries WHERE key=?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or (self.ttl and row[1] < now - self.ttl):
+            if row is not None:
+                conn.execute("DELETE FROM leadership_summaries WHERE key=?", (key,))
+                conn.commit()
+            self._count("misses")
+            return None
+        if row[2] < now - self.touch_interval:
+            conn.execute("UPDATE leadership_summaries SET accessed_at=? WHERE key=?", (now, key))
+            conn.commit()
+        self._count("hits")
+        return row[0]
+
+    def put(self, key: str, summary: str, employee_id=None):
+        conn = self._conn()
+        now = time.time()
+        conn.execute(
+            """
+            INSERT INTO leadership_summaries (key, employee_id, summary, created_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET summary=excluded.summary,
+                created_at=excluded.created_at, accessed_at=excluded.accessed_at
+            """,
+            (key, employee_id, summary, now, now),
+        )
+        excess = conn.execute("SELECT COUNT(*) FROM leadership_summaries").fetchone()[0] - self.max_entries
+        evicted = 0
+        if excess > 0:
+            evicted = conn.execute(
+                """
+                DELETE FROM leadership_summaries WHERE key IN (
+                    SELECT key FROM leadership_summaries ORDER BY accessed_at ASC LIMIT ?
+                )
+                """,
+                (excess,),
+            ).rowcount
+        conn.commit()
+        self._count("puts")
+        if evicted > 0:
+            self._count("evictions", evicted)
+
+    def invalidate(self, employee_id=None) -> int:
+        """Drop one employee's entries, or everything when employee_id is None."""
+        conn = self._conn()
+        if employee_id is None:
+            cur = conn.execute("DELETE FROM leadership_summaries")
+        else:
+            cur = conn.execute("DELETE FROM leadership_summaries WHERE employee_id=?", (employee_id,))
+        conn.commit()
+        return cur.rowcount
+
+    def stats(self) -> dict:
+        entries = self._conn().execute("SELECT COUNT(*) FROM leadership_summaries").fetchone()[0]
+        with self._counter_lock:
+            out = dict(self.counters)
+        lookups = out["hits"] + out["misses"]
+        out.update({
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hit_ratio": round(out["hits"] / lookups, 4) if lookups else None,
+        })
+        return out
@@ -0,0 +1,152 @@
+# upstream.py
+import os
+import random
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import PHASE_LATENCY, UPSTREAM_IN_FLIGHT, UPSTREAM_ERRORS, UPSTREAM_429
+from ratelimit import INTERACTIVE, RateLimiter, retry_after_seconds
+
+RETRY_STATUSES = {500, 502, 503, 504}
+
+
+class UpstreamClient:
+    """
+    Shared keep-alive HTTP client for the Azure OpenAI endpoint.
+
+    One requests.Session with a sized connection pool, so repeated calls
+    reuse TCP/TLS connections. Timeouts are split into connect and read
+    phases. 5xx responses and connection errors (refused/reset/connect
+    timeout) are retried with full-jitter exponential backoff; read
+    timeouts are not, since the completion may already be running.
+
+    With a limiter (ratelimit.RateLimiter) every attempt first waits for
+    RPM/TPM capacity in its lane, and 429s are retried once the limiter
+    has waited out Retry-After; without one a 429 is returned as an error.
+    """
+
+    def __init__(self, headers=None, pool_size=10, connect_timeout=5.0, read_timeout=60.0,
+                 max_retries=2, backoff_base=0.5, backoff_max=8.0, limiter=None):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = limiter
+
+        self.session = requests.Session()
+        # requests re-reads proxy/CA env vars on every call when trust_env is on
+        # (~1ms each); resolve them once per host in _env_settings instead
+        self.session.trust_env = False
+        self._env = {}
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+        if headers:
+            self.session.headers.update(headers)
+
+    @classmethod
+    def from_env(cls, headers=None):
+        """AZURE_POOL_SIZE, AZURE_CONNECT_TIMEOUT, AZURE_READ_TIMEOUT, AZURE_MAX_RETRIES, AZURE_BACKOFF_BASE."""
+        return cls(
+            headers=headers,
+            pool_size=int(os.getenv("AZURE_POOL_SIZE", "10")),
+            connect_timeout=float(os.getenv("AZURE_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.getenv("AZURE_READ_TIMEOUT", "60")),
+            max_retries=int(os.getenv("AZURE_MAX_RETRIES", "2")),
+            backoff_base=float(os.getenv("AZURE_BACKOFF_BASE", "0.5")),
+            limiter=RateLimiter.from_env(),
+        )
+
+    def _env_settings(self, url: str) -> dict:
+        key = urlsplit(url)[:2]
+        settings = self._env.get(key)
+        if settings is None:
+            merged = requests.Session().merge_environment_settings(url, {}, None, None, None)
+            settings = self._env[key] = {k: merged[k] for k in ("proxies", "verify", "cert")}
+        return settings
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def estimate(self, payload_bytes: int) -> int:
+        return self.limiter.estimate(payload_bytes) if self.limiter is not None else 0
+
+    def settle(self, estimated: int, usage=None):
+        """Report a completed call's usage to the limiter (corrects the token estimate)."""
+        if self.limiter is not None:
+            self.limiter.settle(estimated, usage)
+
+    def post(self, url: str, payload, headers=None, stream: bool = False,
+             lane: str = INTERACTIVE, tokens: int = 0, deadline=None, timings=None) -> requests.Response:
+        """
+        POST JSON with retries; raises requests.HTTPError on a final non-2xx.
+        payload is a dict, or already-encoded JSON bytes/str. lane and tokens
+        (estimated, see estimate()) are what the limiter admits the call on;
+        ratelimit.RateLimitTimeout is raised if it waits too long. deadline
+        (time.monotonic()) caps the limiter wait, every attempt's timeouts and
+        the backoff sleeps; requests.Timeout is raised once it has passed.
+        Time spent waiting on the limiter is recorded as the "rate_limit"
+        phase and, if timings (a dict) is given, accumulated into
+        timings["limiter_wait"] so callers can keep it out of their own
+        upstream timing.
+        """
+        body = {"data": payload} if isinstance(payload, (bytes, str)) else {"json": payload}
+        timings = {} if timings is None else timings
+        timings.setdefault("limiter_wait", 0.0)
+        attempt = 0
+        while True:
+            connect_timeout, read_timeout = self.connect_timeout, self.read_timeout
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise requests.Timeout(f"upstream deadline exceeded after {attempt} attempt(s)")
+                connect_timeout, read_timeout = min(connect_timeout, remaining), min(read_timeout, remaining)
+            if self.limiter is not None:
+                started = time.perf_counter()
+                try:
+                    self.limiter.acquire(tokens, lane, deadline=deadline)
+                finally:
+                    waited = time.perf_counter() - started
+                    timings["limiter_wait"] += waited
+                    PHASE_LATENCY.observe(waited, phase="rate_limit")
+            throttled = False
+            UPSTREAM_IN_FLIGHT.inc()
+            try:
+                r = self.session.post(
+                    url, headers=headers, stream=stream,
+                    timeout=(connect_timeout, read_timeout), **body, **self._env_settings(url),
+                )
+            except requests.ConnectionError:
+                UPSTREAM_ERRORS.inc(kind="connection")
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if r.status_code == 429:
+                    UPSTREAM_429.inc()
+                    if self.limiter is not None:
+                        self.limiter.throttled(retry_after_seconds(r))
+                        throttled = True
+                elif r.status_code >= 500:
+                    UPSTREAM_ERRORS.inc(kind="http_5xx")
+                elif r.status_code >= 400:
+                    UPSTREAM_ERRORS.inc(kind="http_4xx")
+                if (r.status_code not in RETRY_STATUSES and not throttled) or attempt >= self.max_retries:
+                    r.raise_for_status()
+                    return r
+                r.close()
+            finally:
+                UPSTREAM_IN_FLIGHT.dec()
+            if not throttled:  # after a 429 the limiter's next acquire() waits out Retry-After
+                delay = self._backoff(attempt)
+                if deadline is not None:
+                    delay = min(delay, max(0.0, deadline - time.monotonic()))
+                time.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,110 @@
+# usage.py
+import threading
+from collections import OrderedDict
+
+# Call-site tags
+MENTOR_CHAT = "mentor_chat"
+SUPPORT_CHAT = "support_chat"
+LEADERSHIP_SUMMARY = "leadership_summary"
+
+BYTES_PER_TOKEN = 4  # rough pre-send estimate for JSON chat payloads
+
+
+class TokenBudgetExceeded(Exception):
+    def __init__(self, estimated: int, budget: int):
+        super().__init__(f"estimated {estimated} prompt tokens exceeds budget of {budget}")
+        self.estimated = estimated
+        self.budget = budget
+
+
+def estimate_tokens(payload_bytes: int) -> int:
+    return (payload_bytes + BYTES_PER_TOKEN - 1) // BYTES_PER_TOKEN
+
+
+def check_budget(payload_bytes: int, budget: int):
+    """Raise TokenBudgetExceeded if the estimated prompt is over budget (0 = unlimited)."""
+    if budget and budget > 0:
+        estimated = estimate_tokens(payload_bytes)
+        if estimated > budget:
+            raise TokenBudgetExceeded(estimated, budget)
+
+
+def _blank():
+    return {
+        "calls": 0, "errors": 0, "rejected": 0, "coalesced": 0,
+        "payload_bytes": 0, "max_payload_bytes": 0, "messages": 0,
+        "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0,
+    }
+
+
+class UsageTracker:
+    """
+    Per-call accounting of upstream requests: payload size, message count and
+    the upstream `usage` block, aggregated per call site and per chat session.
+    Per-session totals are kept for the most recent max_sessions sessions.
+    Calls that shared an identical in-flight request (singleflight) count
+    as "coalesced": a turn for the caller, with no payload or tokens.
+    """
+
+    def __init__(self, max_sessions: int = 10000):
+        self.max_sessions = max_sessions
+        self._sites = {}
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, site: str, payload_bytes: int, message_count: int,
+               usage=None, session_id=None, error: bool = False, rejected: bool = False,
+               coalesced: bool = False):
+        usage = usage or {}
+        details = usage.get("prompt_tokens_details") or {}
+        prompt = int(usage.get("prompt_tokens") or 0)
+        completion = int(usage.get("completion_tokens") or 0)
+        cached = int(details.get("cached_tokens") or 0)
+
+        with self._lock:
+            buckets = [self._sites.setdefault(site, _blank())]
+            if session_id:
+                bucket = self._sessions.get(session_id)
+                if bucket is None:
+                    bucket = self._sessions[session_id] = _blank()
+                    while len(self._sessions) > self.max_sessions:
+                        self._sessions.popitem(last=False)
+                self._sessions.move_to_end(session_id)
+                buckets.append(bucket)
+            for b in buckets:
+                if rejected:
+                    b["rejected"] += 1
+                    continue
+                if coalesced:
+                    b["coalesced"] += 1
+                    b["errors"] += 1 if error else 0
+                    continue
+                b["calls"] += 1
+                b["errors"] += 1 if error else 0
+                b["payload_bytes"] += payload_bytes
+                b["max_payload_bytes"] = max(b["max_payload_bytes"], payload_bytes)
+                b["messages"] += message_count
+                b["prompt_tokens"] += prompt
+                b["completion_tokens"] += completion
+                b["cached_tokens"] += cached
+
+    def sites(self) -> dict:
+        with self._lock:
+            out = {site: dict(b) for site, b in self._sites.items()}
+        for b in out.values():
+            b["avg_payload_bytes"] = round(b["payload_bytes"] / b["calls"]) if b["calls"] else 0
+        return out
+
+    def session(self, session_id) -> dict:
+        with self._lock:
+            b = self._sessions.get(session_id)
+            return dict(b) if b else _blank()
+
+    def sessions(self, limit: int = 50) -> dict:
+        """Most recently active sessions first."""
+        with self._lock:
+            recent = list(self._sessions.items())[-limit:]
+        return {sid: dict(b) for sid, b in reversed(recent)}
+
+
+tracker = UsageTracker()